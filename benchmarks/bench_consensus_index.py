@@ -0,0 +1,121 @@
+"""컨센서스 인덱스 벤치마크: "종목 X를 보유한 투자자" / "최다 보유 종목" 조회를 상세 테이블 스캔과 인덱스 조회로 비교합니다.
+
+합성 투자자마다 두 분기를 저장한 SQLite DB를 만들고, 투자자 한 명 저장 후 refresh_consensus_index 비용도 측정합니다.
+
+사용법:
+    python benchmarks/bench_consensus_index.py --investors 300 --holdings 60
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.db_backends import configure_backend  # noqa: E402
+from utils.db_manager import (get_pool, close_pool, create_tables_if_not_exists, insert_investor_portfolio,  # noqa: E402
+                              insert_portfolio_details, refresh_consensus_index, get_ticker_consensus, get_most_held_tickers)
+from utils.models import Holding  # noqa: E402
+from utils.logger_util import LoggerUtil  # noqa: E402
+
+QUARTERS = ("2025-03-31", "2025-06-30")
+
+SCAN_HOLDERS_SQL = """
+    SELECT p.investor_code, p.investor_name, p.idx AS p_idx, p.portfolio_date,
+           d.portfolio_rate, d.shares, d.reported_value_amount
+    FROM investor_portfolio p
+    JOIN investor_portfolio_detail d ON d.p_idx = p.idx
+    WHERE d.ticker = %s
+      AND p.portfolio_date = (SELECT MAX(l.portfolio_date) FROM investor_portfolio l WHERE l.investor_code = p.investor_code)
+    ORDER BY d.portfolio_rate DESC
+"""
+
+SCAN_MOST_HELD_SQL = """
+    SELECT d.ticker, MAX(d.stk_name) AS stk_name, COUNT(*) AS holder_count, SUM(d.portfolio_rate) AS total_weight,
+           SUM(d.reported_value_amount) AS total_reported_value
+    FROM investor_portfolio p
+    JOIN investor_portfolio_detail d ON d.p_idx = p.idx
+    WHERE p.portfolio_date = (SELECT MAX(l.portfolio_date) FROM investor_portfolio l WHERE l.investor_code = p.investor_code)
+    GROUP BY d.ticker
+    ORDER BY holder_count DESC, total_reported_value DESC
+    LIMIT 20
+"""
+
+def synthetic_holdings(rng, universe, holdings):
+    details = []
+    for ticker in rng.sample(universe, holdings):
+        shares = rng.randint(1_000, 1_000_000)
+        price = round(rng.uniform(5, 500), 2)
+        details.append(Holding(ticker, f"{ticker} Inc", round(rng.uniform(0.1, 10), 2), None, None, shares, price,
+                               int(shares * price), price, 0.0, price * 0.7, price * 1.3))
+    return details
+
+def best_of(func, rounds):
+    timings = []
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Consensus index query benchmark (SQLite)")
+    parser.add_argument("--investors", type=int, default=300, help="합성 투자자 수")
+    parser.add_argument("--holdings", type=int, default=60, help="분기별 보유 종목 수")
+    parser.add_argument("--universe", type=int, default=1500, help="전체 종목 수")
+    parser.add_argument("--rounds", type=int, default=20, help="조회별 반복 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+
+    LoggerUtil().get_logger().setLevel(logging.CRITICAL)
+    rng = random.Random(3)
+    universe = [f"T{i:05d}" for i in range(args.universe)]
+    codes = [f"INV{i:04d}" for i in range(args.investors)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        close_pool()
+        configure_backend("sqlite", path=os.path.join(tmp_dir, "bench.db"))
+        with get_pool().connection() as conn:
+            create_tables_if_not_exists(conn)
+            for code in codes:
+                for quarter in QUARTERS:
+                    p_idx = insert_investor_portfolio(conn, code, code, quarter, quarter, 1, args.holdings)
+                    insert_portfolio_details(conn, p_idx, synthetic_holdings(rng, universe, args.holdings))
+            refresh_consensus_index(conn, codes)
+            conn.commit()
+
+            top_ticker = get_most_held_tickers(conn, 1)[0]['ticker']
+
+            def scan(sql, params=None):
+                with conn.cursor() as cursor:
+                    cursor.execute(sql, params)
+                    return cursor.fetchall()
+
+            scan_holders = best_of(lambda: scan(SCAN_HOLDERS_SQL, (top_ticker,)), args.rounds)
+            index_holders = best_of(lambda: get_ticker_consensus(conn, top_ticker), args.rounds)
+            scan_most_held = best_of(lambda: scan(SCAN_MOST_HELD_SQL), args.rounds)
+            index_most_held = best_of(lambda: get_most_held_tickers(conn, 20), args.rounds)
+            assert len(scan(SCAN_HOLDERS_SQL, (top_ticker,))) == len(get_ticker_consensus(conn, top_ticker)['holders'])
+
+            # 투자자 한 명의 새 분기 저장 후 증분 갱신 비용
+            refresh_timings = []
+            for code in codes[:min(20, len(codes))]:
+                p_idx = insert_investor_portfolio(conn, code, code, "2025-09-30", "Q3", 1, args.holdings)
+                insert_portfolio_details(conn, p_idx, synthetic_holdings(rng, universe, args.holdings))
+                started_at = time.perf_counter()
+                refresh_consensus_index(conn, [code])
+                refresh_timings.append(time.perf_counter() - started_at)
+                conn.commit()
+        close_pool()
+
+    print(f"investors={args.investors} holdings/quarter={args.holdings} quarters={len(QUARTERS)} universe={args.universe}")
+    print(f"{'query':<28} {'scan ms':>9} {'index ms':>9} {'speedup':>8}")
+    for name, scan_seconds, index_seconds in (("holders of top ticker", scan_holders, index_holders),
+                                              ("most-held top 20", scan_most_held, index_most_held)):
+        print(f"{name:<28} {scan_seconds * 1000:>9.3f} {index_seconds * 1000:>9.3f} {scan_seconds / index_seconds:>7.1f}x")
+    print(f"refresh_consensus_index (1 investor): median {sorted(refresh_timings)[len(refresh_timings) // 2] * 1000:.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""AsyncCrawlEngine 벤치마크: 로컬 스텁 서버를 대상으로 순차 크롤링과 동시 크롤링의 소요 시간을 비교합니다.
+
+1) 투자자 수를 고정하고 동시 요청 수(--concurrency)를 바꿔 가며 측정합니다.
+2) 투자자 수(--scale)를 늘려 가며 순차 / 비동기 엔진(--scale-concurrency)의 전체 시간과 투자자당 시간을 측정합니다.
+   순차는 투자자 수에 비례해 늘고, 비동기는 동시 요청 수만큼 나뉘어 투자자당 시간이 줄어드는지 확인합니다.
+
+사용법:
+    python benchmarks/bench_crawl_engine.py --investors 20 --pages 3 --latency 0.1
+    python benchmarks/bench_crawl_engine.py --scale 5 10 20 40 --scale-concurrency 8
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import crawler  # noqa: E402
+from crawler import crawl_dataroma_portfolio_page, crawl_portfolio_pages  # noqa: E402
+from utils.logger_util import LoggerUtil  # noqa: E402
+from utils.rate_limiter import HostRateLimiter  # noqa: E402
+from benchmarks.stub_server import StubDataromaServer, ROWS_PER_PAGE  # noqa: E402
+
+def stub_codes(count):
+    return [f"S{i:03d}" for i in range(count)]
+
+def run_sequential(codes, base_url):
+    started_at = time.perf_counter()
+    for code in codes:
+        crawl_dataroma_portfolio_page(code, base_url=base_url)
+    return time.perf_counter() - started_at
+
+def run_async(codes, concurrency, base_url):
+    started_at = time.perf_counter()
+    results = crawl_portfolio_pages(codes, max_concurrency=concurrency, per_host_limit=concurrency, base_url=base_url)
+    elapsed = time.perf_counter() - started_at
+    return elapsed, sum(len(result["details"]) for result in results.values() if result)
+
+def bench_concurrency(args, stub):
+    codes = stub_codes(args.investors)
+    total_requests = args.investors * args.pages
+    print(f"investors={args.investors} pages/investor={args.pages} latency={args.latency:.3f}s requests={total_requests}")
+
+    sequential = run_sequential(codes, stub.base_url)
+    print(f"{'sequential':>16}: {sequential:7.2f}s  {total_requests / sequential:7.1f} req/s")
+
+    for concurrency in args.concurrency:
+        elapsed, rows = run_async(codes, concurrency, stub.base_url)
+        print(f"{'concurrency=' + str(concurrency):>16}: {elapsed:7.2f}s  {total_requests / elapsed:7.1f} req/s  "
+              f"speedup x{sequential / elapsed:4.1f}  rows={rows}")
+
+def bench_scale(args, stub):
+    print(f"\nscaling: pages/investor={args.pages} latency={args.latency:.3f}s async concurrency={args.scale_concurrency}")
+    print(f"{'investors':>9} {'seq s':>8} {'seq ms/inv':>11} {'async s':>8} {'async ms/inv':>13} {'speedup':>8}")
+    for count in args.scale:
+        codes = stub_codes(count)
+        sequential = run_sequential(codes, stub.base_url)
+        elapsed, _ = run_async(codes, args.scale_concurrency, stub.base_url)
+        print(f"{count:>9} {sequential:>8.2f} {sequential / count * 1000:>11.1f} {elapsed:>8.2f} "
+              f"{elapsed / count * 1000:>13.1f} {sequential / elapsed:>7.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="AsyncCrawlEngine wall-clock benchmark")
+    parser.add_argument("--investors", type=int, default=20, help="스텁 투자자 수")
+    parser.add_argument("--pages", type=int, default=3, help="투자자별 holdings 페이지 수")
+    parser.add_argument("--latency", type=float, default=0.1, help="요청당 서버 지연(초)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="측정할 동시 요청 수")
+    parser.add_argument("--scale", type=int, nargs="*", default=[5, 10, 20, 40], help="투자자 수 확장 측정 (--scale만 주면 생략)")
+    parser.add_argument("--scale-concurrency", type=int, default=8, help="투자자 수 확장 측정의 비동기 동시 요청 수")
+    args = parser.parse_args()
+
+    LoggerUtil().get_logger().setLevel(logging.WARNING)
+    # 네트워크 동시성만 측정하도록 디스크 응답 캐시는 끕니다.
+    crawler.configure_response_cache(enabled=False)
+    # 동시성 자체를 비교하기 위해 레이트 리미터가 병목이 되지 않도록 한도를 높입니다.
+    HostRateLimiter().configure(rate=10_000, max_rate=10_000, burst=10_000)
+
+    rows_by_code = {code: args.pages * ROWS_PER_PAGE for code in stub_codes(max([args.investors] + args.scale))}
+    with StubDataromaServer(rows_by_code, latency=args.latency) as stub:
+        bench_concurrency(args, stub)
+        if args.scale:
+            bench_scale(args, stub)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""저장소 백엔드 처리량 벤치마크: 같은 합성 포트폴리오로 MySQL / SQLite(WAL) 백엔드의 쓰기·읽기 처리량을 비교합니다.
+
+db_manager의 공개 함수만 사용하며 DB writer와 같이 --batch명 단위로 한 트랜잭션에 커밋합니다.
+- insert:  insert_investor_portfolio + insert_portfolio_details (평균 수익률 포함)
+- refresh: update_portfolio_details (임시 테이블 일괄 가격 갱신) + 배치별 update_portfolio_avg_returns
+- read:    get_portfolio_index + 포트폴리오별 상세 조회 (report_generator와 같은 쿼리)
+
+SQLite는 임시 디렉터리의 새 DB 파일을 사용합니다. MySQL은 --backends mysql을 명시했을 때만 연결하며, 운영 DB 대신
+--mysql-db로 빈 스크래치 데이터베이스를 지정하는 것을 권장합니다 (스키마는 마이그레이션으로 자동 생성).
+운영 DB에서 실행하더라도 BENCH_ 접두사 투자자 코드와 BENCH 접두사 종목 코드로만 데이터를 넣고, 끝나면 포트폴리오/상세와
+함께 가격 스냅샷(holding_price_snapshot), 분기 변화(portfolio_quarter_diff) 행까지 삭제합니다.
+
+사용법:
+    python benchmarks/bench_db_backends.py                            # SQLite만
+    python benchmarks/bench_db_backends.py --backends sqlite mysql --mysql-db super_investor_bench --portfolios 500 --holdings 80
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.db_backends import DB_ERRORS, configure_backend  # noqa: E402
+from utils.db_manager import (get_pool, close_pool, create_tables_if_not_exists, get_portfolio_index,  # noqa: E402
+                              insert_investor_portfolio, insert_portfolio_details, update_portfolio_details,
+                              update_portfolio_avg_returns)
+from utils.models import Holding  # noqa: E402
+from utils.logger_util import LoggerUtil  # noqa: E402
+
+BENCH_CODE_PREFIX = "BENCH_"
+BENCH_TICKER_PREFIX = "BENCH"
+BENCH_PORTFOLIO_DATE = "2000-03-31"
+
+def synthetic_portfolios(portfolios, holdings, seed=7):
+    rng = random.Random(seed)
+    dataset = []
+    for i in range(portfolios):
+        details = []
+        for j in range(holdings):
+            reported_price = round(rng.uniform(5, 500), 2)
+            current_price = round(reported_price * rng.uniform(0.5, 1.8), 2)
+            shares = rng.randint(1_000, 5_000_000)
+            details.append(Holding(
+                ticker=f"{BENCH_TICKER_PREFIX}{j:04d}", name=f"Company {j}", portfolio_rate=round(rng.uniform(0.1, 10), 2),
+                recent_activity_type=rng.choice([None, "Add", "Reduce", "Buy"]), recent_activity_value=round(rng.uniform(0, 50), 2),
+                shares=shares, reported_price=reported_price, reported_value_amount=int(shares * reported_price),
+                current_price=current_price, reported_price_rate=round((current_price / reported_price - 1) * 100, 2),
+                low_52_week=round(current_price * 0.7, 2), high_52_week=round(current_price * 1.3, 2)))
+        dataset.append((f"{BENCH_CODE_PREFIX}{i:05d}", details))
+    return dataset
+
+def repriced(details, rng):
+    return [detail._replace(current_price=round(detail.current_price * rng.uniform(0.9, 1.1), 2)) for detail in details]
+
+def delete_bench_rows(conn):
+    """벤치마크가 쓴 행(포트폴리오, 상세, 분기 변화, 가격 스냅샷)을 모두 삭제합니다."""
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT idx FROM investor_portfolio WHERE investor_code LIKE %s", (f"{BENCH_CODE_PREFIX}%",))
+        p_idxs = [row["idx"] for row in cursor.fetchall()]
+        for start in range(0, len(p_idxs), 500):
+            chunk = p_idxs[start:start + 500]
+            placeholders = ", ".join(["%s"] * len(chunk))
+            cursor.execute(f"DELETE FROM portfolio_quarter_diff WHERE p_idx IN ({placeholders}) OR prev_p_idx IN ({placeholders})",
+                           chunk + chunk)
+            cursor.execute(f"DELETE FROM investor_portfolio_detail WHERE p_idx IN ({placeholders})", chunk)
+            cursor.execute(f"DELETE FROM investor_portfolio WHERE idx IN ({placeholders})", chunk)
+        cursor.execute("DELETE FROM holding_price_snapshot WHERE ticker LIKE %s", (f"{BENCH_TICKER_PREFIX}%",))
+    conn.commit()
+
+def in_batches(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def run_backend(dataset, batch):
+    timings = {}
+    with get_pool().connection() as conn:
+        create_tables_if_not_exists(conn)
+        delete_bench_rows(conn)
+
+        p_idxs = []
+        started_at = time.perf_counter()
+        for chunk in in_batches(dataset, batch):
+            for code, details in chunk:
+                p_idx = insert_investor_portfolio(conn, code, code, BENCH_PORTFOLIO_DATE, "Q1 2000",
+                                                  sum(d.reported_value_amount for d in details), len(details))
+                insert_portfolio_details(conn, p_idx, details)
+                p_idxs.append(p_idx)
+            conn.commit()
+        timings["insert"] = time.perf_counter() - started_at
+
+        rng = random.Random(11)
+        refreshed = [repriced(details, rng) for _, details in dataset]
+        started_at = time.perf_counter()
+        for chunk in in_batches(list(zip(p_idxs, refreshed)), batch):
+            for p_idx, details in chunk:
+                update_portfolio_details(conn, p_idx, details)
+            update_portfolio_avg_returns(conn, [p_idx for p_idx, _ in chunk])
+            conn.commit()
+        timings["refresh"] = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        get_portfolio_index(conn)
+        with conn.cursor() as cursor:
+            for p_idx in p_idxs:
+                cursor.execute("""
+                    SELECT ticker, stk_name, portfolio_rate, recent_activity_type,
+                           recent_activity_value, shares, reported_price,
+                           reported_value_amount, current_price, reported_price_rate,
+                           low_52_week, high_52_week
+                    FROM investor_portfolio_detail
+                    WHERE p_idx = %s
+                    ORDER BY portfolio_rate DESC
+                """, (p_idx,))
+                cursor.fetchall()
+        conn.commit()
+        timings["read"] = time.perf_counter() - started_at
+
+        delete_bench_rows(conn)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Storage backend throughput benchmark")
+    parser.add_argument("--backends", nargs="+", default=["sqlite"], choices=["sqlite", "mysql"], help="측정할 백엔드")
+    parser.add_argument("--portfolios", type=int, default=200, help="합성 포트폴리오 수")
+    parser.add_argument("--holdings", type=int, default=50, help="포트폴리오별 보유 종목 수")
+    parser.add_argument("--mysql-db", help="MySQL 벤치마크에 사용할 스크래치 데이터베이스 (기본값: .env의 DB_NAME)")
+    parser.add_argument("--batch", type=int, default=20, help="한 트랜잭션에 묶을 포트폴리오 수 (DB_WRITER_FLUSH_SIZE)")
+    args = parser.parse_args()
+
+    LoggerUtil().get_logger().setLevel(logging.CRITICAL)
+    dataset = synthetic_portfolios(args.portfolios, args.holdings)
+    rows = args.portfolios * args.holdings
+
+    print(f"portfolios={args.portfolios} holdings/portfolio={args.holdings} rows={rows:,} batch={args.batch}")
+    print(f"{'backend':<8} {'phase':<8} {'seconds':>8} {'portfolios/s':>13} {'rows/s':>10}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in args.backends:
+            if name == "sqlite":
+                options = {"path": os.path.join(tmp_dir, "bench.db")}
+            else:
+                options = {"db": args.mysql_db} if args.mysql_db else {}
+            close_pool()
+            configure_backend(name, **options)
+            try:
+                timings = run_backend(dataset, args.batch)
+            except DB_ERRORS as e:
+                print(f"{name:<8} skipped: {e}")
+                continue
+            finally:
+                close_pool()
+            for phase, seconds in timings.items():
+                print(f"{name:<8} {phase:<8} {seconds:>8.3f} {args.portfolios / seconds:>13,.0f} {rows / seconds:>10,.0f}")
+
+if __name__ == "__main__":
+    main()
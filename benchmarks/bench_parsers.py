@@ -0,0 +1,141 @@
+"""파서 마이크로 벤치마크: fixture 코퍼스로 파서 함수별 rows/sec와 최대 메모리 사용량을 측정합니다.
+
+측정 대상 (HTML 문자열 -> 결과, 트리 생성 포함):
+    - _parse_investor_list           (crawl_top_investors의 파싱 단계)
+    - _parse_portfolio_summary       (html.parser / lxml)
+    - _parse_portfolio_details       (html.parser / lxml)
+
+사용법:
+    python benchmarks/bench_parsers.py                       # 전체 실행
+    python benchmarks/bench_parsers.py --filter details      # 이름에 'details'가 포함된 케이스만
+    python benchmarks/bench_parsers.py --save baseline.json  # 결과 저장
+    python benchmarks/bench_parsers.py --compare baseline.json  # 저장된 기준과 비교
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lxml.html  # noqa: E402
+from bs4 import BeautifulSoup  # noqa: E402
+
+from crawler import (  # noqa: E402
+    _parse_investor_list,
+    _parse_portfolio_summary, _parse_portfolio_details,
+    _parse_portfolio_summary_lxml, _parse_portfolio_details_lxml,
+)
+from utils.logger_util import LoggerUtil  # noqa: E402
+from benchmarks.fixture_corpus import (  # noqa: E402
+    saved_holdings_pages, saved_managers_page, synthetic_holdings_page, synthetic_managers_page,
+)
+
+SYNTHETIC_HOLDINGS_ROWS = (1_000, 5_000)
+SYNTHETIC_MANAGERS_ROWS = 2_000
+
+def build_cases(holdings_rows=SYNTHETIC_HOLDINGS_ROWS):
+    """(케이스 이름, 입력 HTML, 처리 행 수, html -> 결과 함수) 목록
+
+    처리 행 수가 None이면 결과 목록의 길이를 사용합니다 (summary는 페이지당 1행으로 계산).
+    """
+    cases = []
+
+    managers_html = saved_managers_page()
+    synthetic_managers_html = synthetic_managers_page(SYNTHETIC_MANAGERS_ROWS)
+    cases.append(("investor_list[saved managers]", managers_html, None, _parse_investor_list))
+    cases.append((f"investor_list[synthetic {SYNTHETIC_MANAGERS_ROWS}]", synthetic_managers_html, None, _parse_investor_list))
+
+    holdings_inputs = [(f"saved {name}", html) for name, _, html in saved_holdings_pages()]
+    holdings_inputs += [(f"synthetic {rows}", synthetic_holdings_page(rows)) for rows in holdings_rows]
+
+    backends = {
+        "html.parser": (
+            lambda html: BeautifulSoup(html, "html.parser"), _parse_portfolio_summary, _parse_portfolio_details
+        ),
+        "lxml": (
+            lxml.html.document_fromstring, _parse_portfolio_summary_lxml, _parse_portfolio_details_lxml
+        ),
+    }
+    for input_name, html in holdings_inputs:
+        for backend_name, (build_tree, parse_summary, parse_details) in backends.items():
+            cases.append((f"summary[{backend_name}][{input_name}]", html, 1,
+                          lambda html, build_tree=build_tree, parse=parse_summary: parse(build_tree(html))))
+            cases.append((f"details[{backend_name}][{input_name}]", html, None,
+                          lambda html, build_tree=build_tree, parse=parse_details: parse(build_tree(html))))
+    return cases
+
+def measure(func, html, min_time, max_rounds):
+    """min_time 이상 또는 max_rounds 회 반복하여 (실행 시간 목록, 마지막 결과)를 반환합니다."""
+    timings = []
+    result = None
+    started_at = time.perf_counter()
+    while len(timings) < max_rounds and (len(timings) < 3 or time.perf_counter() - started_at < min_time):
+        round_started_at = time.perf_counter()
+        result = func(html)
+        timings.append(time.perf_counter() - round_started_at)
+    return timings, result
+
+def measure_peak_memory(func, html):
+    """tracemalloc 기준 최대 메모리. Python 객체 할당만 추적하므로 lxml의 C 트리 메모리는 포함되지 않습니다."""
+    tracemalloc.start()
+    try:
+        func(html)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Parser micro-benchmarks on the offline fixture corpus")
+    parser.add_argument("--rows", type=int, nargs="+", default=list(SYNTHETIC_HOLDINGS_ROWS),
+                        help="합성 holdings 페이지 행 수 (예: --rows 1000 5000 20000)")
+    parser.add_argument("--filter", default="", help="케이스 이름에 포함된 문자열로 필터링")
+    parser.add_argument("--min-time", type=float, default=0.5, help="케이스별 최소 측정 시간(초)")
+    parser.add_argument("--max-rounds", type=int, default=200, help="케이스별 최대 반복 횟수")
+    parser.add_argument("--save", help="결과를 JSON으로 저장할 경로")
+    parser.add_argument("--compare", help="비교할 기준 JSON 경로 (--save로 저장한 파일)")
+    args = parser.parse_args()
+
+    LoggerUtil().get_logger().setLevel(logging.CRITICAL)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = {}
+    print(f"{'case':<56} {'rounds':>6} {'min ms':>9} {'mean ms':>9} {'rows/s':>11} {'peak MiB':>9}  vs baseline")
+    for name, html, rows, func in build_cases(args.rows):
+        if args.filter not in name:
+            continue
+        timings, result = measure(func, html, args.min_time, args.max_rounds)
+        if rows is None:
+            rows = len(result)
+        mean = statistics.mean(timings)
+        peak_bytes = measure_peak_memory(func, html)
+        results[name] = {
+            "rounds": len(timings),
+            "min_s": min(timings),
+            "mean_s": mean,
+            "rows": rows,
+            "rows_per_s": rows / mean if mean else 0,
+            "peak_bytes": peak_bytes,
+        }
+
+        delta = ""
+        if name in baseline and baseline[name]["mean_s"]:
+            delta = f"{(mean / baseline[name]['mean_s'] - 1) * 100:+.1f}% time"
+        print(f"{name:<56} {len(timings):>6} {min(timings) * 1000:>9.2f} {mean * 1000:>9.2f} "
+              f"{results[name]['rows_per_s']:>11,.0f} {peak_bytes / 1024 / 1024:>9.2f}  {delta}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"결과 저장: {args.save}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""holdings 레코드 메모리 벤치마크: 행마다 12키 dict를 만들 때와 Holding(NamedTuple)을 만들 때를 비교합니다.
+
+같은 셀 텍스트로 _build_detail_item을 호출하여 두 방식의 레코드를 만들고,
+tracemalloc으로 레코드 목록이 유지하는 메모리(값 객체 포함)와 executemany 튜플 변환 시간을 측정합니다.
+
+사용법:
+    python benchmarks/bench_record_memory.py              # 100,000행
+    python benchmarks/bench_record_memory.py --rows 500000
+"""
+import argparse
+import gc
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lxml.html  # noqa: E402
+
+from crawler import _build_detail_item, _lxml_text  # noqa: E402
+from utils.models import Holding  # noqa: E402
+from utils.logger_util import LoggerUtil  # noqa: E402
+from benchmarks.fixture_corpus import synthetic_holdings_page  # noqa: E402
+
+DICT_KEYS = Holding._fields
+
+def extract_cell_texts(rows):
+    """합성 holdings 페이지에서 행별 (셀 텍스트, 링크 텍스트, span 텍스트)를 미리 추출합니다."""
+    tree = lxml.html.document_fromstring(synthetic_holdings_page(rows))
+    cells = []
+    for row in tree.xpath("//table[@id='grid']/tbody/tr"):
+        cols = row.xpath("./td")
+        links = cols[1].xpath(".//a")
+        spans = cols[1].xpath(".//span")
+        cells.append(([_lxml_text(col) for col in cols],
+                      _lxml_text(links[0]) if links else None,
+                      _lxml_text(spans[0]) if spans else None))
+    return cells
+
+def build_dicts(cells):
+    # 변경 전 crawler와 같은 12키 dict (값 객체는 레코드 방식과 동일하게 생성)
+    return [dict(zip(DICT_KEYS, _build_detail_item(i, *cell))) for i, cell in enumerate(cells)]
+
+def build_records(cells):
+    return [_build_detail_item(i, *cell) for i, cell in enumerate(cells)]
+
+def dict_insert_rows(details, p_idx=1):
+    return [(p_idx, d.get('ticker'), d.get('name'), d.get('portfolio_rate'), d.get('recent_activity_type'),
+             d.get('recent_activity_value'), d.get('shares'), d.get('reported_price'), d.get('reported_value_amount'),
+             d.get('current_price'), d.get('reported_price_rate'), d.get('low_52_week'), d.get('high_52_week'))
+            for d in details]
+
+def record_insert_rows(details, p_idx=1):
+    return [detail.insert_row(p_idx) for detail in details]
+
+def measure_retained(build, cells):
+    """build(cells)가 반환한 목록이 유지하는 메모리(bytes)와 최대 메모리, 생성 시간"""
+    gc.collect()
+    tracemalloc.start()
+    started_at = time.perf_counter()
+    result = build(cells)
+    elapsed = time.perf_counter() - started_at
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak, elapsed
+
+def measure_time(func, details, rounds=5):
+    timings = []
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        func(details)
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Holding record vs dict memory benchmark")
+    parser.add_argument("--rows", type=int, default=100_000, help="측정할 holdings 행 수")
+    args = parser.parse_args()
+
+    LoggerUtil().get_logger().setLevel(logging.CRITICAL)
+    cells = extract_cell_texts(args.rows)
+    per_100k = 100_000 / len(cells)
+
+    print(f"rows={len(cells):,}")
+    print(f"{'kind':<10} {'retained MiB':>13} {'per 100k MiB':>13} {'bytes/row':>10} {'peak MiB':>9} {'build s':>8} {'to tuples s':>12}")
+    measured = {}
+    for kind, build, to_rows in (("dict", build_dicts, dict_insert_rows), ("Holding", build_records, record_insert_rows)):
+        details, retained, peak, elapsed = measure_retained(build, cells)
+        tuple_seconds = measure_time(to_rows, details)
+        measured[kind] = retained
+        print(f"{kind:<10} {retained / 2**20:>13.2f} {retained * per_100k / 2**20:>13.2f} {retained / len(cells):>10.0f} "
+              f"{peak / 2**20:>9.2f} {elapsed:>8.3f} {tuple_seconds:>12.3f}")
+        del details
+
+    saved = measured["dict"] - measured["Holding"]
+    print(f"saving per 100k rows: {saved * per_100k / 2**20:.2f} MiB ({saved / measured['dict'] * 100:.1f}%)")
+
+if __name__ == "__main__":
+    main()
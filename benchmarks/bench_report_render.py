@@ -0,0 +1,79 @@
+"""리포트 렌더링 벤치마크: 기존 방식(매번 템플릿 파일 읽기 + str.replace 세 번)과 컴파일·캐시한 Jinja2 템플릿 스트리밍 렌더링을 비교합니다.
+
+DB 없이 합성 포맷팅 데이터(format_portfolio_data 결과 형식)로 임시 디렉터리에 리포트를 씁니다.
+
+사용법:
+    python benchmarks/bench_report_render.py --reports 200 --holdings 100
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import report_generator  # noqa: E402
+from report_generator import load_report_template, render_report, report_output_path  # noqa: E402
+
+def synthetic_reports(reports, holdings, seed=5):
+    rng = random.Random(seed)
+    dataset = []
+    for i in range(reports):
+        stocks = [{
+            'symbol': f"T{j:04d}", 'name': f"Company {j} & Sons <Class A>", 'percentage': round(rng.uniform(0.1, 10), 2),
+            'value': rng.randint(10**6, 10**10), 'change': f"+{rng.uniform(0, 50):.2f}%", 'activity': "Add 1.50%",
+            'activityType': "add",
+        } for j in range(holdings)]
+        meta = {'total_value': "$1.0B", 'number_of_stocks': holdings, 'portfolio_date': "2025-03-31",
+                'investor_name': f"Investor {i} \"Fund\" 투자", 'investor_code': f"INV{i:05d}"}
+        dataset.append({'meta': meta, 'stocks': stocks})
+    return dataset
+
+def legacy_render(data, legacy_path, output_path):
+    with open(legacy_path, 'r', encoding='utf-8') as f:
+        template_content = f.read()
+    template_content = template_content.replace('const stocks = []', f'const stocks = {json.dumps(data["stocks"], ensure_ascii=False)}')
+    template_content = template_content.replace('const investor_name = ""', f'const investor_name = "{data["meta"]["investor_name"]}"')
+    template_content = template_content.replace('const portfolio_date = ""', f'const portfolio_date = "{data["meta"]["portfolio_date"]}"')
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(template_content)
+
+def main():
+    parser = argparse.ArgumentParser(description="Report template render benchmark")
+    parser.add_argument("--reports", type=int, default=200, help="렌더링할 리포트 수")
+    parser.add_argument("--holdings", type=int, default=100, help="리포트별 보유 종목 수")
+    args = parser.parse_args()
+
+    report_generator.logger.setLevel(logging.CRITICAL)
+    dataset = synthetic_reports(args.reports, args.holdings)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 빈 데이터로 렌더링한 단독 HTML이 이전 방식의 템플릿 파일과 같은 형태입니다 (const investor_name = "" 등)
+        source = load_report_template().render(investor_name="", portfolio_date="", stocks=[], assets=None)
+        legacy_path = os.path.join(tmp_dir, "legacy_template.html")
+        with open(legacy_path, 'w', encoding='utf-8') as f:
+            f.write(source)
+
+        started_at = time.perf_counter()
+        for data in dataset:
+            legacy_render(data, legacy_path, report_output_path(data["meta"], tmp_dir))
+        legacy_seconds = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        load_report_template()
+        for data in dataset:
+            render_report(data, report_output_path(data["meta"], tmp_dir))
+        compiled_seconds = time.perf_counter() - started_at
+        output_bytes = os.path.getsize(report_output_path(dataset[0]["meta"], tmp_dir))
+
+    print(f"reports={args.reports} holdings/report={args.holdings} output={output_bytes / 1024:.1f} KB/report")
+    print(f"{'renderer':<22} {'seconds':>8} {'reports/s':>10} {'ms/report':>10}")
+    for name, seconds in (("read + str.replace", legacy_seconds), ("compiled jinja stream", compiled_seconds)):
+        print(f"{name:<22} {seconds:>8.3f} {args.reports / seconds:>10,.0f} {seconds / args.reports * 1000:>10.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""오프라인 벤치마크/검증용 HTML fixture 모음
+
+- fixtures/ 폴더의 저장된 managers.php, holdings.php(여러 페이지) HTML
+- 수천 행 규모의 합성 holdings/managers 페이지 (stub_server의 HTML 생성기 사용)
+"""
+import glob
+import os
+import re
+
+from benchmarks.stub_server import build_holdings_page, build_managers_page
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+def saved_holdings_pages():
+    """저장된 holdings 페이지 목록 [(파일명, m_code, html)] (파일명 형식: holdings_{m_code}_L{page}.html)"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "holdings_*.html"))):
+        name = os.path.basename(path)
+        m_code = re.match(r"holdings_(\w+?)_L\d+\.html", name).group(1)
+        pages.append((name, m_code, load_fixture(name)))
+    return pages
+
+def saved_managers_page():
+    return load_fixture("managers.html")
+
+def synthetic_holdings_page(total_rows, code="SYN"):
+    """total_rows 행을 한 페이지에 담은 대형 합성 holdings 페이지"""
+    return build_holdings_page(code, 1, total_rows, rows_per_page=total_rows)
+
+def synthetic_holdings_pages(total_rows, code="SYN"):
+    """dataroma처럼 여러 페이지로 나뉜 합성 holdings 페이지 목록"""
+    page_count = max(1, -(-total_rows // 100))
+    return [build_holdings_page(code, page, total_rows) for page in range(1, page_count + 1)]
+
+def synthetic_managers_page(investor_count):
+    return build_managers_page([f"M{i:05d}" for i in range(investor_count)])
@@ -0,0 +1,132 @@
+"""dataroma 페이지 구조를 흉내 내는 로컬 스텁 서버 (벤치마크 전용)"""
+import hashlib
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+ROWS_PER_PAGE = 100
+
+def build_holdings_row(code, row_num):
+    ticker = f"{code}{row_num:04d}"
+    return (
+        "<tr>"
+        f'<td class="hist"><a href="/m/hist/hist.php?f={code}&s={ticker}">&#9636;</a></td>'
+        f'<td class="stock"><a href="/m/stock.php?sym={ticker}">{ticker}<span> - Company {row_num} Inc.</span></a></td>'
+        f"<td>{(row_num % 97) / 10 + 0.1:.2f}</td>"
+        f'<td class="buy">Add {(row_num % 50) + 0.5:.2f}%</td>'
+        f"<td>{1000 * row_num + 17:,}</td>"
+        f"<td>${100 + row_num % 300:.2f}</td>"
+        f"<td>${(1000 * row_num + 17) * (100 + row_num % 300):,}</td>"
+        "<td></td>"
+        f"<td>${110 + row_num % 300:.2f}</td>"
+        f"<td>{(row_num % 40) - 20:.2f}%</td>"
+        f"<td>${80 + row_num % 300:.2f}</td>"
+        f"<td>${150 + row_num % 300:.2f}</td>"
+        "</tr>"
+    )
+
+def build_holdings_page(code, page, total_rows, rows_per_page=ROWS_PER_PAGE):
+    """holdings.php?m=code&L=page 형태의 HTML을 생성합니다."""
+    page_count = max(1, -(-total_rows // rows_per_page))
+    first_row = (page - 1) * rows_per_page + 1
+    last_row = min(total_rows, page * rows_per_page)
+    rows = "".join(build_holdings_row(code, row_num) for row_num in range(first_row, last_row + 1))
+
+    pages_html = ""
+    if page_count > 1:
+        links = "".join(
+            f'<a href="/m/holdings.php?m={code}&amp;L={num}">{num}</a>' for num in range(1, page_count + 1)
+        )
+        pages_html = f'<div id="pages">{links}</div>'
+
+    return (
+        "<html><head><title>Holdings</title></head><body><div id=\"wrap\">"
+        f'<div id="f_name">{code} Capital</div>'
+        '<p id="p2">Period: <span>Q1 2025</span><br>Portfolio date: <span>31 Mar 2025</span><br>'
+        f"No. of stocks: <span>{total_rows}</span><br>Portfolio value: <span>$123,456,789,000</span></p>"
+        '<table id="grid"><thead><tr><th></th><th>Stock</th><th>% of portfolio</th><th>Recent activity</th>'
+        "<th>Shares</th><th>Reported Price*</th><th>Value</th><th></th><th>Current Price</th>"
+        "<th>+/- Reported Price</th><th>52 week Low</th><th>52 week High</th></tr></thead>"
+        f"<tbody>{rows}</tbody></table>{pages_html}</div></body></html>"
+    )
+
+def build_managers_page(codes):
+    """managers.php 형태의 HTML을 생성합니다."""
+    rows = "".join(
+        f'<tr><td class="man"><a href="/m/holdings.php?m={code}">{code} Capital</a></td>'
+        f"<td>${(len(codes) - i) * 1.5:.1f}B</td><td>{10 + i}</td></tr>"
+        for i, code in enumerate(codes)
+    )
+    return f'<html><body><table id="grid"><thead><tr><th>Manager</th><th>Value</th><th>No.</th></tr></thead><tbody>{rows}</tbody></table></body></html>'
+
+class StubDataromaServer:
+    """지정한 지연(latency)으로 holdings/managers 페이지를 응답하는 로컬 HTTP 서버"""
+
+    def __init__(self, rows_by_code, latency=0.1):
+        self.rows_by_code = rows_by_code
+        self.latency = latency
+        self.request_count = 0
+        self.not_modified_count = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with stub._lock:
+                    stub.request_count += 1
+                time.sleep(stub.latency)
+
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query)
+                if parsed.path == "/m/managers.php":
+                    body = build_managers_page(list(stub.rows_by_code))
+                elif parsed.path == "/m/holdings.php" and query.get("m", [""])[0] in stub.rows_by_code:
+                    code = query["m"][0]
+                    page = int(query.get("L", ["1"])[0])
+                    body = build_holdings_page(code, page, stub.rows_by_code[code])
+                else:
+                    self.send_error(404)
+                    return
+
+                payload = body.encode("utf-8")
+                etag = '"' + hashlib.md5(payload).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    with stub._lock:
+                        stub.not_modified_count += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._server.shutdown()
+        self._server.server_close()
@@ -1,22 +1,82 @@
 import requests
 from bs4 import BeautifulSoup
 import re
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 from datetime import datetime
-from fake_useragent import UserAgent
+import os
+import threading
 from utils.logger_util import LoggerUtil
-import time # 페이지 간 요청 딜레이를 위해 추가 (필요시)
-import random # 페이지 간 요청 딜레이를 위해 추가 (필요시)
+from utils.http_util import HttpUtil
+from utils.http_cache import ResponseCache
+from utils.models import PortfolioSummary, Holding, summary_from_cache, holdings_from_cache
+from utils.rate_limiter import HostRateLimiter, RETRYABLE_STATUS_CODES, backoff_delay, parse_retry_after
+try:
+    import lxml.html
+except ImportError: # lxml이 없으면 html.parser 백엔드만 사용
+    lxml = None
+import time
 
 logger = LoggerUtil().get_logger()
 
-def crawl_top_investors(top_count=5):
-    ua = UserAgent()
-    url = "https://dataroma.com/m/managers.php"
-    headers = {"User-Agent": ua.random}
+DATAROMA_BASE_URL = "https://dataroma.com"
+PAGE_FETCH_WORKERS = 4 # 투자자 한 명의 페이지네이션을 병렬로 가져올 최대 스레드 수
+PARSE_WORKERS = min(4, os.cpu_count() or 1) # AsyncCrawlEngine의 파싱 전용 스레드 수 (요청 스레드와 분리)
+
+# 429/5xx/연결 오류 재시도 설정 (지수 백오프 + jitter, Retry-After 우선)
+CRAWL_MAX_RETRIES = int(os.getenv("CRAWL_MAX_RETRIES", 4))
+CRAWL_BACKOFF_BASE = float(os.getenv("CRAWL_BACKOFF_BASE", 0.5))
+CRAWL_BACKOFF_MAX = float(os.getenv("CRAWL_BACKOFF_MAX", 30))
+
+# 파싱 결과 캐시 키. 파싱 로직이나 결과 구조가 바뀌면 버전을 올려 이전 캐시를 무효화합니다.
+INVESTOR_LIST_PARSER_KEY = "investors:v1"
+HOLDINGS_PARSER_KEY = "holdings:v2"
+HOLDINGS_SUMMARY_PARSER_KEY = "holdings-summary:v2"
+
+# holdings 페이지 파서 백엔드 ("lxml" 또는 "html.parser")
+PARSER_BACKEND = os.getenv("CRAWLER_PARSER_BACKEND", "lxml" if lxml is not None else "html.parser")
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache():
+    """프로세스 공용 HTTP 응답 캐시. 첫 요청 때 만들므로 모듈 import만으로 캐시 디렉터리를 만들거나 정리하지 않습니다."""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache()
+    return _response_cache
+
+def configure_response_cache(**options):
+    """프로세스 공용 HTTP 응답 캐시를 주어진 옵션(ResponseCache 인자)으로 교체합니다. 예: configure_response_cache(enabled=False)"""
+    global _response_cache
+    with _response_cache_lock:
+        _response_cache = ResponseCache(**options)
+    return _response_cache
+
+def crawl_top_investors(top_count=5, base_url=DATAROMA_BASE_URL):
+    """managers.php에서 포트폴리오 가치 기준 상위 top_count명의 투자자를 반환합니다 (None이면 전체)."""
+    url = f"{base_url}/m/managers.php"
     logger.info(f"Crawling {url}...")
-    resp = requests.get(url, headers=headers, timeout=10)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+    html, body_hash = _fetch_page(url, timeout=10)
+    investors = _parse_cached(url, html, body_hash, INVESTOR_LIST_PARSER_KEY, _parse_investor_list)
+
+    logger.info(f"Total investors extracted before sorting: {len(investors)}")
+    if not investors:
+        logger.warning("No investors data extracted. Returning empty list.")
+        return []
+    
+    # 가져올 상위 투자자 수 제한 (None이면 전체 투자자)
+    top_count = len(investors) if top_count is None else max(1, min(top_count, len(investors)))  # 최소 1명, 최대 전체 수
+    top_investors = sorted(investors, key=lambda x: x["value"], reverse=True)[:top_count]
+    logger.info(f"Top {top_count} investors after sorting: {[investor['code'] for investor in top_investors]}")
+    return top_investors
+
+def _parse_investor_list(html):
+    """managers.php HTML에서 투자자 목록({"code", "name", "value"})을 추출합니다."""
+    soup = BeautifulSoup(html, "html.parser")
     table = soup.find("table", {"id": "grid"})
     if not table:
         logger.error("Error: 투자자 테이블을 찾을 수 없습니다.")
@@ -73,17 +133,105 @@ def crawl_top_investors(top_count=5):
             value = 0
             
         investors.append({"code": code, "name": name, "value": value})
+
+    return investors
+
+def _build_portfolio_summary(span_texts):
+    """p#p2의 span 텍스트 목록(기간, 날짜, 종목 수, 가치)으로 PortfolioSummary를 만듭니다."""
+    portfolio_period = span_texts[0]
+    portfolio_date_str = span_texts[1]
+    number_of_stocks_str = span_texts[2]
+    portfolio_value_str = span_texts[3]
+
+    parsed_dt = datetime.strptime(portfolio_date_str, "%d %b %Y")
+    portfolio_date = parsed_dt.strftime("%Y-%m-%d")
+    number_of_stocks = int(number_of_stocks_str)
+    portfolio_value = int(portfolio_value_str.replace("$", "").replace(",", ""))
+
+    return PortfolioSummary(portfolio_period, portfolio_date, number_of_stocks, portfolio_value)
+
+def _build_detail_item(i, col_texts, link_text, span_text):
+    """#grid 한 행의 셀 텍스트로 Holding을 만듭니다. 티커를 파싱할 수 없으면 None을 반환합니다.
+
+    - col_texts: 각 td의 strip된 텍스트
+    - link_text: 두 번째 열 첫 a 태그의 strip된 텍스트 (없으면 None)
+    - span_text: 두 번째 열 첫 span 태그의 strip된 텍스트 (없으면 None)
+    """
+    col1_text_content = col_texts[1]
+    raw_ticker_text = link_text if link_text is not None else ""
+    ticker = raw_ticker_text 
+    name = ""
+
+    if " - " in raw_ticker_text:
+        parts = raw_ticker_text.split(" - ", 1)
+        ticker = parts[0].strip()
+        name = parts[1].strip() if len(parts) > 1 else ""
     
-    logger.info(f"Total investors extracted before sorting: {len(investors)}")
-    if not investors:
-        logger.warning("No investors data extracted. Returning empty list.")
-        return []
+    if span_text is not None:
+        span_name_text = span_text.lstrip(" -").strip()
+        if span_name_text: name = span_name_text
     
-    # 가져올 상위 투자자 수 제한
-    top_count = max(1, min(top_count, len(investors)))  # 최소 1명, 최대 전체 수
-    top_investors = sorted(investors, key=lambda x: x["value"], reverse=True)[:top_count]
-    logger.info(f"Top {top_count} investors after sorting: {top_investors}")
-    return top_investors
+    if not name and ticker and " - " not in raw_ticker_text: 
+        potential_name_from_col_text = col1_text_content.replace(ticker, "").strip().lstrip(" -").strip()
+        if potential_name_from_col_text: name = potential_name_from_col_text
+    
+    if not name and ticker: name = ticker
+    
+    if not ticker:
+        logger.warning(f"Skipping row {i+1} as ticker could not be parsed from: {col1_text_content}")
+        return None
+    
+    if name == ticker and " - " in ticker:
+         parts = ticker.split(" - ", 1)
+         ticker = parts[0].strip()
+         name = parts[1].strip() if len(parts) > 1 else name
+    
+    if len(ticker) > 50: 
+        logger.warning(f"Parsed ticker for row {i+1} is too long: '{ticker}' (length {len(ticker)}). Original text: {col1_text_content}")
+        ticker = ticker[:50] # 티커 길이 제한
+
+    recent_activity_type = None
+    recent_activity_value = None
+    activity_col_text = col_texts[3]
+    if activity_col_text and activity_col_text != "-":
+        activity_parts = activity_col_text.split(" ")
+        recent_activity_type = activity_parts[0].strip().lower()
+        if len(activity_parts) > 1 and "%" in activity_parts[-1]:
+            try:
+                recent_activity_value = float(activity_parts[-1].replace("%", "").strip())
+            except ValueError:
+                logger.warning(f"Could not parse recent_activity_value from {activity_parts[-1]} for row {i+1}")
+
+    detail_item = Holding(
+        ticker=ticker, name=name,
+        portfolio_rate=float(col_texts[2].replace("%", "")),
+        recent_activity_type=recent_activity_type,
+        recent_activity_value=recent_activity_value,
+        shares=int(col_texts[4].replace(",", "")),
+        reported_price=float(col_texts[5].replace("$", "").replace(",", "")),
+        reported_value_amount=int(col_texts[6].replace("$", "").replace(",", "")),
+        current_price=float(col_texts[8].replace("$", "").replace(",", "")),
+        reported_price_rate=float(col_texts[9].replace("%", "")),
+        low_52_week=float(col_texts[10].replace("$", "").replace(",", "")),
+        high_52_week=float(col_texts[11].replace("$", "").replace(",", ""))
+    )
+    
+    return detail_item
+
+def _page_url_from_link(link_text, href, m_code, base_url):
+    """페이지네이션 링크가 2페이지 이후의 holdings 링크이면 (페이지 번호, URL)을 반환합니다."""
+    if not link_text.isdigit():
+        return None
+    page_num_in_link = int(link_text)
+    if page_num_in_link == 1:
+        return None
+
+    match = re.search(r"/m/holdings\.php\?m=" + re.escape(m_code) + r"&L=(\d+)", href)
+    if match and page_num_in_link == int(match.group(1)):
+        return page_num_in_link, f"{base_url}{href}"
+    return None
+
+# --- html.parser (BeautifulSoup) 백엔드 ---
 
 def _parse_portfolio_summary(soup):
     try:
@@ -97,22 +245,7 @@ def _parse_portfolio_summary(soup):
             logger.warning(f"Expected at least 4 spans in p#p2, found {len(spans)}")
             return None
 
-        portfolio_period = spans[0].text.strip()
-        portfolio_date_str = spans[1].text.strip()
-        number_of_stocks_str = spans[2].text.strip()
-        portfolio_value_str = spans[3].text.strip()
-
-        parsed_dt = datetime.strptime(portfolio_date_str, "%d %b %Y")
-        portfolio_date = parsed_dt.strftime("%Y-%m-%d")
-        number_of_stocks = int(number_of_stocks_str)
-        portfolio_value = int(portfolio_value_str.replace("$", "").replace(",", ""))
-
-        return {
-            "portfolio_period": portfolio_period,
-            "portfolio_date": portfolio_date,
-            "number_of_stocks": number_of_stocks,
-            "portfolio_value": portfolio_value
-        }
+        return _build_portfolio_summary([span.text.strip() for span in spans[:4]])
     except Exception as e:
         logger.error(f"Error parsing portfolio summary: {e}", exc_info=True)
         return None
@@ -140,65 +273,16 @@ def _parse_portfolio_details(soup):
                 continue
             
             try:
-                col1_text_content = cols[1].text.strip()
                 stock_col_1_link = cols[1].find("a")
-                raw_ticker_text = stock_col_1_link.text.strip() if stock_col_1_link else ""
-                ticker = raw_ticker_text 
-                name = ""
-
-                if " - " in raw_ticker_text:
-                    parts = raw_ticker_text.split(" - ", 1)
-                    ticker = parts[0].strip()
-                    name = parts[1].strip() if len(parts) > 1 else ""
-                
                 stock_col_1_span = cols[1].find("span")
-                if stock_col_1_span:
-                    span_name_text = stock_col_1_span.text.strip().lstrip(" -").strip()
-                    if span_name_text: name = span_name_text
-                
-                if not name and ticker and " - " not in raw_ticker_text: 
-                    potential_name_from_col_text = col1_text_content.replace(ticker, "").strip().lstrip(" -").strip()
-                    if potential_name_from_col_text: name = potential_name_from_col_text
-                
-                if not name and ticker: name = ticker
-                
-                if not ticker:
-                    logger.warning(f"Skipping row {i+1} as ticker could not be parsed from: {col1_text_content}")
-                    continue
-                
-                if name == ticker and " - " in ticker:
-                     parts = ticker.split(" - ", 1)
-                     ticker = parts[0].strip()
-                     name = parts[1].strip() if len(parts) > 1 else name
-                
-                if len(ticker) > 50: 
-                    logger.warning(f"Parsed ticker for row {i+1} is too long: '{ticker}' (length {len(ticker)}). Original text: {col1_text_content}")
-                    ticker = ticker[:50] # 티커 길이 제한
-
-                detail_item = {
-                    "ticker": ticker, "name": name,
-                    "portfolio_rate": float(cols[2].text.strip().replace("%", "")),
-                    "shares": int(cols[4].text.strip().replace(",", "")),
-                    "reported_price": float(cols[5].text.strip().replace("$", "").replace(",", "")),
-                    "reported_value_amount": int(cols[6].text.strip().replace("$", "").replace(",", "")),
-                    "current_price": float(cols[8].text.strip().replace("$", "").replace(",", "")),
-                    "reported_price_rate": float(cols[9].text.strip().replace("%", "")),
-                    "low_52_week": float(cols[10].text.strip().replace("$", "").replace(",", "")),
-                    "high_52_week": float(cols[11].text.strip().replace("$", "").replace(",", "")),
-                    "recent_activity_type": None, "recent_activity_value": None
-                }
-                
-                activity_col_text = cols[3].text.strip()
-                if activity_col_text and activity_col_text != "-":
-                    activity_parts = activity_col_text.split(" ")
-                    detail_item["recent_activity_type"] = activity_parts[0].strip().lower()
-                    if len(activity_parts) > 1 and "%" in activity_parts[-1]:
-                        try:
-                            detail_item["recent_activity_value"] = float(activity_parts[-1].replace("%", "").strip())
-                        except ValueError:
-                            logger.warning(f"Could not parse recent_activity_value from {activity_parts[-1]} for row {i+1}")
-                
-                details.append(detail_item)
+                detail_item = _build_detail_item(
+                    i,
+                    [col.text.strip() for col in cols],
+                    stock_col_1_link.text.strip() if stock_col_1_link else None,
+                    stock_col_1_span.text.strip() if stock_col_1_span else None
+                )
+                if detail_item:
+                    details.append(detail_item)
             except Exception as e_row:
                 logger.error(f"Error processing stock row {i+1}. Content: {row.text[:100]}. Error: {e_row}", exc_info=True)
                 continue
@@ -207,70 +291,287 @@ def _parse_portfolio_details(soup):
         logger.error(f"Error parsing portfolio details table: {e_table}", exc_info=True)
         return details
 
-def crawl_dataroma_portfolio_page(m_code):
-    ua = UserAgent()
-    base_url = "https://dataroma.com"
+def _extract_page_urls(soup, m_code, base_url):
+    """div#pages에서 2페이지 이후의 holdings URL을 페이지 번호 순으로 반환합니다."""
+    pages_div = soup.find("div", id="pages")
+    if not pages_div:
+        return []
+
+    urls_by_page = dict(filter(None, (
+        _page_url_from_link(link_tag.text.strip(), link_tag['href'], m_code, base_url)
+        for link_tag in pages_div.find_all("a", href=True)
+    )))
+    return [urls_by_page[page_num] for page_num in sorted(urls_by_page)]
+
+# --- lxml 백엔드: 문서 전체를 C 파서로 읽고 XPath로 p#p2, table#grid, div#pages만 탐색합니다 ---
+
+def _lxml_text(element):
+    return element.text_content().strip()
+
+def _parse_portfolio_summary_lxml(tree):
+    try:
+        p2_tags = tree.xpath("//p[@id='p2']")
+        if not p2_tags:
+            logger.warning("Summary p#p2 tag not found.")
+            return None
+
+        spans = p2_tags[0].xpath(".//span")
+        if len(spans) < 4:
+            logger.warning(f"Expected at least 4 spans in p#p2, found {len(spans)}")
+            return None
+
+        return _build_portfolio_summary([_lxml_text(span) for span in spans[:4]])
+    except Exception as e:
+        logger.error(f"Error parsing portfolio summary: {e}", exc_info=True)
+        return None
+
+def _parse_portfolio_details_lxml(tree):
+    details = []
+    try:
+        stock_tables = tree.xpath("//table[@id='grid']")
+        if not stock_tables:
+            logger.warning("Details table #grid not found.")
+            return details
+
+        tbodies = stock_tables[0].xpath(".//tbody")
+        if not tbodies:
+            logger.warning("Details tbody in #grid not found.")
+            return details
+
+        stock_rows = tbodies[0].xpath(".//tr")
+        logger.debug(f"Found {len(stock_rows)} stock rows for details on current page.")
+
+        for i, row in enumerate(stock_rows):
+            cols = row.xpath(".//td")
+            if len(cols) < 12:
+                logger.warning(f"Skipping stock row {i+1} due to insufficient columns: {len(cols)}")
+                continue
+
+            try:
+                stock_col_1_links = cols[1].xpath(".//a")
+                stock_col_1_spans = cols[1].xpath(".//span")
+                detail_item = _build_detail_item(
+                    i,
+                    [_lxml_text(col) for col in cols],
+                    _lxml_text(stock_col_1_links[0]) if stock_col_1_links else None,
+                    _lxml_text(stock_col_1_spans[0]) if stock_col_1_spans else None
+                )
+                if detail_item:
+                    details.append(detail_item)
+            except Exception as e_row:
+                logger.error(f"Error processing stock row {i+1}. Content: {row.text_content()[:100]}. Error: {e_row}", exc_info=True)
+                continue
+        return details
+    except Exception as e_table:
+        logger.error(f"Error parsing portfolio details table: {e_table}", exc_info=True)
+        return details
+
+def _extract_page_urls_lxml(tree, m_code, base_url):
+    pages_divs = tree.xpath("//div[@id='pages']")
+    if not pages_divs:
+        return []
+
+    urls_by_page = dict(filter(None, (
+        _page_url_from_link(_lxml_text(link_tag), link_tag.get("href"), m_code, base_url)
+        for link_tag in pages_divs[0].xpath(".//a[@href]")
+    )))
+    return [urls_by_page[page_num] for page_num in sorted(urls_by_page)]
+
+def _parse_holdings_html(html, m_code, base_url, backend=None):
+    """holdings.php HTML 한 페이지를 {"summary", "details", "page_urls"}로 파싱합니다.
+
+    backend는 "lxml"(기본값, lxml 설치 시) 또는 "html.parser"이며, 두 백엔드는 같은 결과를 반환합니다.
+    """
+    backend = backend or PARSER_BACKEND
+    if backend == "lxml":
+        tree = lxml.html.document_fromstring(html)
+        return {
+            "summary": _parse_portfolio_summary_lxml(tree),
+            "details": _parse_portfolio_details_lxml(tree),
+            "page_urls": _extract_page_urls_lxml(tree, m_code, base_url)
+        }
+
+    soup = BeautifulSoup(html, "html.parser")
+    return {
+        "summary": _parse_portfolio_summary(soup),
+        "details": _parse_portfolio_details(soup),
+        "page_urls": _extract_page_urls(soup, m_code, base_url)
+    }
+
+def _parse_holdings_summary_html(html, backend=None):
+    """holdings.php HTML에서 p#p2 요약만 파싱합니다 (증분 크롤링에서 상세 파싱 전 판단용)."""
+    backend = backend or PARSER_BACKEND
+    if backend == "lxml":
+        return _parse_portfolio_summary_lxml(lxml.html.document_fromstring(html))
+    return _parse_portfolio_summary(BeautifulSoup(html, "html.parser"))
+
+def _get_with_retry(url, headers=None, timeout=15):
+    """호스트별 레이트 리미터를 거쳐 GET 요청을 보내고, 429/5xx/연결 오류는 백오프 후 재시도합니다.
+
+    Retry-After 헤더가 있으면 그 시간을, 없으면 지수 백오프 + jitter 시간을 기다립니다.
+    재시도를 모두 소진하면 마지막 응답을 반환하거나 마지막 예외를 다시 발생시킵니다.
+    연결 오류/타임아웃 이외의 예외는 재시도하지 않고 실패로 기록한 뒤 그대로 발생시킵니다.
+    서킷이 열려 있으면 CircuitOpenError(RequestException)가 발생합니다.
+    """
+    http = HttpUtil()
+    limiter = HostRateLimiter()
+    for attempt in range(CRAWL_MAX_RETRIES + 1):
+        limiter.acquire(url)
+        started_at = time.monotonic()
+        try:
+            resp = http.get(url, headers=headers, timeout=timeout)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            limiter.record_error(url)
+            if attempt == CRAWL_MAX_RETRIES:
+                raise
+            delay = backoff_delay(attempt, CRAWL_BACKOFF_BASE, CRAWL_BACKOFF_MAX)
+            logger.warning(f"Request error for {url} ({type(e).__name__}), retrying in {delay:.1f}s "
+                           f"({attempt + 1}/{CRAWL_MAX_RETRIES})")
+            time.sleep(delay)
+            continue
+        except BaseException:
+            # 그 밖의 오류(ChunkedEncodingError, TooManyRedirects 등)도 실패로 기록해야 반개방 시험 요청 표시가 해제됩니다.
+            limiter.record_error(url)
+            raise
+
+        retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+        limiter.record_response(url, resp.status_code, time.monotonic() - started_at, retry_after)
+        if resp.status_code not in RETRYABLE_STATUS_CODES or attempt == CRAWL_MAX_RETRIES:
+            return resp
+
+        # Retry-After 대기는 리미터가 호스트 전체에 적용하므로, 여기서는 백오프만 기다립니다.
+        delay = backoff_delay(attempt, CRAWL_BACKOFF_BASE, CRAWL_BACKOFF_MAX)
+        logger.warning(f"HTTP {resp.status_code} for {url}, retrying in {max(delay, retry_after or 0):.1f}s "
+                       f"({attempt + 1}/{CRAWL_MAX_RETRIES})")
+        time.sleep(delay)
+
+def _fetch_page(url, timeout=15):
+    """공유 HTTP 클라이언트로 URL의 HTML 본문을 가져와 (본문, 본문 해시)를 반환합니다.
+
+    캐시된 항목이 있으면 조건부 요청을 보내고, 304 응답이면 캐시된 본문을 사용합니다.
+    HTTP 오류는 재시도(_get_with_retry) 후 requests 예외로 전달됩니다.
+    """
+    response_cache = get_response_cache()
+    cached_meta = response_cache.lookup(url)
+    resp = _get_with_retry(url, headers=response_cache.conditional_headers(cached_meta), timeout=timeout)
+
+    if resp.status_code == 304 and cached_meta:
+        cached_body = response_cache.read_body(url)
+        if cached_body is not None:
+            logger.debug(f"Not modified, using cached body: {url}")
+            return cached_body, cached_meta["content_hash"]
+        resp = _get_with_retry(url, timeout=timeout)
+
+    resp.raise_for_status()
+    html = resp.text
+    return html, response_cache.store(url, html, resp.headers)
+
+def _holdings_page_from_cache(cached):
+    return {
+        "summary": summary_from_cache(cached["summary"]),
+        "details": holdings_from_cache(cached["details"]),
+        "page_urls": cached["page_urls"]
+    }
+
+# JSON 캐시에는 NamedTuple이 리스트로 저장되므로, 파서 키별로 레코드 타입을 복원합니다.
+CACHED_RESULT_LOADERS = {
+    HOLDINGS_PARSER_KEY: _holdings_page_from_cache,
+    HOLDINGS_SUMMARY_PARSER_KEY: summary_from_cache,
+}
+
+def _parse_cached(url, html, body_hash, parser_key, parse_fn, *parse_args):
+    """본문 해시가 이전에 파싱한 것과 같으면 캐시된 파싱 결과를 반환하고, 아니면 파싱 후 저장합니다."""
+    response_cache = get_response_cache()
+    cached_result = response_cache.get_parsed(url, body_hash, parser_key)
+    if cached_result is not None:
+        logger.debug(f"Content unchanged, reusing parsed result: {url}")
+        load_fn = CACHED_RESULT_LOADERS.get(parser_key)
+        return load_fn(cached_result) if load_fn else cached_result
+
+    result = parse_fn(html, *parse_args)
+    response_cache.store_parsed(url, body_hash, parser_key, result)
+    return result
+
+def _load_holdings_page(page_url, m_code, base_url, timeout=15):
+    html, body_hash = _fetch_page(page_url, timeout=timeout)
+    return _parse_cached(page_url, html, body_hash, HOLDINGS_PARSER_KEY, _parse_holdings_html, m_code, base_url)
+
+def _skipped_result(m_code, summary_data):
+    """증분 크롤링에서 상세 수집을 건너뛴 투자자의 결과"""
+    logger.info(f"Skipping detail crawl for m_code {m_code}: {summary_data.portfolio_date} is already stored and up to date.")
+    return {"summary": summary_data, "details": None, "skipped": True}
+
+def _crawl_subsequent_page(m_code, page_url, base_url):
+    """2페이지 이후 holdings 페이지의 상세 목록을 반환합니다. 실패한 페이지는 None을 반환합니다.
+
+    한 페이지라도 실패하면 호출한 쪽은 투자자 전체를 실패로 처리해야 합니다. 일부 페이지만 저장하면 증분 크롤링이
+    해당 분기를 이미 저장된 것으로 보고 다시 가져오지 않기 때문입니다.
+    """
+    logger.info(f"Crawling paginated page: {page_url} for m_code {m_code}")
+    try:
+        paginated_details = _load_holdings_page(page_url, m_code, base_url)["details"]
+        logger.info(f"Added {len(paginated_details)} stock items from {page_url}")
+        return paginated_details
+    except requests.exceptions.RequestException as e_page_req:
+        logger.error(f"Request failed for paginated page {page_url}: {e_page_req}")
+    except Exception as e_page_parse:
+        logger.error(f"Error parsing paginated page {page_url}: {e_page_parse}", exc_info=True)
+    return None
+
+def _has_failed_page(m_code, pages_details):
+    failed = sum(1 for paginated_details in pages_details if paginated_details is None)
+    if failed:
+        logger.error(f"{failed}/{len(pages_details)} paginated pages failed for m_code {m_code}. "
+                     f"Discarding partial portfolio so it is retried on the next run.")
+    return failed > 0
+
+def crawl_dataroma_portfolio_page(m_code, base_url=DATAROMA_BASE_URL, page_workers=PAGE_FETCH_WORKERS, should_crawl_details=None):
+    """투자자 한 명의 holdings 페이지(전체 페이지네이션 포함)를 크롤링합니다.
+
+    should_crawl_details(m_code, summary)가 주어지면 1페이지의 p#p2 요약만 먼저 파싱하고,
+    False를 반환할 경우 상세 파싱과 페이지네이션 크롤링을 건너뛰고
+    {"summary", "details": None, "skipped": True}를 반환합니다.
+    """
     initial_page_url = f"{base_url}/m/holdings.php?m={m_code}&L=1" 
-    headers = {"User-Agent": ua.random}
     
     all_details_list = []
     summary_data = None
     
     logger.info(f"Crawling initial page data for m_code: {m_code} from {initial_page_url}...")
     try:
-        resp = requests.get(initial_page_url, headers=headers, timeout=15)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
+        html, body_hash = _fetch_page(initial_page_url)
+        if should_crawl_details is not None:
+            summary_data = _parse_cached(initial_page_url, html, body_hash, HOLDINGS_SUMMARY_PARSER_KEY, _parse_holdings_summary_html)
+            if summary_data is not None and not should_crawl_details(m_code, summary_data):
+                return _skipped_result(m_code, summary_data)
+
+        initial_page = _parse_cached(initial_page_url, html, body_hash, HOLDINGS_PARSER_KEY, _parse_holdings_html, m_code, base_url)
 
-        summary_data = _parse_portfolio_summary(soup)
+        summary_data = initial_page["summary"]
         if summary_data is None:
             logger.error(f"Failed to parse summary for {m_code} on initial page ({initial_page_url}). Aborting.")
             return None
 
-        current_page_details = _parse_portfolio_details(soup)
+        current_page_details = initial_page["details"]
         if current_page_details:
             all_details_list.extend(current_page_details)
         logger.info(f"Collected {len(current_page_details) if current_page_details else 0} items from initial page {initial_page_url}")
 
-        pages_div = soup.find("div", id="pages")
-        if pages_div:
-            logger.info(f"Pagination detected for m_code {m_code}.")
-            page_links_tags = pages_div.find_all("a", href=True)
-            urls_to_crawl_subsequent = set()
-            
-            for link_tag in page_links_tags:
-                href = link_tag['href']
-                link_text = link_tag.text.strip()
-                
-                if link_text.isdigit():
-                    page_num_in_link = int(link_text)
-                    if page_num_in_link == 1: 
-                        continue
-
-                    match = re.search(r"/m/holdings\.php\?m=" + re.escape(m_code) + r"&L=(\d+)", href)
-                    if match:
-                        actual_page_num_in_href = int(match.group(1))
-                        if page_num_in_link == actual_page_num_in_href:
-                             urls_to_crawl_subsequent.add(f"{base_url}{href}")
-            
-            sorted_urls_to_crawl = sorted(list(urls_to_crawl_subsequent))
-
-            for page_url in sorted_urls_to_crawl:
-                logger.info(f"Crawling paginated page: {page_url} for m_code {m_code}")
-                try:
-                    # time.sleep(random.uniform(0.3, 0.8)) # 필요시 주석 해제
-                    page_resp = requests.get(page_url, headers=headers, timeout=15)
-                    page_resp.raise_for_status()
-                    page_soup = BeautifulSoup(page_resp.text, "html.parser")
-                    
-                    paginated_details = _parse_portfolio_details(page_soup)
-                    if paginated_details:
-                        all_details_list.extend(paginated_details)
-                        logger.info(f"Added {len(paginated_details)} stock items from {page_url}")
-                except requests.exceptions.RequestException as e_page_req:
-                    logger.error(f"Request failed for paginated page {page_url}: {e_page_req}")
-                except Exception as e_page_parse:
-                    logger.error(f"Error parsing paginated page {page_url}: {e_page_parse}", exc_info=True)
+        sorted_urls_to_crawl = initial_page["page_urls"]
+        if sorted_urls_to_crawl:
+            logger.info(f"Pagination detected for m_code {m_code}: {len(sorted_urls_to_crawl)} more pages.")
+
+            # 2페이지 이후는 제한된 스레드 풀에서 병렬로 가져오고, map으로 페이지 순서를 유지합니다.
+            max_workers = max(1, min(page_workers, len(sorted_urls_to_crawl)))
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"pages-{m_code}") as executor:
+                pages_details = list(executor.map(
+                    lambda page_url: _crawl_subsequent_page(m_code, page_url, base_url),
+                    sorted_urls_to_crawl
+                ))
+            if _has_failed_page(m_code, pages_details):
+                return None
+            for paginated_details in pages_details:
+                all_details_list.extend(paginated_details)
         else:
             logger.info(f"No pagination detected for m_code {m_code} or first page already contains all items.")
 
@@ -282,3 +583,145 @@ def crawl_dataroma_portfolio_page(m_code):
     except Exception as e_general:
         logger.error(f"General error crawling page data for {m_code} on initial page {initial_page_url}: {e_general}", exc_info=True)
         return None
+
+class AsyncCrawlEngine:
+    """여러 투자자의 holdings 페이지를 asyncio로 동시에 수집하는 크롤 엔진
+
+    - max_concurrency: 전체 동시 요청 수 제한
+    - per_host_limit: 호스트별 동시 요청 수 제한
+    - should_crawl_details: 증분 크롤링 판단 함수 (crawl_dataroma_portfolio_page 참고)
+    - on_result: 투자자 한 명의 크롤링이 끝날 때마다 호출할 콜백 on_result(m_code, result)
+    요청(requests)은 max_concurrency 크기의 요청 스레드 풀에서, CPU를 쓰는 파싱은 별도의 작은 파싱 스레드 풀
+    (PARSE_WORKERS)에서 실행되므로 파싱이 요청 슬롯을 차지하지 않습니다. 결과는 crawl_dataroma_portfolio_page와
+    동일한 {"summary", "details"} 구조로 반환됩니다.
+    """
+
+    def __init__(self, max_concurrency=8, per_host_limit=4, timeout=15, base_url=DATAROMA_BASE_URL, should_crawl_details=None,
+                 on_result=None):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.per_host_limit = max(1, int(per_host_limit))
+        self.timeout = timeout
+        self.base_url = base_url
+        self.should_crawl_details = should_crawl_details
+        self.on_result = on_result
+        self._fetch_executor = None
+        self._parse_executor = None
+        self._global_semaphore = None
+        self._host_semaphores = {}
+
+    async def _fetch_page(self, url):
+        host = urlparse(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+
+        loop = asyncio.get_running_loop()
+        async with self._global_semaphore:
+            async with self._host_semaphores[host]:
+                return await loop.run_in_executor(self._fetch_executor, _fetch_page, url, self.timeout)
+
+    async def _parse_cached(self, url, html, body_hash, parser_key, parse_fn, *parse_args):
+        # 파싱은 동시성 슬롯을 반납한 뒤 파싱 전용 스레드 풀에서 수행합니다 (본문이 바뀌지 않았으면 캐시된 결과 사용).
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._parse_executor, _parse_cached, url, html, body_hash, parser_key, parse_fn, *parse_args
+        )
+
+    async def _load_holdings_page(self, m_code, url):
+        html, body_hash = await self._fetch_page(url)
+        return await self._parse_cached(url, html, body_hash, HOLDINGS_PARSER_KEY, _parse_holdings_html, m_code, self.base_url)
+
+    async def _crawl_subsequent_page(self, m_code, page_url):
+        logger.info(f"Crawling paginated page: {page_url} for m_code {m_code}")
+        try:
+            paginated_details = (await self._load_holdings_page(m_code, page_url))["details"]
+            logger.info(f"Added {len(paginated_details)} stock items from {page_url}")
+            return paginated_details
+        except requests.exceptions.RequestException as e_page_req:
+            logger.error(f"Request failed for paginated page {page_url}: {e_page_req}")
+        except Exception as e_page_parse:
+            logger.error(f"Error parsing paginated page {page_url}: {e_page_parse}", exc_info=True)
+        return None
+
+    async def _crawl_portfolio(self, m_code):
+        initial_page_url = f"{self.base_url}/m/holdings.php?m={m_code}&L=1"
+        logger.info(f"Crawling initial page data for m_code: {m_code} from {initial_page_url}...")
+        try:
+            html, body_hash = await self._fetch_page(initial_page_url)
+            if self.should_crawl_details is not None:
+                summary_data = await self._parse_cached(
+                    initial_page_url, html, body_hash, HOLDINGS_SUMMARY_PARSER_KEY, _parse_holdings_summary_html
+                )
+                if summary_data is not None and not self.should_crawl_details(m_code, summary_data):
+                    return _skipped_result(m_code, summary_data)
+
+            initial_page = await self._parse_cached(
+                initial_page_url, html, body_hash, HOLDINGS_PARSER_KEY, _parse_holdings_html, m_code, self.base_url
+            )
+
+            summary_data = initial_page["summary"]
+            if summary_data is None:
+                logger.error(f"Failed to parse summary for {m_code} on initial page ({initial_page_url}). Aborting.")
+                return None
+
+            all_details_list = list(initial_page["details"])
+            logger.info(f"Collected {len(all_details_list)} items from initial page {initial_page_url}")
+
+            page_urls = initial_page["page_urls"]
+            if page_urls:
+                logger.info(f"Pagination detected for m_code {m_code}: {len(page_urls)} more pages.")
+                pages_details = await asyncio.gather(
+                    *(self._crawl_subsequent_page(m_code, page_url) for page_url in page_urls)
+                )
+                if _has_failed_page(m_code, pages_details):
+                    return None
+                for paginated_details in pages_details:
+                    all_details_list.extend(paginated_details)
+
+            return {"summary": summary_data, "details": all_details_list}
+
+        except requests.exceptions.RequestException as e_req:
+            logger.error(f"Request failed for initial page {initial_page_url}: {e_req}")
+            return None
+        except Exception as e_general:
+            logger.error(f"General error crawling page data for {m_code} on initial page {initial_page_url}: {e_general}", exc_info=True)
+            return None
+
+    async def _crawl_and_report(self, m_code):
+        result = await self._crawl_portfolio(m_code)
+        if self.on_result is not None:
+            # 콜백이 블로킹되어도(예: DB writer 대기열) 다른 투자자의 크롤링은 계속되도록 기본 스레드 풀에서 호출합니다.
+            await asyncio.get_running_loop().run_in_executor(None, self.on_result, m_code, result)
+        return result
+
+    async def crawl(self, m_codes):
+        """m_code 목록을 동시에 크롤링하여 {m_code: {"summary", "details"} 또는 None}을 반환합니다."""
+        m_codes = list(m_codes)
+        self._global_semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._host_semaphores = {}
+
+        started_at = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="crawl") as fetch_executor, \
+                ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="crawl-parse") as parse_executor:
+            self._fetch_executor = fetch_executor
+            self._parse_executor = parse_executor
+            results = await asyncio.gather(*(self._crawl_and_report(m_code) for m_code in m_codes))
+        self._fetch_executor = None
+        self._parse_executor = None
+
+        elapsed = time.perf_counter() - started_at
+        succeeded = sum(1 for result in results if result)
+        skipped = sum(1 for result in results if result and result.get("skipped"))
+        logger.info(f"Crawled {succeeded}/{len(m_codes)} portfolios ({skipped} skipped as unchanged) in {elapsed:.2f}s "
+                    f"(max_concurrency={self.max_concurrency}, per_host_limit={self.per_host_limit})")
+        logger.info(f"Rate limiter state: {HostRateLimiter().stats()}")
+        return dict(zip(m_codes, results))
+
+def crawl_portfolio_pages(m_codes, max_concurrency=8, per_host_limit=4, base_url=DATAROMA_BASE_URL, should_crawl_details=None,
+                          on_result=None):
+    """AsyncCrawlEngine으로 여러 투자자의 포트폴리오 페이지를 동시에 크롤링합니다.
+
+    on_result(m_code, result)가 주어지면 투자자 한 명의 크롤링이 끝날 때마다 호출합니다.
+    """
+    engine = AsyncCrawlEngine(max_concurrency=max_concurrency, per_host_limit=per_host_limit, base_url=base_url,
+                              should_crawl_details=should_crawl_details, on_result=on_result)
+    return asyncio.run(engine.crawl(m_codes))
@@ -1,23 +1,267 @@
+import os
 import sys
-from crawler import crawl_top_investors, crawl_dataroma_portfolio_page
-from utils.db_manager import get_db_connection, create_tables_if_not_exists, check_portfolio_exists, insert_investor_portfolio, insert_portfolio_details, update_portfolio_details, calculate_and_update_portfolio_avg_return
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from crawler import crawl_top_investors, crawl_portfolio_pages, crawl_dataroma_portfolio_page
+from utils.db_manager import get_pool, close_pool, create_tables_if_not_exists, check_portfolio_exists, get_portfolio_index, insert_investor_portfolio, insert_portfolio_details, update_portfolio_details, update_portfolio_avg_returns, refresh_consensus_index
 from utils.logger_util import LoggerUtil
 from utils.api_util import ApiUtil  # API 유틸 추가
 from utils.telegram_util import TelegramUtil  # 텔레그램 유틸 추가
+from utils.checkpoint_util import CrawlCheckpoint
+from utils.db_writer import GroupCommitWriter
+from utils.read_model import refresh_read_models
+from utils.rate_limiter import HostRateLimiter, RATE_LIMIT_RPS, RATE_LIMIT_MIN_RPS, RATE_LIMIT_MAX_RPS
 
-def main():
+# 크롤링 동시성 설정 (전체 동시 요청 수 / 호스트별 동시 요청 수)
+CRAWL_MAX_CONCURRENCY = int(os.getenv("CRAWL_MAX_CONCURRENCY", 8))
+CRAWL_PER_HOST_LIMIT = int(os.getenv("CRAWL_PER_HOST_LIMIT", 4))
+# 증분 모드에서 이미 저장된 분기의 가격 정보를 다시 갱신하는 주기 (시간)
+PRICE_REFRESH_INTERVAL_HOURS = float(os.getenv("PRICE_REFRESH_INTERVAL_HOURS", 24))
+# 전체 투자자(full-universe) 모드 설정
+UNIVERSE_WORKERS = int(os.getenv("UNIVERSE_WORKERS", 4))
+UNIVERSE_CHECKPOINT_PATH = os.getenv("UNIVERSE_CHECKPOINT_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "checkpoint", "universe_checkpoint.jsonl"))
+UNIVERSE_PROGRESS_EVERY = 10 # N명 처리마다 처리량 로그 출력
+
+# 프로세스 풀 워커에서 사용하는 증분 크롤링 판단 함수 (워커 초기화 시 한 번 설정)
+_worker_should_crawl_details = None
+
+def build_incremental_filter(portfolio_index, refresh_interval):
+    """증분 크롤링 판단 함수를 만듭니다.
+
+    1페이지 요약의 분기가 DB에 없거나, 저장된 지 refresh_interval 이상 지나 가격 갱신이 필요할 때만 True를 반환합니다.
+    """
+    now = datetime.now()
+
+    def should_crawl_details(m_code, summary):
+        stored = portfolio_index.get((m_code.upper(), summary.portfolio_date))
+        if not stored:
+            return True
+        updated_at = stored['record_updated_at']
+        return updated_at is None or now - updated_at >= refresh_interval
+
+    return should_crawl_details
+
+def write_investor_portfolio(db_conn, investor, page_data):
+    """크롤링된 투자자 포트폴리오 한 건을 DB에 저장(또는 가격 업데이트)합니다. 커밋은 호출한 쪽(DB writer)이 합니다.
+
+    반환값: {"p_idx", "investor_code", "is_new", "refreshed"} (refreshed: 기존 분기의 가격을 갱신하여 평균 수익률 재계산이 필요한지)
+    실패하면 예외를 발생시킵니다.
+    """
+    logger = LoggerUtil().get_logger()
+
+    investor_code = investor['code']
+    investor_name = investor['name']
+    portfolio_summary = page_data["summary"]
+    portfolio_details = page_data.get("details", []) # details가 없을 경우 빈 리스트
+
+    logger.info(f"처리 중인 투자자: {investor_name} ({investor_code})")
+    existing_p_idx = check_portfolio_exists(db_conn, investor_code, portfolio_summary.portfolio_date)
+
+    if existing_p_idx:
+        logger.info(f"{investor_name} ({investor_code})의 {portfolio_summary.portfolio_date} 데이터가 이미 존재합니다. 업데이트를 진행합니다.")
+
+        # 기존 데이터 업데이트 (평균 수익률은 배치 커밋 직전에 한 번에 재계산)
+        if portfolio_details:
+            update_portfolio_details(db_conn, existing_p_idx, portfolio_details)
+        return {"p_idx": existing_p_idx, "investor_code": investor_code, "is_new": False, "refreshed": bool(portfolio_details)}
+
+    logger.info(f"{investor_name} ({investor_code})의 {portfolio_summary.portfolio_date} 데이터를 새로 DB에 저장합니다.")
+
+    # 새 데이터 삽입
+    p_idx = insert_investor_portfolio(
+        db_conn,
+        str.upper(investor_code),
+        investor_name,
+        portfolio_summary.portfolio_date,
+        portfolio_summary.portfolio_period,
+        portfolio_summary.portfolio_value,
+        portfolio_summary.number_of_stocks
+    )
+    if p_idx and portfolio_details:
+        insert_portfolio_details(db_conn, p_idx, portfolio_details)
+    return {"p_idx": p_idx, "investor_code": investor_code, "is_new": True, "refreshed": False}
+
+def notify_new_portfolio(investor, portfolio_summary, p_idx, api_util, telegram_util):
+    """신규 저장된 포트폴리오를 API로 전송하고 텔레그램 알림을 보냅니다."""
+    logger = LoggerUtil().get_logger()
+    investor_code = investor['code']
+    investor_name = investor['name']
+    try:
+        title = f"{investor_name} 포트폴리오 ({portfolio_summary.portfolio_date})"
+        api_response = api_util.create_post(
+            title=title,
+            portfolio_idx=str(p_idx),
+            investor_code=investor_code,
+            writer="admin"
+        )
+        logger.info(f"API 전송 완료 - {investor_name} (p_idx: {p_idx})")
+
+        # API 전송 완료 후 텔레그램으로 메시지 전송
+        telegram_message = f"[알림] 포트폴리오 신규 저장 완료\n\n투자자: {investor_name} ({investor_code})\n날짜: {portfolio_summary.portfolio_date}\n보유 종목 수: {portfolio_summary.number_of_stocks}\n포트폴리오 가치: ${portfolio_summary.portfolio_value / 1_000_000_000:.2f}B"
+        telegram_util.send_message(telegram_message)
+        logger.info(f"텔레그램 알림 전송 완료 - {investor_name}")
+
+    except Exception as e_api:
+        logger.error(f"API 전송 중 오류 발생 ({investor_name} - {investor_code}): {e_api}")
+
+def build_portfolio_writer(api_util, telegram_util, on_saved=None, on_failed=None):
+    """투자자 포트폴리오 저장용 GroupCommitWriter를 만듭니다.
+
+    submit((investor, page_data))로 넣은 포트폴리오는 writer 스레드에서 여러 투자자씩 묶어 커밋되며,
+    투자자마다 SAVEPOINT가 있어 실패한 투자자의 변경만 롤백됩니다. 가격이 갱신된 포트폴리오의 평균 수익률은
+    커밋 직전에 하나의 UPDATE 문으로 재계산하고, 새 분기가 저장된 투자자의 컨센서스 인덱스와
+    저장/갱신된 포트폴리오의 읽기 모델(JSON)도 같은 트랜잭션에서 다시 만듭니다. API/텔레그램 알림은 커밋이 끝난 신규 포트폴리오에만 보냅니다.
+    on_saved(investor_code) / on_failed(investor_code, error)는 writer의 콜백 스레드에서 호출되므로, 알림 전송이 느려도 커밋은 기다리지 않습니다.
+    """
+    logger = LoggerUtil().get_logger()
+
+    def write(db_conn, item):
+        investor, page_data = item
+        return write_investor_portfolio(db_conn, investor, page_data)
+
+    def before_commit(db_conn, results):
+        refreshed_p_idxs = [result["p_idx"] for result in results if result["refreshed"]]
+        if refreshed_p_idxs:
+            update_portfolio_avg_returns(db_conn, refreshed_p_idxs)
+        refresh_consensus_index(db_conn, [result["investor_code"] for result in results if result["is_new"]])
+        refresh_read_models(db_conn, [result["p_idx"] for result in results if result["is_new"] or result["refreshed"]])
+
+    def saved(item, result):
+        investor, page_data = item
+        action_text = "저장" if result["is_new"] else "업데이트"
+        logger.info(f"{investor['name']} ({investor['code']}) 데이터 DB {action_text} 완료 (p_idx: {result['p_idx']}).")
+        if result["is_new"] and result["p_idx"]:
+            notify_new_portfolio(investor, page_data["summary"], result["p_idx"], api_util, telegram_util)
+        else:
+            logger.info(f"기존 데이터 업데이트 완료 - {investor['name']} (p_idx: {result['p_idx']}). API 및 텔레그램 알림은 건너뜁니다.")
+        if on_saved is not None:
+            on_saved(investor['code'])
+
+    def failed(item, error):
+        investor, _ = item
+        logger.error(f"DB 저장 중 오류 발생 ({investor['name']} - {investor['code']}): {error}")
+        if on_failed is not None:
+            on_failed(investor['code'], "DB 저장 실패")
+
+    return GroupCommitWriter(write, before_commit=before_commit, on_success=saved, on_failure=failed)
+
+def submit_investor_portfolio(writer, investor, page_data):
+    """크롤링 결과를 DB writer에 넘깁니다. 저장할 필요가 없으면 넘기지 않고 (저장 대상 여부, 실패 사유)를 반환합니다."""
+    logger = LoggerUtil().get_logger()
+    if not page_data or not page_data.get("summary"):
+        logger.warning(f"{investor['name']}의 포트폴리오 페이지 정보를 가져오는데 실패했습니다. 다음 투자자로 넘어갑니다.")
+        return False, "포트폴리오 페이지 크롤링 실패"
+    if page_data.get("skipped"):
+        logger.info(f"{investor['name']} ({investor['code']})의 {page_data['summary'].portfolio_date} 데이터는 이미 최신 상태입니다. 저장을 건너뜁니다.")
+        return False, None
+    writer.submit((investor, page_data))
+    return True, None
+
+def _init_universe_worker(portfolio_index, refresh_hours, workers):
+    """프로세스 풀 워커 초기화: 증분 모드 인덱스를 워커당 한 번만 전달받고,
+    호스트별 요청 속도 한도를 워커 수로 나눠 전체 요청 속도가 설정값을 넘지 않게 합니다.
+
+    워커는 spawn으로 시작하므로 부모의 HttpUtil 세션(keep-alive 소켓)이나 잠긴 락을 물려받지 않습니다."""
+    global _worker_should_crawl_details
+    HostRateLimiter().configure(rate=RATE_LIMIT_RPS / workers, min_rate=RATE_LIMIT_MIN_RPS / workers,
+                                max_rate=RATE_LIMIT_MAX_RPS / workers)
+    if portfolio_index is not None:
+        _worker_should_crawl_details = build_incremental_filter(portfolio_index, timedelta(hours=refresh_hours))
+
+def crawl_investor_worker(investor_code):
+    """프로세스 풀에서 실행되는 투자자 한 명의 크롤링 작업. (investor_code, page_data, 오류 메시지)를 반환합니다."""
+    try:
+        page_data = crawl_dataroma_portfolio_page(investor_code, should_crawl_details=_worker_should_crawl_details)
+        if not page_data:
+            return investor_code, None, "포트폴리오 페이지 크롤링 실패"
+        return investor_code, page_data, None
+    except Exception as e:
+        return investor_code, None, f"{type(e).__name__}: {e}"
+
+def run_full_universe(investors, api_util, telegram_util, workers=UNIVERSE_WORKERS,
+                      checkpoint_path=UNIVERSE_CHECKPOINT_PATH, portfolio_index=None):
+    """전체 투자자를 프로세스 풀로 크롤링하고, 완료된 투자자 코드를 체크포인트에 기록합니다.
+
+    재시작하면 체크포인트에 완료로 기록된 투자자는 건너뛰고 남은 투자자만 처리합니다.
+    DB 저장은 부모 프로세스의 DB writer 스레드가 묶어서 커밋하며, 커밋된 투자자만 완료로 기록합니다.
+    """
+    logger = LoggerUtil().get_logger()
+    checkpoint = CrawlCheckpoint(checkpoint_path)
+
+    investors_by_code = {investor['code']: investor for investor in investors}
+    pending_codes = [code for code in investors_by_code if not checkpoint.is_done(code)]
+    logger.info(f"--- 전체 투자자 {len(investors_by_code)}명 중 {len(pending_codes)}명 처리 시작 "
+                f"(체크포인트 완료 {len(investors_by_code) - len(pending_codes)}명, 워커 {workers}개) ---")
+
+    failures = {}
+    processed = 0
+    started_at = time.perf_counter()
+    workers = max(1, workers)
+
+    def record_failure(investor_code, error):
+        failures[investor_code] = error
+        checkpoint.mark_failed(investor_code, error)
+        logger.warning(f"투자자 처리 실패 - {investors_by_code[investor_code]['name']} ({investor_code}): {error}")
+
+    writer = build_portfolio_writer(api_util, telegram_util, on_saved=checkpoint.mark_done, on_failed=record_failure)
+    # fork를 쓰면 워커가 부모의 keep-alive 소켓을 공유해 응답이 섞이고, writer 스레드가 잡고 있던 락도 잠긴 채 복제됩니다.
+    # 워커 프로세스는 submit 시점에 만들어지므로 spawn으로 시작해 부모 상태를 물려받지 않게 합니다.
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_universe_worker,
+                             initargs=(portfolio_index, PRICE_REFRESH_INTERVAL_HOURS, workers)) as executor, writer:
+        futures = [executor.submit(crawl_investor_worker, code) for code in pending_codes]
+        for future in as_completed(futures):
+            investor_code, page_data, error = future.result()
+            investor = investors_by_code[investor_code]
+
+            if error is None:
+                submitted, error = submit_investor_portfolio(writer, investor, page_data)
+                if not submitted and error is None:
+                    checkpoint.mark_done(investor_code) # 증분 모드에서 변경이 없어 저장을 건너뜀
+            if error is not None:
+                record_failure(investor_code, error)
+
+            processed += 1
+            if processed % UNIVERSE_PROGRESS_EVERY == 0 or processed == len(pending_codes):
+                elapsed_minutes = (time.perf_counter() - started_at) / 60
+                logger.info(f"진행 {processed}/{len(pending_codes)}명, 실패 {len(failures)}명, "
+                            f"처리량 {processed / elapsed_minutes if elapsed_minutes else 0:.1f} investors/min")
+
+    # with 블록을 나오면서 writer가 남은 저장 작업을 모두 커밋했습니다.
+    elapsed_minutes = (time.perf_counter() - started_at) / 60
+    logger.info(f"DB writer: {writer.stats}")
+    logger.info(f"--- 전체 투자자 처리 완료: {processed - len(failures)}명 성공, {len(failures)}명 실패, "
+                f"{elapsed_minutes:.1f}분 ({processed / elapsed_minutes if elapsed_minutes else 0:.1f} investors/min) ---")
+    for investor_code, error in failures.items():
+        logger.warning(f"실패 투자자: {investors_by_code[investor_code]['name']} ({investor_code}) - {error}")
+
+    # 모든 투자자가 완료되면 체크포인트를 지워 다음 실행이 처음부터 시작되도록 합니다.
+    if all(checkpoint.is_done(code) for code in investors_by_code):
+        checkpoint.reset()
+        logger.info("모든 투자자가 완료되어 체크포인트를 초기화했습니다.")
+    return failures
+
+def main(incremental=False, universe=False, workers=UNIVERSE_WORKERS, checkpoint_path=UNIVERSE_CHECKPOINT_PATH, reset_checkpoint=False):
     # LoggerUtil 클래스를 사용하여 로거 초기화
     logger = LoggerUtil().get_logger()
 
-    db_conn = get_db_connection()
-    if not db_conn:
-        logger.error("DB 연결에 실패하여 프로그램을 종료합니다.")
+    db_pool = get_pool()
+    try:
+        db_conn = db_pool.acquire()
+    except Exception as e:
+        logger.error(f"DB 연결에 실패하여 프로그램을 종료합니다: {e}")
         return
 
     try:
-        create_tables_if_not_exists(db_conn) 
+        create_tables_if_not_exists(db_conn)
+        # 읽기 모델이 없거나 record_updated_at이 바뀐 포트폴리오만 다시 만듭니다 (최신이면 조회 한 번).
+        refresh_read_models(db_conn)
+        db_conn.commit()
 
-        top_count = 10 # 상위 N명의 투자자 정보 가져오기
+        top_count = None if universe else 10 # 상위 N명의 투자자 정보 가져오기 (전체 투자자 모드는 전체)
         top_investors = crawl_top_investors(top_count)
         if not top_investors:
             logger.warning("크롤링된 투자자 정보가 없습니다.")
@@ -28,93 +272,49 @@ def main():
         # 텔레그램 유틸 초기화
         telegram_util = TelegramUtil()
 
-        logger.info(f"--- 상위 {len(top_investors)}명 투자자 포트폴리오 DB 저장 시작 ---")
-        for investor in top_investors:
-            investor_code = investor['code']
-            investor_name = investor['name']
-            
-            logger.info(f"처리 중인 투자자: {investor_name} ({investor_code})")
-
-            page_data = crawl_dataroma_portfolio_page(investor_code)
-
-            if not page_data or not page_data.get("summary"):
-                logger.warning(f"{investor_name}의 포트폴리오 페이지 정보를 가져오는데 실패했습니다. 다음 투자자로 넘어갑니다.")
-                continue
-            
-            portfolio_summary = page_data["summary"]
-            portfolio_details = page_data.get("details", []) # details가 없을 경우 빈 리스트
-
-            existing_p_idx = check_portfolio_exists(db_conn, investor_code, portfolio_summary['portfolio_date'])
-            
-            p_idx = None
-            if existing_p_idx:
-                logger.info(f"{investor_name} ({investor_code})의 {portfolio_summary['portfolio_date']} 데이터가 이미 존재합니다. 업데이트를 진행합니다.")
-                p_idx = existing_p_idx
-                
-                # 기존 데이터 업데이트
-                if portfolio_details:
-                    update_portfolio_details(db_conn, p_idx, portfolio_details)
-                    calculate_and_update_portfolio_avg_return(db_conn, p_idx)
-            else:
-                logger.info(f"{investor_name} ({investor_code})의 {portfolio_summary['portfolio_date']} 데이터를 새로 DB에 저장합니다.")
-                
-                # 새 데이터 삽입
-                try:
-                    p_idx = insert_investor_portfolio(
-                        db_conn,
-                        str.upper(investor_code),
-                        investor_name,
-                        portfolio_summary['portfolio_date'],
-                        portfolio_summary['portfolio_period'],
-                        portfolio_summary['portfolio_value'],
-                        portfolio_summary['number_of_stocks']
-                    )
-
-                    if p_idx and portfolio_details:
-                        insert_portfolio_details(db_conn, p_idx, portfolio_details)
-                except Exception as e_db:
-                    logger.error(f"DB 저장 중 오류 발생 ({investor_name} - {investor_code}): {e_db}")
-                    if db_conn:
-                        db_conn.rollback()
-                    continue
-            
-            # API 호출 및 텔레그램 알림 (신규 추가 시에만)
-            if p_idx and not existing_p_idx:
-                try:
-                    title = f"{investor_name} 포트폴리오 ({portfolio_summary['portfolio_date']})"
-                    api_response = api_util.create_post(
-                        title=title,
-                        portfolio_idx=str(p_idx),
-                        investor_code=investor_code,
-                        writer="admin"
-                    )
-                    logger.info(f"API 전송 완료 - {investor_name} (p_idx: {p_idx})")
-                    
-                    # API 전송 완료 후 텔레그램으로 메시지 전송
-                    telegram_message = f"[알림] 포트폴리오 신규 저장 완료\n\n투자자: {investor_name} ({investor_code})\n날짜: {portfolio_summary['portfolio_date']}\n보유 종목 수: {portfolio_summary['number_of_stocks']}\n포트폴리오 가치: ${portfolio_summary['portfolio_value'] / 1_000_000_000:.2f}B"
-                    telegram_util.send_message(telegram_message)
-                    logger.info(f"텔레그램 알림 전송 완료 - {investor_name}")
-                    
-                except Exception as e_api:
-                    logger.error(f"API 전송 중 오류 발생 ({investor_name} - {investor_code}): {e_api}")
-            elif existing_p_idx:
-                logger.info(f"기존 데이터 업데이트 완료 - {investor_name} (p_idx: {p_idx}). API 및 텔레그램 알림은 건너뜁니다.")
-            
-            try:
-                db_conn.commit() 
-                action_text = "업데이트" if existing_p_idx else "저장"
-                logger.info(f"{investor_name} ({investor_code}) 데이터 DB {action_text} 완료 (p_idx: {p_idx}).")
-            except Exception as e_commit:
-                logger.error(f"DB 커밋 중 오류 발생 ({investor_name} - {investor_code}): {e_commit}")
-                if db_conn:
-                    db_conn.rollback()
+        # 증분 모드: 저장된 (투자자, 분기) 인덱스를 한 번에 조회하여 변경 없는 포트폴리오의 상세 크롤링을 건너뜀
+        portfolio_index = None
+        should_crawl_details = None
+        if incremental:
+            portfolio_index = get_portfolio_index(db_conn)
+            should_crawl_details = build_incremental_filter(portfolio_index, timedelta(hours=PRICE_REFRESH_INTERVAL_HOURS))
+
+        if universe:
+            if reset_checkpoint:
+                CrawlCheckpoint(checkpoint_path).reset()
+            run_full_universe(top_investors, api_util, telegram_util, workers=workers,
+                              checkpoint_path=checkpoint_path, portfolio_index=portfolio_index)
+            return
+
+        # 모든 투자자의 포트폴리오 페이지를 동시에 크롤링하고, 완료되는 대로 DB writer에 넘겨 크롤링과 저장을 겹쳐 실행
+        logger.info(f"--- 상위 {len(top_investors)}명 투자자 포트폴리오 크롤링 및 DB 저장 시작 (동시 요청 {CRAWL_MAX_CONCURRENCY}, 호스트별 {CRAWL_PER_HOST_LIMIT}, 증분 모드: {incremental}) ---")
+        investors_by_code = {investor['code']: investor for investor in top_investors}
+        with build_portfolio_writer(api_util, telegram_util) as writer:
+            crawl_portfolio_pages(
+                list(investors_by_code),
+                max_concurrency=CRAWL_MAX_CONCURRENCY,
+                per_host_limit=CRAWL_PER_HOST_LIMIT,
+                should_crawl_details=should_crawl_details,
+                on_result=lambda investor_code, page_data: submit_investor_portfolio(writer, investors_by_code[investor_code], page_data)
+            )
+        logger.info(f"DB writer: {writer.stats}")
 
     except Exception as e_main:
         logger.error(f"메인 로직 처리 중 예외 발생: {e_main}", exc_info=True) # exc_info로 트레이스백 로깅
     finally:
-        if db_conn:
-            db_conn.close()
-            logger.info("DB 연결이 종료되었습니다.")
+        db_pool.release(db_conn)
+        close_pool()
+        logger.info("DB 연결이 종료되었습니다.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="슈퍼 투자자 포트폴리오 크롤링 및 DB 저장")
+    parser.add_argument("--incremental", action="store_true",
+                        help="이미 저장된 분기이고 가격 갱신 주기가 지나지 않은 투자자는 상세 크롤링을 건너뜁니다.")
+    parser.add_argument("--universe", action="store_true",
+                        help="상위 N명이 아닌 dataroma의 전체 투자자를 프로세스 풀로 크롤링합니다 (체크포인트/재시작 지원).")
+    parser.add_argument("--workers", type=int, default=UNIVERSE_WORKERS, help="전체 투자자 모드의 프로세스 수")
+    parser.add_argument("--checkpoint", default=UNIVERSE_CHECKPOINT_PATH, help="전체 투자자 모드의 체크포인트 파일 경로")
+    parser.add_argument("--reset-checkpoint", action="store_true", help="체크포인트를 지우고 처음부터 다시 크롤링합니다.")
+    args = parser.parse_args()
+    main(incremental=args.incremental, universe=args.universe, workers=args.workers,
+         checkpoint_path=args.checkpoint, reset_checkpoint=args.reset_checkpoint)
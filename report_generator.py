@@ -1,13 +1,41 @@
 import os
+import time
+import hashlib
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from jinja2 import Template
+from jinja2 import Environment, FileSystemLoader
+from markupsafe import Markup
 import logging
-import json
-from utils.db_manager import get_db_connection
+from dotenv import load_dotenv
+from utils.db_manager import get_pool, close_pool
+from utils.read_model import format_portfolio_data, fetch_portfolio_data
+from utils.report_manifest import ReportManifest, data_hash
+from utils.report_site import (ECHARTS_CDN_URL, vendored_echarts, precompress, write_hashed_asset, prune_site_assets,
+                               group_portfolios, site_size)
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+load_dotenv()
+
+TEMPLATE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_NAME = 'report_template.html'
+TEMPLATE_CSS = 'templates/report.css'
+TEMPLATE_JS = 'templates/report.js'
+SITE_INDEX_TEMPLATE = 'templates/site_index.html'
+REPORT_DIR = os.path.join(os.path.dirname(__file__), 'report')
+SITE_DIR = os.path.join(os.path.dirname(__file__), 'site')
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", os.cpu_count() or 1))  # 일괄 생성 시 렌더링 프로세스 수
+REPORT_FETCH_CHUNK = 500  # 상세 행을 조회할 때 IN 절 하나에 넣는 포트폴리오 수
+REPORT_DONUT_MAX_SLICES = int(os.getenv("REPORT_DONUT_MAX_SLICES", 30))  # 도넛 차트 최대 조각 수 (나머지는 "기타")
+REPORT_RENDER_VERSION = 2  # 템플릿 변수/렌더링 코드를 바꾸면 올립니다 (매니페스트의 기존 리포트를 모두 다시 생성)
+
+_env = None
+_template = None
+_template_version = None
+
 def get_latest_portfolio_data(db_conn):
     """DB에서 가장 최근의 포트폴리오 데이터를 가져옵니다."""
     try:
@@ -34,7 +62,7 @@ def get_latest_portfolio_data(db_conn):
                        low_52_week, high_52_week
                 FROM investor_portfolio_detail
                 WHERE p_idx = %s
-                ORDER BY portfolio_rate DESC
+                ORDER BY portfolio_rate DESC, ticker
             """, (portfolio_meta['idx'],))
             portfolio_details = cursor.fetchall()
             
@@ -47,88 +75,69 @@ def get_latest_portfolio_data(db_conn):
         logger.error(f"포트폴리오 데이터 조회 중 오류 발생: {e}")
         return None
 
-def format_portfolio_data(portfolio_data):
-    """DB 데이터를 템플릿에 맞는 형식으로 변환합니다."""
-    if not portfolio_data:
-        return None
-    
-    meta = portfolio_data['meta']
-    details = portfolio_data['details']
-    
-    # 메타 데이터 포맷팅
-    formatted_meta = {
-        'total_value': f"${meta['portfolio_value'] / 1_000_000_000:.1f}B",
-        'number_of_stocks': meta['number_of_stocks'],
-        'portfolio_date': meta['portfolio_date'].strftime('%Y-%m-%d'),
-        'investor_name': meta['investor_name'],
-        'investor_code': meta['investor_code']
-    }
-    
-    # 상세 데이터 포맷팅
-    formatted_stocks = []
-    for detail in details:
-        # 수익률 계산 (reported_price_rate 사용)
-        change = detail['reported_price_rate']
-        change_str = f"+{change:.2f}%" if change >= 0 else f"{change:.2f}%"
-        
-        # 활동 타입과 값 포맷팅
-        activity = ""
-        activity_type = detail['recent_activity_type']
-        if activity_type and detail['recent_activity_value']:
-            activity = f"{activity_type.capitalize()} {detail['recent_activity_value']:.2f}%"
-        
-        stock = {
-            'symbol': detail['ticker'],
-            'name': detail['stk_name'].replace('"', ''),
-            'percentage': float(detail['portfolio_rate']),
-            'value': detail['reported_value_amount'],
-            'change': change_str,
-            'activity': activity,
-            'activityType': activity_type.lower() if activity_type else ''
-        }
-        formatted_stocks.append(stock)
-    
-    return {
-        'meta': formatted_meta,
-        'stocks': formatted_stocks
-    }
+def get_template_env():
+    global _env
+    if _env is None:
+        _env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), auto_reload=False, autoescape=True,
+                           trim_blocks=True, lstrip_blocks=True)
+        # tojson: <, >, &, ' 를 \u 이스케이프하여 <script> 안에 넣어도 안전한 JSON을 만듭니다 (한글은 그대로 유지)
+        _env.policies['json.dumps_kwargs'] = {'ensure_ascii': False}
+        _env.globals['ECHARTS_CDN_URL'] = ECHARTS_CDN_URL
+        _env.globals['DONUT_MAX_SLICES'] = REPORT_DONUT_MAX_SLICES
+        # 단독 HTML에 인라인할 CSS/JS는 한 번만 읽어 전역 변수로 둡니다 (렌더링마다 include하지 않음)
+        _env.globals['REPORT_CSS'] = Markup(read_template_file(TEMPLATE_CSS).decode('utf-8').rstrip('\n'))
+        _env.globals['REPORT_JS'] = Markup(read_template_file(TEMPLATE_JS).decode('utf-8').rstrip('\n'))
+    return _env
 
-def generate_report(data):
-    """HTML 템플릿에 데이터를 적용하여 리포트를 생성합니다."""
-    try:
-        # 템플릿 파일 읽기
-        template_path = os.path.join(os.path.dirname(__file__), 'report_template.html')
-        with open(template_path, 'r', encoding='utf-8') as f:
-            template_content = f.read()
-        
-        # JSON 문자열로 변환하면서 HTML 이스케이프 처리
-        stocks_json = json.dumps(data["stocks"], ensure_ascii=False)
-        
-        # 템플릿에 데이터 적용
-        template_content = template_content.replace(
-            'const stocks = []',
-            f'const stocks = {stocks_json}'
-        )
-        
-        template_content = template_content.replace(
-            'const investor_name = ""',
-            f'const investor_name = "{data["meta"]["investor_name"]}"'
-        )
+def load_report_template():
+    """리포트 템플릿을 한 번만 컴파일해 프로세스 안에서 재사용합니다."""
+    global _template
+    if _template is None:
+        _template = get_template_env().get_template(TEMPLATE_NAME)
+    return _template
 
-        template_content = template_content.replace(
-            'const portfolio_date = ""',
-            f'const portfolio_date = "{data["meta"]["portfolio_date"]}"'
-        )
+def read_template_file(name):
+    with open(os.path.join(TEMPLATE_DIR, name), 'rb') as f:
+        return f.read()
 
-        report_html = template_content
-        
+def template_version():
+    """템플릿 파일(HTML/CSS/JS) 내용과 REPORT_RENDER_VERSION, 템플릿 설정값으로 만든 템플릿 버전 (빌드 매니페스트 비교용)"""
+    global _template_version
+    if _template_version is None:
+        digest = hashlib.sha256()
+        for name in (TEMPLATE_NAME, TEMPLATE_CSS, TEMPLATE_JS):
+            digest.update(read_template_file(name))
+        _template_version = f"{REPORT_RENDER_VERSION}:{REPORT_DONUT_MAX_SLICES}:{digest.hexdigest()[:16]}"
+    return _template_version
+
+def report_filename(meta):
+    return f'{meta["investor_code"]}_{meta["portfolio_date"]}_generated_report.html'
+
+def report_output_path(meta, report_dir=REPORT_DIR):
+    return os.path.join(report_dir, report_filename(meta))
+
+def render_report(data, output_path, assets=None):
+    """템플릿에 데이터를 JSON으로 주입하고, 렌더링 결과를 출력 파일로 바로 스트리밍합니다.
+
+    assets({'css', 'js', 'echarts'} URL)가 없으면 CSS/JS를 인라인한 단독 HTML을, 있으면 공유 자산을 참조하는 HTML을 만듭니다.
+    """
+    load_report_template().stream(
+        investor_name=data["meta"]["investor_name"],
+        portfolio_date=data["meta"]["portfolio_date"],
+        stocks=data["stocks"],
+        assets=assets,
+    ).dump(output_path, encoding='utf-8')
+
+def generate_report(data, report_dir=REPORT_DIR, assets=None, compress=False):
+    """HTML 템플릿에 데이터를 적용하여 리포트를 생성합니다. compress=True면 .gz/.br 사전 압축본도 씁니다."""
+    try:
         # 결과 파일 저장 (report 폴더에 저장)
-        report_dir = os.path.join(os.path.dirname(__file__), 'report')
         os.makedirs(report_dir, exist_ok=True)  # 폴더가 없으면 생성
-        output_path = os.path.join(report_dir, f'{data["meta"]["investor_code"]}_{data["meta"]["portfolio_date"]}_generated_report.html')
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(report_html)
-            
+        output_path = report_output_path(data["meta"], report_dir)
+        render_report(data, output_path, assets)
+        if compress:
+            precompress(output_path)
+
         logger.info(f"리포트가 성공적으로 생성되었습니다: {output_path}")
         return output_path
         
@@ -136,14 +145,188 @@ def generate_report(data):
         logger.error(f"리포트 생성 중 오류 발생: {e}")
         return None
 
-def main():
-    """메인 실행 함수"""
-    db_conn = get_db_connection()
-    if not db_conn:
-        logger.error("DB 연결에 실패하여 프로그램을 종료합니다.")
+def find_report_portfolios(db_conn, investor_codes=None, portfolio_dates=None, latest_only=False):
+    """리포트를 만들 포트폴리오 idx 목록을 한 번의 쿼리로 조회합니다 (투자자 코드/기준 날짜로 필터링)."""
+    sql = "SELECT p.idx FROM investor_portfolio p WHERE 1 = 1"
+    params = []
+    if investor_codes:
+        sql += f" AND p.investor_code IN ({', '.join(['%s'] * len(investor_codes))})"
+        params.extend(investor_codes)
+    if portfolio_dates:
+        sql += f" AND p.portfolio_date IN ({', '.join(['%s'] * len(portfolio_dates))})"
+        params.extend(portfolio_dates)
+    if latest_only:
+        sql += " AND p.portfolio_date = (SELECT MAX(l.portfolio_date) FROM investor_portfolio l WHERE l.investor_code = p.investor_code)"
+    sql += " ORDER BY p.investor_code, p.portfolio_date"
+    with db_conn.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row['idx'] for row in cursor.fetchall()]
+
+def fetch_formatted_portfolios(db_conn, p_idxs):
+    """포트폴리오 메타/상세 행을 REPORT_FETCH_CHUNK개씩 묶어 조회하고 템플릿 형식으로 변환합니다."""
+    formatted = []
+    for start in range(0, len(p_idxs), REPORT_FETCH_CHUNK):
+        chunk = p_idxs[start:start + REPORT_FETCH_CHUNK]
+        portfolios = fetch_portfolio_data(db_conn, chunk)
+        formatted.extend(format_portfolio_data(portfolios[p_idx]) for p_idx in chunk if p_idx in portfolios)
+    return formatted
+
+def _init_report_worker():
+    # 워커마다 템플릿을 한 번만 읽고, 리포트별 INFO 로그는 남기지 않습니다.
+    logger.setLevel(logging.WARNING)
+    load_report_template()
+
+def render_reports(formatted_portfolios, workers=REPORT_WORKERS, report_dir=REPORT_DIR, assets=None, compress=False):
+    """여러 포트폴리오의 리포트를 프로세스 풀에서 렌더링하고 포트폴리오별 결과 경로(실패 시 None) 목록을 반환합니다."""
+    if workers <= 1 or len(formatted_portfolios) <= 1:
+        _init_report_worker()
+        results = [generate_report(data, report_dir, assets, compress) for data in formatted_portfolios]
+        logger.setLevel(logging.INFO)
+        return results
+    count = len(formatted_portfolios)
+    chunksize = max(1, count // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_report_worker) as executor:
+        return list(executor.map(generate_report, formatted_portfolios, [report_dir] * count, [assets] * count,
+                                 [compress] * count, chunksize=chunksize))
+
+def generate_reports(formatted_portfolios, workers=REPORT_WORKERS, report_dir=REPORT_DIR, force=False, assets=None,
+                     compress=False):
+    """빌드 매니페스트와 입력 해시가 다른 리포트만 렌더링하고 (생성 경로 목록, 건너뛴 수, 실패 수)를 반환합니다.
+
+    입력 해시는 포맷팅한 데이터의 해시이고, 템플릿 버전(공유 자산 URL 포함)이 바뀌면 모든 리포트를 다시 만듭니다.
+    force=True면 매니페스트를 무시합니다.
+    """
+    manifest = ReportManifest(report_dir)
+    version = template_version()
+    if assets:
+        version += ":" + hashlib.sha256(json.dumps(assets, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    stale = []
+    for data in formatted_portfolios:
+        input_hash = data_hash(data)
+        if force or not manifest.is_fresh(report_filename(data["meta"]), input_hash, version):
+            stale.append((data, input_hash))
+
+    results = render_reports([data for data, _ in stale], workers, report_dir, assets, compress)
+    paths = []
+    for (data, input_hash), path in zip(stale, results):
+        if path:
+            manifest.record(report_filename(data["meta"]), input_hash, version)
+            paths.append(path)
+    if paths:
+        manifest.save()
+    return paths, len(formatted_portfolios) - len(stale), len(stale) - len(paths)
+
+def run_batch(db_conn, investor_codes=None, portfolio_dates=None, latest_only=False, workers=REPORT_WORKERS, force=False):
+    """필터에 맞는 모든 포트폴리오의 리포트 중 입력이 바뀐 것만 생성하고 생성된 리포트 수를 반환합니다."""
+    started_at = time.perf_counter()
+    p_idxs = find_report_portfolios(db_conn, investor_codes, portfolio_dates, latest_only)
+    if not p_idxs:
+        logger.warning("조건에 맞는 포트폴리오가 없습니다.")
+        return 0
+
+    formatted_portfolios = fetch_formatted_portfolios(db_conn, p_idxs)
+    fetched_at = time.perf_counter()
+    logger.info(f"포트폴리오 {len(formatted_portfolios)}개 조회 완료 ({fetched_at - started_at:.2f}초), 렌더링 시작 (프로세스 {workers}개)")
+
+    paths, skipped, failed = generate_reports(formatted_portfolios, workers, force=force)
+    elapsed = time.perf_counter() - started_at
+    render_seconds = time.perf_counter() - fetched_at
+    logger.info(f"리포트 {len(paths)}개 생성 완료, 변경 없음 {skipped}개, 실패 {failed}개 "
+                f"(전체 {elapsed:.2f}초, 렌더링 {len(paths) / render_seconds if render_seconds > 0 else 0:.1f} reports/sec)")
+    return len(paths)
+
+def write_site_assets(site_dir):
+    """공유 CSS/JS와 ECharts를 내용 해시 이름으로 assets/에 쓰고 reports/ 기준 URL을 반환합니다."""
+    assets = {
+        'css': write_hashed_asset(site_dir, 'report', 'css', read_template_file(TEMPLATE_CSS)),
+        'js': write_hashed_asset(site_dir, 'report', 'js', read_template_file(TEMPLATE_JS)),
+        'echarts': write_hashed_asset(site_dir, 'echarts', 'min.js', vendored_echarts()),
+    }
+    return {key: f"../{name}" for key, name in assets.items()}
+
+def write_index_page(site_dir, relative_path, title, sections):
+    """목록 페이지를 렌더링하고 사전 압축본까지 씁니다. root는 페이지에서 사이트 루트까지의 상대 경로입니다."""
+    output_path = os.path.join(site_dir, relative_path)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    root = "../" * relative_path.count("/")
+    get_template_env().get_template(SITE_INDEX_TEMPLATE).stream(
+        title=title, root=root, sections=sections).dump(output_path, encoding='utf-8')
+    precompress(output_path)
+
+def write_index_pages(site_dir, formatted_portfolios):
+    """전체 목록(index.html)과 투자자별(investors/{code}.html), 분기별(quarters/{date}.html) 목록 페이지를 쓰고 개수를 반환합니다."""
+    by_investor, by_quarter = group_portfolios(formatted_portfolios)
+
+    def report_row(meta, label):
+        return {'href': f"../reports/{report_filename(meta)}", 'label': label,
+                'detail': f"{meta['total_value']} · {meta['number_of_stocks']}종목"}
+
+    write_index_page(site_dir, "index.html", "슈퍼 투자자 포트폴리오 리포트", [
+        {'heading': f"투자자 ({len(by_investor)})", 'rows': [
+            {'href': f"investors/{code}.html", 'label': metas[0]['investor_name'],
+             'detail': f"{len(metas)}개 분기 · 최신 {metas[0]['portfolio_date']}"} for code, metas in by_investor.items()]},
+        {'heading': f"분기 ({len(by_quarter)})", 'rows': [
+            {'href': f"quarters/{date}.html", 'label': date, 'detail': f"투자자 {len(metas)}명"}
+            for date, metas in by_quarter.items()]},
+    ])
+    for code, metas in by_investor.items():
+        write_index_page(site_dir, f"investors/{code}.html", f"{metas[0]['investor_name']} ({code})", [
+            {'heading': "분기별 리포트", 'rows': [report_row(meta, meta['portfolio_date']) for meta in metas]}])
+    for date, metas in by_quarter.items():
+        write_index_page(site_dir, f"quarters/{date}.html", f"{date} 기준 포트폴리오", [
+            {'heading': "투자자별 리포트", 'rows': [report_row(meta, meta['investor_name']) for meta in metas]}])
+    return 1 + len(by_investor) + len(by_quarter)
+
+def build_site(db_conn, site_dir=SITE_DIR, investor_codes=None, portfolio_dates=None, latest_only=False,
+               workers=REPORT_WORKERS, force=False):
+    """정적 리포트 사이트를 빌드하고 생성된 리포트 수를 반환합니다.
+
+    site_dir/
+      index.html, investors/{code}.html, quarters/{date}.html  목록 페이지
+      reports/{code}_{date}_generated_report.html               공유 자산을 참조하는 리포트 (빌드 매니페스트로 증분 빌드)
+      assets/report.{hash}.css, report.{hash}.js, echarts.{hash}.min.js
+    모든 HTML/자산 옆에 .gz/.br 사전 압축본을 함께 쓰고, 마지막에 어떤 페이지도 참조하지 않는 이전 자산을 지웁니다.
+    """
+    started_at = time.perf_counter()
+    p_idxs = find_report_portfolios(db_conn, investor_codes, portfolio_dates, latest_only)
+    if not p_idxs:
+        logger.warning("조건에 맞는 포트폴리오가 없습니다.")
+        return 0
+    formatted_portfolios = fetch_formatted_portfolios(db_conn, p_idxs)
+
+    assets = write_site_assets(site_dir)
+    paths, skipped, failed = generate_reports(formatted_portfolios, workers, os.path.join(site_dir, 'reports'), force,
+                                              assets=assets, compress=True)
+    pages = write_index_pages(site_dir, formatted_portfolios)
+    pruned = prune_site_assets(site_dir)
+    if pruned:
+        logger.info(f"참조하지 않는 이전 자산 {pruned}개를 삭제했습니다.")
+
+    raw_bytes, compressed_bytes = site_size(site_dir)
+    logger.info(f"사이트 빌드 완료: 리포트 {len(paths)}개 생성, 변경 없음 {skipped}개, 실패 {failed}개, 목록 페이지 {pages}개 "
+                f"({time.perf_counter() - started_at:.2f}초) - {site_dir} "
+                f"원본 {raw_bytes / 1024 / 1024:.1f}MB / 사전 압축 {compressed_bytes / 1024 / 1024:.1f}MB")
+    return len(paths)
+
+def main(batch=False, investor_codes=None, portfolio_dates=None, latest_only=False, workers=REPORT_WORKERS, force=False,
+         site_dir=None):
+    """메인 실행 함수 (batch=False면 가장 최근 포트폴리오 하나의 리포트만 생성, site_dir이 있으면 정적 사이트 빌드)"""
+    db_pool = get_pool()
+    try:
+        db_conn = db_pool.acquire()
+    except Exception as e:
+        logger.error(f"DB 연결에 실패하여 프로그램을 종료합니다: {e}")
         return
     
     try:
+        if site_dir:
+            build_site(db_conn, site_dir, investor_codes, portfolio_dates, latest_only, workers, force)
+            return
+
+        if batch:
+            run_batch(db_conn, investor_codes, portfolio_dates, latest_only, workers, force)
+            return
+
         # 최신 포트폴리오 데이터 조회
         portfolio_data = get_latest_portfolio_data(db_conn)
         if not portfolio_data:
@@ -156,19 +339,34 @@ def main():
             logger.error("데이터 포맷팅에 실패했습니다.")
             return
             
-        # 리포트 생성
-        report_path = generate_report(formatted_data)
-        if report_path:
-            logger.info(f"리포트가 성공적으로 생성되었습니다: {report_path}")
+        # 리포트 생성 (입력이 바뀌지 않았으면 건너뜀)
+        paths, skipped, _ = generate_reports([formatted_data], workers=1, force=force)
+        if paths:
+            logger.info(f"리포트가 성공적으로 생성되었습니다: {paths[0]}")
+        elif skipped:
+            logger.info(f"데이터와 템플릿이 바뀌지 않아 리포트를 다시 만들지 않았습니다: {report_output_path(formatted_data['meta'])}")
         else:
             logger.error("리포트 생성에 실패했습니다.")
             
     except Exception as e:
         logger.error(f"리포트 생성 중 예외 발생: {e}")
     finally:
-        if db_conn:
-            db_conn.close()
-            logger.info("DB 연결이 종료되었습니다.")
+        db_pool.release(db_conn)
+        close_pool()
+        logger.info("DB 연결이 종료되었습니다.")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="포트폴리오 리포트 생성")
+    parser.add_argument("--all", action="store_true", help="저장된 모든 (또는 필터에 맞는) 포트폴리오의 리포트를 일괄 생성")
+    parser.add_argument("--investors", nargs="+", help="일괄 생성할 투자자 코드 (예: BRK AKO)")
+    parser.add_argument("--dates", nargs="+", help="일괄 생성할 포트폴리오 기준 날짜 (예: 2025-03-31)")
+    parser.add_argument("--latest-only", action="store_true", help="투자자별 최신 분기만 생성")
+    parser.add_argument("--workers", type=int, default=REPORT_WORKERS, help="렌더링 프로세스 수")
+    parser.add_argument("--site", nargs="?", const=SITE_DIR, metavar="DIR",
+                        help=f"공유 자산/목록 페이지/사전 압축본을 포함한 정적 사이트로 빌드 (기본 경로: {SITE_DIR})")
+    parser.add_argument("--force", action="store_true", help="빌드 매니페스트를 무시하고 모든 리포트를 다시 생성")
+    args = parser.parse_args()
+    batch = args.all or bool(args.investors) or bool(args.dates) or args.latest_only
+    main(batch=batch, investor_codes=[code.upper() for code in args.investors or []], portfolio_dates=args.dates,
+         latest_only=args.latest_only, workers=args.workers, force=args.force,
+         site_dir=args.site) 
\ No newline at end of file
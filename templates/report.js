@@ -0,0 +1,584 @@
+// 색상 자동 생성 함수 - 최대 500개 종목까지 지원
+function generateColors(count) {
+    // 기본 색상 테마 - 금융/투자 테마에 적합한 색상들
+    const baseColors = [
+        { h: 45, s: 100, l: 50 },   // 황금색 #ffd700
+        { h: 36, s: 100, l: 50 },   // 골드 #ffaa00
+        { h: 27, s: 100, l: 50 },   // 주황색 #ff8800
+        { h: 18, s: 100, l: 50 },   // 다크 오렌지 #ff5500
+        { h: 9, s: 100, l: 50 },    // 밝은 빨강 #ff2200
+        { h: 0, s: 100, l: 50 },    // 빨강 #ff0000
+        { h: 350, s: 80, l: 50 },   // 자주색 #d9365e
+        { h: 330, s: 80, l: 50 },   // 핑크 #d935a3
+        { h: 300, s: 70, l: 50 },   // 보라색 #bf3fd9
+        { h: 270, s: 70, l: 50 },   // 진한 보라 #8c3fd9
+        { h: 240, s: 70, l: 50 },   // 파란색 #3f3fd9
+        { h: 210, s: 90, l: 50 },   // 하늘색 #0f88d9
+        { h: 180, s: 90, l: 45 },   // 청록색 #0d9999
+        { h: 150, s: 90, l: 40 },   // 진한 녹색 #0d9957
+        { h: 120, s: 90, l: 40 },   // 녹색 #0d990d
+        { h: 90, s: 90, l: 45 },    // 라임색 #87cc0a
+        { h: 60, s: 90, l: 50 }     // 노란색 #e6e619
+    ];
+    
+    // 생성된 색상을 저장할 배열
+    const colors = [];
+    
+    // 종목 수에 따라 색상 생성
+    for (let i = 0; i < count; i++) {
+        // 기본 색상 선택 (순환)
+        const baseColor = baseColors[i % baseColors.length];
+        
+        // 같은 색상 계열 내에서 변형을 위한 인덱스
+        const variationIndex = Math.floor(i / baseColors.length);
+        
+        // 같은 색상 계열에서 밝기와 채도 변형
+        let h = baseColor.h;
+        let s = baseColor.s;
+        let l = baseColor.l;
+        
+        if (variationIndex > 0) {
+            // 변형 1: 밝기 조정 (30-70% 범위, 첫 번째 순환)
+            if (variationIndex <= 4) {
+                l = 30 + (variationIndex * 10);
+            } 
+            // 변형 2: 색조 미세 조정 (±15도, 두 번째 순환)
+            else if (variationIndex <= 8) {
+                const shift = (variationIndex - 4) * 3;
+                h = (baseColor.h + shift) % 360;
+                l = 45 + (variationIndex % 3) * 10;
+            }
+            // 변형 3: 채도 조정 (70-100% 범위, 세 번째 순환)
+            else if (variationIndex <= 12) {
+                s = 70 + (variationIndex - 8) * 7.5;
+                l = 40 + (variationIndex % 4) * 7.5;
+            }
+            // 변형 4: 복합 조정 (네 번째 순환 이상)
+            else {
+                const hShift = (variationIndex % 5) * 4 - 8;
+                h = ((baseColor.h + hShift) + 360) % 360;
+                s = 75 + (variationIndex % 3) * 8;
+                l = 35 + (variationIndex % 7) * 5;
+            }
+        }
+        
+        // HSL을 HEX 색상 코드로 변환
+        colors.push(hslToHex(h, s, l));
+    }
+    
+    return colors;
+}
+
+// HSL 색상 모델을 HEX 색상 코드로 변환하는 함수
+function hslToHex(h, s, l) {
+    // HSL을 RGB로 변환
+    s /= 100;
+    l /= 100;
+    
+    const c = (1 - Math.abs(2 * l - 1)) * s;
+    const x = c * (1 - Math.abs((h / 60) % 2 - 1));
+    const m = l - c / 2;
+    
+    let r, g, b;
+    
+    if (0 <= h && h < 60) {
+        [r, g, b] = [c, x, 0];
+    } else if (60 <= h && h < 120) {
+        [r, g, b] = [x, c, 0];
+    } else if (120 <= h && h < 180) {
+        [r, g, b] = [0, c, x];
+    } else if (180 <= h && h < 240) {
+        [r, g, b] = [0, x, c];
+    } else if (240 <= h && h < 300) {
+        [r, g, b] = [x, 0, c];
+    } else {
+        [r, g, b] = [c, 0, x];
+    }
+    
+    // RGB 값을 HEX 코드로 변환
+    const toHex = (value) => {
+        const hex = Math.round((value + m) * 255).toString(16);
+        return hex.length === 1 ? '0' + hex : hex;
+    };
+    
+    return `#${toHex(r)}${toHex(g)}${toHex(b)}`;
+}
+
+// 도넛 차트 데이터: 종목 수가 donut_max_slices를 넘으면 비중 상위 (donut_max_slices - 1)개만 두고 나머지는 "기타"로 묶음
+function buildDonutData() {
+    const sliceStyle = {
+        borderRadius: 5,
+        borderWidth: 2,
+        borderColor: '#ffffff'
+    };
+    const sorted = [...stocks].sort((a, b) => b.percentage - a.percentage);
+    const limit = donut_max_slices > 1 && sorted.length > donut_max_slices ? donut_max_slices - 1 : sorted.length;
+
+    const chartData = sorted.slice(0, limit).map(stock => ({
+        value: stock.percentage,
+        name: stock.symbol,
+        itemStyle: sliceStyle
+    }));
+
+    const rest = sorted.slice(limit);
+    if (rest.length > 0) {
+        const restPercentage = rest.reduce((sum, stock) => sum + stock.percentage, 0);
+        chartData.push({
+            value: Math.round(restPercentage * 100) / 100,
+            name: `기타 ${rest.length}종목`,
+            itemStyle: { ...sliceStyle, color: '#9ca3af' }
+        });
+    }
+    return chartData;
+}
+
+// 도넛 차트 초기화
+function initDonutChart() {
+    const chartDom = document.getElementById('portfolioChart');
+    const myChart = echarts.init(chartDom);
+
+    // 종목 데이터 준비 (긴 꼬리는 "기타"로 묶음)
+    const chartData = buildDonutData();
+
+    const option = {
+        backgroundColor: 'transparent',
+        tooltip: {
+            trigger: 'item',
+            formatter: '{b}: {c}%',
+            backgroundColor: 'rgba(255, 255, 255, 0.95)',
+            borderColor: '#ffd100',
+            borderWidth: 1,
+            textStyle: {
+                color: '#1f2937'
+            },
+            extraCssText: 'box-shadow: 0 4px 12px rgba(0, 0, 0, 0.1);'
+        },
+        legend: {
+            type: 'scroll',
+            orient: 'horizontal',
+            left: 'center',
+            bottom: '5%',
+            itemGap: 12,
+            pageButtonPosition: 'end',
+            pageIconSize: [12, 12],
+            pageIconColor: '#ffd100',
+            pageIconInactiveColor: '#e5e7eb',
+            pageTextStyle: {
+                color: '#1f2937',
+                fontSize: 10
+            },
+            textStyle: {
+                color: '#4b5563',
+                fontSize: 12
+            },
+            icon: 'circle',
+            formatter: function (name) {
+                const item = chartData.find(d => d.name === name);
+                return `${name}  ${item.value}%`;
+            }
+        },
+        series: [
+            {
+                name: '포트폴리오 비중',
+                type: 'pie',
+                radius: ['40%', '70%'],
+                center: ['50%', '50%'],
+                avoidLabelOverlap: false,
+                itemStyle: {
+                    borderRadius: 10,
+                    borderColor: '#ffffff',
+                    borderWidth: 2
+                },
+                label: {
+                    show: false,
+                    position: 'center'
+                },
+                emphasis: {
+                    label: {
+                        show: true,
+                        fontSize: 20,
+                        fontWeight: 'bold',
+                        color: '#1f2937',
+                        formatter: function(params) {
+                            return `${params.name}\n${params.value}%`;
+                        }
+                    },
+                    itemStyle: {
+                        shadowBlur: 20,
+                        shadowOffsetX: 0,
+                        shadowColor: 'rgba(255, 209, 0, 0.3)'
+                    }
+                },
+                labelLine: {
+                    show: false
+                },
+                data: chartData,
+                color: generateColors(chartData.length),
+                animationType: 'scale',
+                animationEasing: 'elasticOut',
+                animationDelay: function (idx) {
+                    return Math.random() * 200;
+                }
+            }
+        ]
+    };
+
+    // 모바일 화면에서 차트 옵션 변경
+    if (window.innerWidth <= 480) {
+        option.legend.bottom = '0';
+        option.legend.itemGap = 5;
+        option.legend.pageIconSize = [6, 6];
+        option.legend.textStyle.fontSize = 8;
+        option.series[0].center = ['50%', '40%'];
+        option.series[0].radius = ['30%', '55%'];
+    } else if (window.innerWidth <= 768) {
+        option.legend.bottom = '2%';
+        option.legend.itemGap = 8;
+        option.legend.pageIconSize = [8, 8];
+        option.legend.textStyle.fontSize = 10;
+        option.series[0].center = ['50%', '45%'];
+        option.series[0].radius = ['35%', '60%'];
+    }
+
+    myChart.setOption(option);
+
+    // 반응형 처리
+    window.addEventListener('resize', function() {
+        myChart.resize();
+        
+        // 창 크기에 따라 차트 옵션 다시 설정
+        const newOption = {...option};
+        
+        if (window.innerWidth <= 480) {
+            newOption.legend.bottom = '0';
+            newOption.legend.itemGap = 5;
+            newOption.legend.pageIconSize = [6, 6];
+            newOption.legend.textStyle.fontSize = 8;
+            newOption.series[0].center = ['50%', '40%'];
+            newOption.series[0].radius = ['30%', '55%'];
+        } else if (window.innerWidth <= 768) {
+            newOption.legend.bottom = '2%';
+            newOption.legend.itemGap = 8;
+            newOption.legend.pageIconSize = [8, 8];
+            newOption.legend.textStyle.fontSize = 10;
+            newOption.series[0].center = ['50%', '45%'];
+            newOption.series[0].radius = ['35%', '60%'];
+        } else {
+            newOption.legend.bottom = '5%';
+            newOption.legend.itemGap = 12;
+            newOption.legend.pageIconSize = [12, 12];
+            newOption.legend.textStyle.fontSize = 12;
+            newOption.series[0].center = ['50%', '50%'];
+            newOption.series[0].radius = ['40%', '70%'];
+        }
+        
+        myChart.setOption(newOption);
+    });
+}
+
+// 보유 가치를 천단위 콤마 $, M접미사 문자열로 변환
+function formatStockValue(value) {
+    if (typeof value !== 'number') return value;
+    return "$" + Math.round(value / 1000000).toLocaleString() + "M";
+}
+
+// 주식 카드 생성 함수
+function createStockCard(stock) {
+    const changeClass = stock.change && stock.change.startsWith('+') ? 'positive' : 
+                       stock.change && stock.change.startsWith('-') ? 'negative' : '';
+    
+    let activityBadgeClass = '';
+    if (stock.activityType === 'add') activityBadgeClass = 'add';
+    else if (stock.activityType === 'reduce') activityBadgeClass = 'reduce';
+    else if (stock.activityType === 'buy') activityBadgeClass = 'buy';
+
+    return `
+        <div class="stock-card scroll-reveal">
+            <div class="stock-header">
+                <div>
+                    <div class="stock-symbol"><a href="https://finance.yahoo.com/quote/${stock.symbol}/" target="_blank">${stock.symbol}</a></div>
+                    <div class="stock-name">${stock.name || ''}</div>
+                </div>
+                <div class="stock-percentage">${stock.percentage}%</div>
+            </div>
+            <div class="stock-metrics">
+                <div class="metric">
+                    <span class="metric-label">가치</span>
+                    <span class="metric-value">${stock.value || '-'}</span>
+                </div>
+                <div class="metric">
+                    <span class="metric-label">변동률</span>
+                    <span class="metric-value ${changeClass}">${stock.change || '-'}</span>
+                </div>
+            </div>
+            ${stock.activity ? `<div class="activity-badge ${activityBadgeClass}">${stock.activity}</div>` : ''}
+        </div>
+    `;
+}
+
+// 주식 카드 렌더링: 처음 STOCK_GRID_BATCH_SIZE개만 만들고, 그리드 끝의 감시 요소가 화면에 가까워지면 다음 묶음을 추가
+const STOCK_GRID_BATCH_SIZE = 60;
+const stocksGrid = document.getElementById('stocksGrid');
+const hasIntersectionObserver = 'IntersectionObserver' in window;
+let renderedStockCount = 0;
+
+// 요약 카드 계산에서도 쓰는 문자열 형식으로 한 번만 변환
+stocks.forEach(stock => {
+    stock.value = formatStockValue(stock.value);
+});
+
+// 스크롤 애니메이션: 카드가 화면에 들어오면 한 번만 active 처리 (스크롤 이벤트마다 전체 카드를 측정하지 않음)
+const revealObserver = hasIntersectionObserver ? new IntersectionObserver((entries, observer) => {
+    entries.forEach(entry => {
+        if (entry.isIntersecting) {
+            entry.target.classList.add('active');
+            observer.unobserve(entry.target);
+        }
+    });
+}, { rootMargin: '0px 0px -150px 0px' }) : null;
+
+function renderNextStockBatch() {
+    const batch = stocks.slice(renderedStockCount, renderedStockCount + STOCK_GRID_BATCH_SIZE);
+    if (batch.length === 0) return false;
+
+    const firstNewIndex = stocksGrid.children.length;
+    stocksGrid.insertAdjacentHTML('beforeend', batch.map(createStockCard).join(''));
+    renderedStockCount += batch.length;
+
+    Array.from(stocksGrid.children).slice(firstNewIndex).forEach(card => {
+        if (revealObserver) revealObserver.observe(card);
+        else card.classList.add('active');
+    });
+    return renderedStockCount < stocks.length;
+}
+
+if (hasIntersectionObserver) {
+    const gridSentinel = document.createElement('div');
+    gridSentinel.className = 'stocks-grid-sentinel';
+    stocksGrid.after(gridSentinel);
+
+    const SENTINEL_MARGIN_PX = 800;
+
+    // IntersectionObserver는 교차 상태가 바뀔 때만 알려주므로, 배치를 붙인 뒤에도 센티널이 여전히 보이면
+    // (큰 화면, 짧은 마지막 배치 등) 직접 다음 배치를 이어서 렌더링합니다.
+    const sentinelInView = () => {
+        const rect = gridSentinel.getBoundingClientRect();
+        return rect.top < window.innerHeight + SENTINEL_MARGIN_PX && rect.bottom > -SENTINEL_MARGIN_PX;
+    };
+
+    const sentinelObserver = new IntersectionObserver(entries => {
+        if (!entries.some(entry => entry.isIntersecting)) return;
+        let hasMore;
+        do {
+            hasMore = renderNextStockBatch();
+        } while (hasMore && sentinelInView());
+        if (!hasMore) {
+            sentinelObserver.disconnect();
+            gridSentinel.remove();
+        }
+    }, { rootMargin: `${SENTINEL_MARGIN_PX}px 0px` });
+
+    if (renderNextStockBatch()) {
+        sentinelObserver.observe(gridSentinel);
+    } else {
+        gridSentinel.remove();
+    }
+} else {
+    // IntersectionObserver를 지원하지 않는 브라우저는 모두 한 번에 렌더링
+    while (renderNextStockBatch()) {}
+}
+
+// 초기 로드시 실행
+window.addEventListener('DOMContentLoaded', () => {
+    // 투자자 정보 업데이트
+    updateInvestorInfo();
+    
+    // 요약 카드 데이터 계산 및 업데이트
+    updateSummaryCards();
+    
+    // 도넛 차트 초기화
+    initDonutChart();
+});
+
+// 투자자 정보 업데이트 함수
+function updateInvestorInfo() {
+    const nameElement = document.getElementById('investorName');
+    // & 문자 강조 처리
+    if (investor_name.includes('&')) {
+        const parts = investor_name.split('&');
+        nameElement.innerHTML = parts.join('<span class="special-char">&amp;</span>');
+    } else {
+        nameElement.textContent = investor_name;
+    }
+    // 긴 이름 처리
+    if (investor_name.length > 25) {
+        nameElement.classList.add('long-name');
+    } else {
+        nameElement.classList.remove('long-name');
+    }
+    document.getElementById('investorPeriod').textContent = portfolio_date + ' 기준 포트폴리오';
+    document.title = `${investor_name} (${portfolio_date})`;
+}
+
+// 요약 카드 데이터 계산 및 업데이트 함수
+function updateSummaryCards() {
+    // 1. 총 포트폴리오 가치 계산
+    let totalValue = 0;
+    stocks.forEach(stock => {
+        // stock.value가 있고 숫자 형식으로 변환 가능한 경우에만 계산
+        if (stock.value) {
+            // $, B, M, K 등의 접미사 처리
+            let valueStr = stock.value.replace(/[$,]/g, '');
+            let multiplier = 1;
+            
+            if (valueStr.includes('B')) {
+                multiplier = 1000000000;
+                valueStr = valueStr.replace('B', '');
+            } else if (valueStr.includes('M')) {
+                multiplier = 1000000;
+                valueStr = valueStr.replace('M', '');
+            } else if (valueStr.includes('K')) {
+                multiplier = 1000;
+                valueStr = valueStr.replace('K', '');
+            }
+            
+            const numValue = parseFloat(valueStr) * multiplier;
+            if (!isNaN(numValue)) {
+                totalValue += numValue;
+            }
+        }
+    });
+    
+    // 총 가치 포맷팅 (B, M, K 접미사 사용)
+    let formattedTotalValue;
+    if (totalValue >= 1000000000) {
+        formattedTotalValue = '$' + (totalValue / 1000000000).toFixed(1) + 'B';
+    } else if (totalValue >= 1000000) {
+        formattedTotalValue = '$' + (totalValue / 1000000).toFixed(1) + 'M';
+    } else if (totalValue >= 1000) {
+        formattedTotalValue = '$' + (totalValue / 1000).toFixed(1) + 'K';
+    } else {
+        formattedTotalValue = '$' + totalValue.toFixed(2);
+    }
+    
+    // 총 포트폴리오 가치가 계산되지 않는 경우 (데이터 부족) 기본값 설정
+    if (totalValue === 0) {
+        const totalPortfolioPercentage = stocks.reduce((sum, stock) => sum + stock.percentage, 0);
+        
+        // 첫 번째 종목의 value와 percentage를 기준으로 전체 포트폴리오 가치 추정
+        for (const stock of stocks) {
+            if (stock.value && stock.percentage) {
+                let valueStr = stock.value.replace(/[$,]/g, '');
+                let multiplier = 1;
+                
+                if (valueStr.includes('B')) {
+                    multiplier = 1000000000;
+                    valueStr = valueStr.replace('B', '');
+                } else if (valueStr.includes('M')) {
+                    multiplier = 1000000;
+                    valueStr = valueStr.replace('M', '');
+                } else if (valueStr.includes('K')) {
+                    multiplier = 1000;
+                    valueStr = valueStr.replace('K', '');
+                }
+                
+                const stockValue = parseFloat(valueStr) * multiplier;
+                if (!isNaN(stockValue) && stock.percentage > 0) {
+                    totalValue = (stockValue / stock.percentage) * 100;
+                    
+                    if (totalValue >= 1000000000) {
+                        formattedTotalValue = '$' + (totalValue / 1000000000).toFixed(1) + 'B';
+                    } else if (totalValue >= 1000000) {
+                        formattedTotalValue = '$' + (totalValue / 1000000).toFixed(1) + 'M';
+                    } else if (totalValue >= 1000) {
+                        formattedTotalValue = '$' + (totalValue / 1000).toFixed(1) + 'K';
+                    } else {
+                        formattedTotalValue = '$' + totalValue.toFixed(2);
+                    }
+                    
+                    break;
+                }
+            }
+        }
+        
+        // 여전히 계산할 수 없는 경우 기본값 사용
+        if (totalValue === 0) {
+            formattedTotalValue = '데이터 없음';
+        }
+    }
+    
+    // 2. 보유 종목 수
+    const stockCount = stocks.length;
+    
+    // 3. 평균 수익률 계산
+    let totalChangePercentage = 0;
+    let changeCount = 0;
+    
+    stocks.forEach(stock => {
+        if (stock.change) {
+            // 변동률에서 퍼센트 부호와 콤마 제거하고 숫자로 변환
+            const changeStr = stock.change.replace(/[%,]/g, '');
+            const changeValue = parseFloat(changeStr);
+            
+            if (!isNaN(changeValue)) {
+                totalChangePercentage += changeValue;
+                changeCount++;
+            }
+        }
+    });
+    
+    // 평균 수익률 계산 및 포맷팅
+    let averageReturn;
+    if (changeCount > 0) {
+        const avgChange = totalChangePercentage / changeCount;
+        const sign = avgChange >= 0 ? '+' : '';
+        averageReturn = sign + avgChange.toFixed(1) + '%';
+    } else {
+        averageReturn = '데이터 없음';
+    }
+    
+    // 4. 최대 보유 종목 찾기
+    let topHolding = '';
+    let maxPercentage = -1;
+    
+    stocks.forEach(stock => {
+        if (stock.percentage > maxPercentage) {
+            maxPercentage = stock.percentage;
+            topHolding = stock.symbol;
+        }
+    });
+    
+    if (maxPercentage === -1) {
+        topHolding = '데이터 없음';
+    }
+    
+    // 요약 카드에 값 업데이트
+    document.getElementById('totalValue').textContent = formattedTotalValue;
+    document.getElementById('stockCount').textContent = stockCount;
+    document.getElementById('averageReturn').textContent = averageReturn;
+    document.getElementById('topHolding').textContent = topHolding;
+    
+    // 평균 수익률 양수/음수에 따른 클래스 적용
+    const averageReturnElement = document.getElementById('averageReturn');
+    if (averageReturn.includes('+')) {
+        averageReturnElement.classList.add('positive');
+        averageReturnElement.classList.remove('negative');
+    } else if (averageReturn.includes('-')) {
+        averageReturnElement.classList.add('negative');
+        averageReturnElement.classList.remove('positive');
+    } else {
+        averageReturnElement.classList.remove('positive');
+        averageReturnElement.classList.remove('negative');
+    }
+}
+
+// 카드 호버 효과 (나중에 추가되는 카드도 처리하도록 그리드에 이벤트 위임)
+function setCardHover(event, transform) {
+    const card = event.target.closest('.stock-card');
+    if (card && !card.contains(event.relatedTarget)) {
+        card.style.transform = transform;
+    }
+}
+
+stocksGrid.addEventListener('mouseover', event => setCardHover(event, 'translateY(-5px) scale(1.02)'));
+stocksGrid.addEventListener('mouseout', event => setCardHover(event, 'translateY(0) scale(1)'));
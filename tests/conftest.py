@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 저장소 루트의 crawler, utils, benchmarks 패키지를 가져올 수 있도록 경로를 추가합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
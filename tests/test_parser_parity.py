@@ -0,0 +1,40 @@
+"""holdings 파서 백엔드(html.parser / lxml)가 fixture 페이지에서 같은 결과를 내는지 검증합니다."""
+import pytest
+
+pytest.importorskip("lxml")
+
+from crawler import _parse_holdings_html, _parse_holdings_summary_html, DATAROMA_BASE_URL  # noqa: E402
+from benchmarks.fixture_corpus import saved_holdings_pages, synthetic_holdings_pages  # noqa: E402
+
+def holdings_pages():
+    """(이름, m_code, html) 목록: 저장된 fixture 페이지 + 여러 페이지로 나뉜 합성 페이지"""
+    pages = list(saved_holdings_pages())
+    for page, html in enumerate(synthetic_holdings_pages(250), start=1):
+        pages.append((f"synthetic_SYN_L{page}", "SYN", html))
+    return pages
+
+HOLDINGS_PAGES = holdings_pages()
+
+def test_fixture_corpus_is_not_empty():
+    assert any(not name.startswith("synthetic") for name, _, _ in HOLDINGS_PAGES)
+
+@pytest.mark.parametrize("name, m_code, html", HOLDINGS_PAGES, ids=[name for name, _, _ in HOLDINGS_PAGES])
+def test_holdings_page_parity(name, m_code, html):
+    expected = _parse_holdings_html(html, m_code, DATAROMA_BASE_URL, backend="html.parser")
+    actual = _parse_holdings_html(html, m_code, DATAROMA_BASE_URL, backend="lxml")
+
+    assert expected["summary"] is not None
+    assert expected["details"]
+    assert actual["summary"] == expected["summary"]
+    assert actual["page_urls"] == expected["page_urls"]
+    assert len(actual["details"]) == len(expected["details"])
+    for row_num, (expected_row, actual_row) in enumerate(zip(expected["details"], actual["details"]), start=1):
+        assert actual_row == expected_row, f"details row {row_num}"
+
+@pytest.mark.parametrize("name, m_code, html", HOLDINGS_PAGES, ids=[name for name, _, _ in HOLDINGS_PAGES])
+def test_holdings_summary_parity(name, m_code, html):
+    expected = _parse_holdings_summary_html(html, backend="html.parser")
+    assert expected is not None
+    assert _parse_holdings_summary_html(html, backend="lxml") == expected
+    # 증분 크롤링의 요약 전용 파싱은 전체 파싱의 요약과 같아야 합니다.
+    assert _parse_holdings_html(html, m_code, DATAROMA_BASE_URL, backend="html.parser")["summary"] == expected
@@ -3,6 +3,7 @@ from typing import List, Optional
 import os
 import io
 from utils.logger_util import LoggerUtil
+from utils.http_util import HttpUtil
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -25,6 +26,7 @@ class ApiUtil:
             "Accept": "application/json"
         }
         self.logger = LoggerUtil().get_logger()
+        self.http = HttpUtil()
 
     def create_post(self, title: str, portfolio_idx: str, investor_code: str, writer: str):
         """게시글 생성 API 호출"""
@@ -38,7 +40,7 @@ class ApiUtil:
                 "investor_code": investor_code,
                 "writer": writer
             }
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = self.http.post(url, headers=self.headers, json=payload)
 
             # 응답 확인 및 한글 디코딩
             try:
@@ -0,0 +1,72 @@
+import json
+import os
+import threading
+from datetime import datetime
+from utils.logger_util import LoggerUtil
+
+class CrawlCheckpoint:
+    """투자자 단위 크롤링 진행 상황을 기록하는 append-only 체크포인트 (JSON Lines)
+
+    한 줄에 하나의 이벤트({"code", "status": "done"|"failed", "error", "at"})를 추가하고 바로 fsync하므로,
+    프로세스가 강제 종료되어도 완료된 투자자 목록은 유지됩니다. 같은 코드의 마지막 이벤트가 현재 상태입니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.logger = LoggerUtil().get_logger()
+        self._lock = threading.Lock()
+        self.completed = set()
+        self.failures = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_num, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # 강제 종료로 마지막 줄이 잘렸을 수 있으므로 무시합니다.
+                    self.logger.warning(f"체크포인트 {self.path}의 {line_num}번째 줄을 읽을 수 없어 건너뜁니다.")
+                    continue
+                self._apply(event)
+        self.logger.info(f"체크포인트 로드: 완료 {len(self.completed)}명, 실패 {len(self.failures)}명 ({self.path})")
+
+    def _apply(self, event):
+        code = event["code"]
+        if event["status"] == "done":
+            self.completed.add(code)
+            self.failures.pop(code, None)
+        else:
+            self.completed.discard(code)
+            self.failures[code] = event.get("error")
+
+    def _append(self, event):
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._apply(event)
+
+    def is_done(self, code):
+        return code in self.completed
+
+    def mark_done(self, code):
+        self._append({"code": code, "status": "done", "at": datetime.now().isoformat(timespec="seconds")})
+
+    def mark_failed(self, code, error):
+        self._append({"code": code, "status": "failed", "error": str(error), "at": datetime.now().isoformat(timespec="seconds")})
+
+    def reset(self):
+        """체크포인트 파일을 삭제하고 처음부터 다시 시작합니다."""
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self.completed.clear()
+            self.failures.clear()
@@ -0,0 +1,56 @@
+# 투자자별 최신 분기 보유 종목으로 만드는 종목 → 투자자 컨센서스 인덱스 SQL
+# - consensus_holding: 투자자마다 최신 분기의 보유 종목 행 (PK (ticker, investor_code)로 종목별 보유 투자자 조회)
+# - consensus_ticker: 종목별 보유 투자자 수 / 비중 합계·평균 / 보고 가치 합계 (보유 투자자 수 인덱스로 최다 보유 종목 조회)
+# 포트폴리오 저장 후 해당 투자자와 영향받은 종목만 다시 계산하며(db_manager.refresh_consensus_index),
+# 마이그레이션의 전체 초기화도 같은 SQL을 사용합니다.
+
+# {investor_filter}: 비우면 전체 투자자, "AND p.investor_code IN (...)"이면 해당 투자자만
+INSERT_CONSENSUS_HOLDINGS_SQL = """
+INSERT INTO consensus_holding (ticker, investor_code, p_idx, stk_name, portfolio_rate, shares, reported_value_amount)
+SELECT d.ticker, p.investor_code, p.idx, d.stk_name, d.portfolio_rate, d.shares, d.reported_value_amount
+FROM investor_portfolio p
+JOIN investor_portfolio_detail d ON d.p_idx = p.idx
+WHERE p.portfolio_date = (SELECT MAX(l.portfolio_date) FROM investor_portfolio l WHERE l.investor_code = p.investor_code)
+{investor_filter}
+"""
+
+# {ticker_filter}: 비우면 전체 종목, "WHERE ticker IN (...)"이면 해당 종목만
+INSERT_CONSENSUS_TICKERS_SQL = """
+INSERT INTO consensus_ticker (ticker, stk_name, holder_count, total_weight, avg_weight, total_reported_value)
+SELECT ticker, MAX(stk_name), COUNT(*), SUM(portfolio_rate), AVG(portfolio_rate), SUM(reported_value_amount)
+FROM consensus_holding
+{ticker_filter}
+GROUP BY ticker
+"""
+
+def _placeholders(values):
+    return ", ".join(["%s"] * len(values))
+
+def _tickers_held_by(cursor, investor_codes):
+    cursor.execute(f"SELECT DISTINCT ticker FROM consensus_holding WHERE investor_code IN ({_placeholders(investor_codes)})",
+                   investor_codes)
+    return {row['ticker'] for row in cursor.fetchall()}
+
+def rebuild_consensus_index(cursor):
+    """전체 투자자의 최신 분기로 컨센서스 인덱스를 다시 만들고 (보유 행 수, 종목 수)를 반환합니다."""
+    cursor.execute("DELETE FROM consensus_ticker")
+    cursor.execute("DELETE FROM consensus_holding")
+    cursor.execute(INSERT_CONSENSUS_HOLDINGS_SQL.format(investor_filter=""))
+    holdings = cursor.rowcount
+    cursor.execute(INSERT_CONSENSUS_TICKERS_SQL.format(ticker_filter=""))
+    return holdings, cursor.rowcount
+
+def refresh_investors(cursor, investor_codes):
+    """investor_codes의 보유 행을 최신 분기로 바꾸고, 이전/현재 보유 종목의 집계만 다시 계산합니다. 다시 계산한 종목 수를 반환합니다."""
+    investor_codes = list(investor_codes)
+    previous_tickers = _tickers_held_by(cursor, investor_codes)
+    cursor.execute(f"DELETE FROM consensus_holding WHERE investor_code IN ({_placeholders(investor_codes)})", investor_codes)
+    cursor.execute(INSERT_CONSENSUS_HOLDINGS_SQL.format(investor_filter=f"AND p.investor_code IN ({_placeholders(investor_codes)})"),
+                   investor_codes)
+    tickers = sorted(previous_tickers | _tickers_held_by(cursor, investor_codes))
+    if not tickers:
+        return 0
+
+    cursor.execute(f"DELETE FROM consensus_ticker WHERE ticker IN ({_placeholders(tickers)})", tickers)
+    cursor.execute(INSERT_CONSENSUS_TICKERS_SQL.format(ticker_filter=f"WHERE ticker IN ({_placeholders(tickers)})"), tickers)
+    return len(tickers)
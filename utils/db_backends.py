@@ -0,0 +1,390 @@
+import os
+import sqlite3
+import threading
+from datetime import date, datetime
+from pathlib import Path
+import pymysql
+from dotenv import load_dotenv
+from utils.logger_util import LoggerUtil
+from utils.db_migrations import apply_migrations
+
+# 로거 설정
+logger = LoggerUtil().get_logger()
+
+load_dotenv()
+
+ROOT_DIR = Path(os.path.dirname(os.path.abspath(__file__))).parent
+
+DB_BACKEND = os.getenv("DB_BACKEND", "mysql").lower()  # mysql | sqlite
+
+DB_HOST = os.getenv("DB_HOST")
+DB_USER = os.getenv("DB_USER")
+DB_PASSWORD = os.getenv("DB_PASSWORD")
+DB_NAME = os.getenv("DB_NAME")
+DB_PORT = int(os.getenv("DB_PORT", 3306))
+
+SQLITE_PATH = os.getenv("SQLITE_PATH", str(ROOT_DIR / "data" / "super_investor.db"))
+SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", 30))  # 다른 연결이 쓰기 락을 잡고 있을 때 기다리는 최대 시간(초)
+
+# 백엔드 구분 없이 잡아야 하는 DB 예외
+DB_ERRORS = (pymysql.MySQLError, sqlite3.Error)
+
+# SQLite에는 날짜 타입이 없으므로 ISO 문자열로 저장하고, DATE/TIMESTAMP로 선언된 컬럼은 pymysql과 같이 date/datetime으로 읽습니다.
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(sep=" "))
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()))
+sqlite3.register_converter("TIMESTAMP", lambda value: datetime.fromisoformat(value.decode()))
+
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+class SQLiteCursor:
+    """pymysql DictCursor와 같은 방식으로 사용할 수 있는 sqlite3 커서 래퍼
+
+    - %s 플레이스홀더를 ?로 바꿔 실행합니다 (SQL 본문에 % 리터럴을 쓰지 않습니다).
+    - 트랜잭션 밖에서 문장을 실행하면 BEGIN을 먼저 실행하여 pymysql(autocommit 끔)처럼 commit/rollback 전까지
+      하나의 트랜잭션으로 묶습니다. 덕분에 바깥 SAVEPOINT의 RELEASE가 커밋으로 동작하지 않습니다.
+    """
+
+    _NO_AUTO_BEGIN = ("BEGIN", "COMMIT", "END", "ROLLBACK", "PRAGMA")
+
+    def __init__(self, connection):
+        self._connection = connection
+        self._cursor = connection.raw.cursor()
+        self.rowcount = -1
+        self.lastrowid = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _prepare(self, sql):
+        if not self._connection.raw.in_transaction and not sql.lstrip().upper().startswith(self._NO_AUTO_BEGIN):
+            self._connection.raw.execute("BEGIN")
+        return sql.replace("%s", "?")
+
+    def execute(self, sql, args=None):
+        self._cursor.execute(self._prepare(sql), args or ())
+        self.rowcount = self._cursor.rowcount
+        self.lastrowid = self._cursor.lastrowid
+        return self.rowcount
+
+    def executemany(self, sql, args):
+        self._cursor.executemany(self._prepare(sql), args)
+        self.rowcount = self._cursor.rowcount
+        return self.rowcount
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def close(self):
+        self._cursor.close()
+
+class SQLiteConnection:
+    """pymysql 연결과 같은 인터페이스(cursor/commit/rollback/ping/close)를 제공하는 sqlite3 연결 래퍼"""
+
+    def __init__(self, path, busy_timeout=SQLITE_BUSY_TIMEOUT):
+        # isolation_level=None: sqlite3 모듈의 암묵적 트랜잭션 대신 SQLiteCursor가 BEGIN을 직접 관리합니다.
+        # check_same_thread=False: 커넥션 풀이 한 번에 한 스레드만 사용하도록 보장합니다.
+        self.raw = sqlite3.connect(path, timeout=busy_timeout, isolation_level=None, check_same_thread=False,
+                                   detect_types=sqlite3.PARSE_DECLTYPES)
+        self.raw.row_factory = _dict_row
+        self.raw.execute("PRAGMA journal_mode=WAL")  # 쓰는 동안에도 다른 연결(리포트 생성 등)이 읽을 수 있습니다.
+        self.raw.execute("PRAGMA synchronous=NORMAL")  # WAL 모드에서는 체크포인트 시에만 fsync합니다.
+        self.raw.execute("PRAGMA foreign_keys=ON")
+
+    def cursor(self):
+        return SQLiteCursor(self)
+
+    def commit(self):
+        if self.raw.in_transaction:
+            self.raw.execute("COMMIT")
+
+    def rollback(self):
+        if self.raw.in_transaction:
+            self.raw.execute("ROLLBACK")
+
+    def ping(self, reconnect=True):
+        self.raw.execute("SELECT 1")
+
+    def close(self):
+        self.raw.close()
+
+class StorageBackend:
+    """db_manager 함수들이 사용하는 저장소 백엔드 인터페이스
+
+    연결 생성, 스키마 마이그레이션, 그리고 DBMS마다 문법이 다른 SQL(상세/가격 스냅샷/읽기 모델 upsert, 임시 테이블 JOIN UPDATE,
+    평균 수익률 UPDATE, 현재 시각)을 제공합니다. 그 밖의 SQL은 db_manager에서 공통으로 사용합니다.
+    """
+    name = None
+    now_sql = "CURRENT_TIMESTAMP"
+
+    def connect(self):
+        raise NotImplementedError
+
+    def apply_migrations(self, conn):
+        return apply_migrations(conn, self.name)
+
+    def detail_unique_key_exists(self, conn):
+        """investor_portfolio_detail에 (p_idx, ticker) 유니크 키가 있으면 True (SQLite는 v1 DDL에 포함되어 있습니다)"""
+        return True
+
+    def upsert_detail_sql(self):
+        """investor_portfolio_detail INSERT (같은 (p_idx, ticker)가 있으면 갱신)"""
+        raise NotImplementedError
+
+    def create_price_staging_sql(self):
+        raise NotImplementedError
+
+    def drop_price_staging_sql(self):
+        raise NotImplementedError
+
+    def apply_price_staging_sql(self):
+        """tmp_portfolio_price의 가격을 investor_portfolio_detail에 반영하는 UPDATE"""
+        raise NotImplementedError
+
+    def avg_returns_sql(self, p_idxs):
+        """평균 수익률 UPDATE 문과 인자. p_idxs가 None이면 전체 포트폴리오가 대상입니다."""
+        raise NotImplementedError
+
+    def upsert_price_snapshot_sql(self):
+        """holding_price_snapshot INSERT (같은 날 같은 종목이 있으면 마지막 가격으로 갱신)"""
+        raise NotImplementedError
+
+    def upsert_read_model_sql(self):
+        """portfolio_read_model INSERT (같은 p_idx가 있으면 교체)"""
+        raise NotImplementedError
+
+    def describe(self):
+        raise NotImplementedError
+
+DETAIL_INSERT_COLUMNS = """
+    (p_idx, ticker, stk_name, portfolio_rate, recent_activity_type, recent_activity_value,
+    shares, reported_price, reported_value_amount, current_price, reported_price_rate, low_52_week, high_52_week)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+DETAIL_UPSERT_FIELDS = ("stk_name", "portfolio_rate", "recent_activity_type", "recent_activity_value", "shares",
+                        "reported_price", "reported_value_amount", "current_price", "reported_price_rate",
+                        "low_52_week", "high_52_week")
+
+PRICE_SNAPSHOT_INSERT_COLUMNS = """
+    (ticker, snapshot_date, current_price, low_52_week, high_52_week)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+PRICE_SNAPSHOT_UPSERT_FIELDS = ("current_price", "low_52_week", "high_52_week")
+
+READ_MODEL_INSERT_COLUMNS = """
+    (p_idx, source_updated_at, content_hash, payload_json, payload_gzip)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+READ_MODEL_UPSERT_FIELDS = ("source_updated_at", "content_hash", "payload_json", "payload_gzip")
+
+class MySQLBackend(StorageBackend):
+    name = "mysql"
+
+    def __init__(self, host=DB_HOST, user=DB_USER, password=DB_PASSWORD, db=DB_NAME, port=DB_PORT):
+        self.host = host
+        self.user = user
+        self.password = password
+        self.db = db
+        self.port = port
+
+    def connect(self):
+        """새 DB 연결을 생성합니다. 실패하면 pymysql.MySQLError를 발생시킵니다."""
+        return pymysql.connect(
+            host=self.host,
+            user=self.user,
+            password=self.password,
+            db=self.db,
+            port=self.port,
+            charset='utf8mb4',
+            cursorclass=pymysql.cursors.DictCursor
+        )
+
+    def detail_unique_key_exists(self, conn):
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT 1 FROM information_schema.STATISTICS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'investor_portfolio_detail'
+                  AND INDEX_NAME = 'uk_detail_p_idx_ticker'
+                LIMIT 1
+            """)
+            return cursor.fetchone() is not None
+
+    def upsert_detail_sql(self):
+        updates = ", ".join(f"{field} = VALUES({field})" for field in DETAIL_UPSERT_FIELDS)
+        return f"INSERT INTO investor_portfolio_detail {DETAIL_INSERT_COLUMNS} ON DUPLICATE KEY UPDATE {updates}"
+
+    def create_price_staging_sql(self):
+        # 세션 임시 테이블 (CREATE/DROP TEMPORARY는 암묵적 커밋을 일으키지 않습니다)
+        return """
+        CREATE TEMPORARY TABLE IF NOT EXISTS tmp_portfolio_price (
+            p_idx INT NOT NULL,
+            ticker VARCHAR(50) NOT NULL,
+            current_price DECIMAL(16,4),
+            reported_price_rate DECIMAL(8,4),
+            low_52_week DECIMAL(16,4),
+            high_52_week DECIMAL(16,4),
+            PRIMARY KEY (p_idx, ticker)
+        ) ENGINE=MEMORY
+        """
+
+    def drop_price_staging_sql(self):
+        return "DROP TEMPORARY TABLE IF EXISTS tmp_portfolio_price"
+
+    def apply_price_staging_sql(self):
+        return f"""
+        UPDATE investor_portfolio_detail d
+        JOIN tmp_portfolio_price t ON d.p_idx = t.p_idx AND d.ticker = t.ticker
+        SET d.current_price = t.current_price,
+            d.reported_price_rate = t.reported_price_rate,
+            d.low_52_week = t.low_52_week,
+            d.high_52_week = t.high_52_week,
+            d.record_updated_at = {self.now_sql}
+        """
+
+    def avg_returns_sql(self, p_idxs):
+        detail_filter = ""
+        meta_filter = ""
+        params = []
+        if p_idxs is not None:
+            placeholders = ", ".join(["%s"] * len(p_idxs))
+            detail_filter = f"AND p_idx IN ({placeholders})"
+            meta_filter = f"WHERE p.idx IN ({placeholders})"
+            params = list(p_idxs) + list(p_idxs)
+
+        sql = f"""
+        UPDATE investor_portfolio p
+        LEFT JOIN (
+            SELECT p_idx, SUM(portfolio_rate * reported_price_rate) / SUM(portfolio_rate) AS avg_return
+            FROM investor_portfolio_detail
+            WHERE portfolio_rate > 0 {detail_filter}
+            GROUP BY p_idx
+        ) r ON r.p_idx = p.idx
+        SET p.portfolio_avg_return = COALESCE(r.avg_return, 0),
+            p.record_updated_at = {self.now_sql}
+        {meta_filter}
+        """
+        return sql, params
+
+    def upsert_price_snapshot_sql(self):
+        updates = ", ".join(f"{field} = VALUES({field})" for field in PRICE_SNAPSHOT_UPSERT_FIELDS)
+        return f"INSERT INTO holding_price_snapshot {PRICE_SNAPSHOT_INSERT_COLUMNS} ON DUPLICATE KEY UPDATE {updates}"
+
+    def upsert_read_model_sql(self):
+        updates = ", ".join(f"{field} = VALUES({field})" for field in READ_MODEL_UPSERT_FIELDS)
+        return f"INSERT INTO portfolio_read_model {READ_MODEL_INSERT_COLUMNS} ON DUPLICATE KEY UPDATE {updates}"
+
+    def describe(self):
+        return f"mysql://{self.user}@{self.host}:{self.port}/{self.db}"
+
+class SQLiteBackend(StorageBackend):
+    """로컬 파일 하나에 저장하는 SQLite(WAL) 백엔드. SQLite 3.33 이상(UPDATE ... FROM)이 필요합니다."""
+    name = "sqlite"
+    now_sql = "datetime('now', 'localtime')"  # MySQL CURRENT_TIMESTAMP와 같은 로컬 시각
+
+    def __init__(self, path=SQLITE_PATH, busy_timeout=SQLITE_BUSY_TIMEOUT):
+        self.path = str(path)
+        self.busy_timeout = busy_timeout
+
+    def connect(self):
+        """새 DB 연결을 생성합니다. 실패하면 sqlite3.Error를 발생시킵니다."""
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        return SQLiteConnection(self.path, self.busy_timeout)
+
+    def upsert_detail_sql(self):
+        updates = ", ".join(f"{field} = excluded.{field}" for field in DETAIL_UPSERT_FIELDS)
+        return (f"INSERT INTO investor_portfolio_detail {DETAIL_INSERT_COLUMNS} "
+                f"ON CONFLICT (p_idx, ticker) DO UPDATE SET {updates}, record_updated_at = {self.now_sql}")
+
+    def create_price_staging_sql(self):
+        return """
+        CREATE TEMP TABLE IF NOT EXISTS tmp_portfolio_price (
+            p_idx INTEGER NOT NULL,
+            ticker TEXT NOT NULL,
+            current_price REAL,
+            reported_price_rate REAL,
+            low_52_week REAL,
+            high_52_week REAL,
+            PRIMARY KEY (p_idx, ticker)
+        )
+        """
+
+    def drop_price_staging_sql(self):
+        return "DROP TABLE IF EXISTS temp.tmp_portfolio_price"
+
+    def apply_price_staging_sql(self):
+        return f"""
+        UPDATE investor_portfolio_detail
+        SET current_price = t.current_price,
+            reported_price_rate = t.reported_price_rate,
+            low_52_week = t.low_52_week,
+            high_52_week = t.high_52_week,
+            record_updated_at = {self.now_sql}
+        FROM tmp_portfolio_price t
+        WHERE investor_portfolio_detail.p_idx = t.p_idx AND investor_portfolio_detail.ticker = t.ticker
+        """
+
+    def avg_returns_sql(self, p_idxs):
+        # SQLite UPDATE ... FROM은 내부 조인이므로, 비중 있는 종목이 없는 포트폴리오도 0으로 갱신하도록 상관 서브쿼리를 사용합니다.
+        meta_filter = ""
+        params = []
+        if p_idxs is not None:
+            meta_filter = f"WHERE idx IN ({', '.join(['%s'] * len(p_idxs))})"
+            params = list(p_idxs)
+
+        sql = f"""
+        UPDATE investor_portfolio
+        SET portfolio_avg_return = COALESCE((
+                SELECT SUM(d.portfolio_rate * d.reported_price_rate) / SUM(d.portfolio_rate)
+                FROM investor_portfolio_detail d
+                WHERE d.p_idx = investor_portfolio.idx AND d.portfolio_rate > 0
+            ), 0),
+            record_updated_at = {self.now_sql}
+        {meta_filter}
+        """
+        return sql, params
+
+    def upsert_price_snapshot_sql(self):
+        updates = ", ".join(f"{field} = excluded.{field}" for field in PRICE_SNAPSHOT_UPSERT_FIELDS)
+        return f"INSERT INTO holding_price_snapshot {PRICE_SNAPSHOT_INSERT_COLUMNS} ON CONFLICT (ticker, snapshot_date) DO UPDATE SET {updates}"
+
+    def upsert_read_model_sql(self):
+        updates = ", ".join(f"{field} = excluded.{field}" for field in READ_MODEL_UPSERT_FIELDS)
+        return (f"INSERT INTO portfolio_read_model {READ_MODEL_INSERT_COLUMNS} "
+                f"ON CONFLICT (p_idx) DO UPDATE SET {updates}, built_at = {self.now_sql}")
+
+    def describe(self):
+        return f"sqlite:///{self.path}"
+
+BACKENDS = {"mysql": MySQLBackend, "sqlite": SQLiteBackend}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def configure_backend(name=None, **options):
+    """프로세스 기본 저장소 백엔드를 설정하고 반환합니다. name이 없으면 DB_BACKEND 환경변수를 사용합니다.
+
+    이미 열린 커넥션 풀은 이전 백엔드의 연결을 가지고 있으므로, 바꾸기 전에 db_manager.close_pool()을 호출합니다.
+    """
+    global _backend
+    name = (name or DB_BACKEND).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown DB backend: {name} (expected one of {', '.join(BACKENDS)})")
+    with _backend_lock:
+        _backend = BACKENDS[name](**options)
+    logger.info(f"저장소 백엔드: {_backend.describe()}")
+    return _backend
+
+def get_backend():
+    """프로세스 기본 저장소 백엔드를 반환합니다 (처음 호출 시 DB_BACKEND 환경변수로 생성)."""
+    return _backend if _backend is not None else configure_backend()
@@ -1,7 +1,14 @@
-import pymysql
 import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import date
 from dotenv import load_dotenv
 from utils.logger_util import LoggerUtil
+from utils.db_backends import DB_ERRORS, DB_HOST, DB_USER, DB_NAME, DB_PORT, get_backend
+from utils.portfolio_diff import insert_quarter_diff
+from utils.consensus_index import refresh_investors
 
 # 로거 설정
 logger = LoggerUtil().get_logger()
@@ -9,109 +16,176 @@ logger = LoggerUtil().get_logger()
 # .env 파일에서 환경 변수 로드
 load_dotenv()
 
-DB_HOST = os.getenv("DB_HOST")
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-DB_NAME = os.getenv("DB_NAME")
-DB_PORT = int(os.getenv("DB_PORT", 3306))
+# 커넥션 풀 설정
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", 8))  # 동시에 열 수 있는 최대 연결 수
+DB_POOL_IDLE_TIMEOUT = float(os.getenv("DB_POOL_IDLE_TIMEOUT", 300))  # 이 시간(초) 이상 쉬고 있던 연결은 닫고 새로 엽니다
+DB_POOL_PING_INTERVAL = float(os.getenv("DB_POOL_PING_INTERVAL", 30))  # 이 시간(초) 이상 쉬었던 연결은 체크아웃 시 ping으로 확인합니다
+DB_POOL_CHECKOUT_TIMEOUT = float(os.getenv("DB_POOL_CHECKOUT_TIMEOUT", 30))  # 빈 연결을 기다리는 최대 시간(초)
+
+def _connect():
+    """설정된 저장소 백엔드(DB_BACKEND)로 새 DB 연결을 생성합니다. 실패하면 DB_ERRORS 중 하나를 발생시킵니다."""
+    return get_backend().connect()
 
 def get_db_connection():
     """DB 연결을 생성하고 반환합니다."""
     try:
-        conn = pymysql.connect(
-            host=DB_HOST,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            db=DB_NAME,
-            port=DB_PORT,
-            charset='utf8mb4',
-            cursorclass=pymysql.cursors.DictCursor
-        )
+        conn = _connect()
         logger.info("DB에 성공적으로 연결되었습니다.")
         return conn
-    except pymysql.MySQLError as e:
+    except DB_ERRORS as e:
         logger.error(f"DB 연결 오류: {e}")
         return None
 
-CREATE_INVESTOR_PORTFOLIO_TABLE = """
-CREATE TABLE IF NOT EXISTS investor_portfolio (
-    idx INT AUTO_INCREMENT PRIMARY KEY COMMENT '포트폴리오 메타 고유 ID (PK)',
-    investor_code VARCHAR(50) NOT NULL COMMENT '투자자 코드 (예: AKO)',
-    investor_name VARCHAR(255) NOT NULL COMMENT '투자자 이름 (예: AKO Capital)',
-    portfolio_date DATE NOT NULL COMMENT '포트폴리오 기준 날짜 (예: 2025-03-31)',
-    portfolio_period VARCHAR(20) COMMENT '포트폴리오 기준 분기 (예: Q1 2025)',
-    portfolio_value BIGINT COMMENT '총 포트폴리오 가치 (달러 단위)',
-    number_of_stocks INT COMMENT '보유 종목 수',
-    portfolio_avg_return DECIMAL(8,4) COMMENT '포트폴리오 평균 수익률 (%)',
-    record_created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '레코드 생성 시각',
-    record_updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '레코드 최종 수정 시각',
-    UNIQUE KEY uk_investor_date (investor_code, portfolio_date)
-) COMMENT = '투자자별 포트폴리오 메타 정보 테이블';
-"""
-
-CREATE_INVESTOR_PORTFOLIO_DETAIL_TABLE = """
-CREATE TABLE IF NOT EXISTS investor_portfolio_detail (
-    idx INT AUTO_INCREMENT PRIMARY KEY COMMENT '포트폴리오 상세 항목 고유 ID (PK)',
-    p_idx INT NOT NULL COMMENT '참조되는 포트폴리오 메타 ID (FK)',
-    ticker VARCHAR(50) NOT NULL COMMENT '종목 코드 (예: AAPL, MSFT)',
-    stk_name VARCHAR(255) NOT NULL COMMENT '회사명 (예: Apple Inc.)',
-    portfolio_rate DECIMAL(5,2) COMMENT '해당 종목이 차지하는 포트폴리오 내 비중 (%)',
-    recent_activity_type VARCHAR(20) COMMENT '최근 활동 유형 (예: buy, reduce, add, New, Sold Out)',
-    recent_activity_value DECIMAL(10,2) COMMENT '최근 활동 값(%) (예: 15, 2.86)',
-    shares BIGINT COMMENT '보유 주식 수량',
-    reported_price DECIMAL(16,4) COMMENT '보고된 평균 매입 단가',
-    reported_value_amount BIGINT COMMENT '보고된 종목 가치 (shares × price)',
-    current_price DECIMAL(16,4) COMMENT '현재 주가',
-    reported_price_rate DECIMAL(8,4) COMMENT '보고가 대비 현재 변화율 (%)',
-    low_52_week DECIMAL(16,4) COMMENT '52주 최저가',
-    high_52_week DECIMAL(16,4) COMMENT '52주 최고가',
-    record_created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '레코드 생성 시각',
-    record_updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '레코드 최종 수정 시각',
-    CONSTRAINT fk_detail_to_meta FOREIGN KEY (p_idx)
-        REFERENCES investor_portfolio (idx)
-        ON DELETE CASCADE ON UPDATE CASCADE
-) COMMENT = '포트폴리오 상세 종목 정보 테이블';
-"""
+class PoolTimeoutError(Exception):
+    """checkout_timeout 안에 사용할 수 있는 연결이 없을 때 발생합니다."""
 
-def create_tables_if_not_exists(conn):
-    """필요한 테이블이 없으면 생성합니다."""
-    with conn.cursor() as cursor:
+class ConnectionPool:
+    """스레드 간에 DB 연결(pymysql 또는 SQLite 래퍼)을 공유하는 크기 제한 커넥션 풀
+
+    - 한 연결은 한 번에 하나의 스레드만 사용합니다 (체크아웃 ~ 반납).
+    - 최대 max_size개까지 필요할 때 연결을 열고, 모두 사용 중이면 checkout_timeout까지 기다립니다.
+    - idle_timeout 이상 쉬고 있던 연결은 닫고, ping_interval 이상 쉬었던 연결은 ping(reconnect)으로 확인합니다.
+    - 반납 시 커밋되지 않은 트랜잭션은 롤백되므로 커밋은 사용하는 쪽에서 명시적으로 합니다.
+
+    사용법:
+        with pool.connection() as conn:
+            ...
+            conn.commit()
+    """
+
+    def __init__(self, max_size=DB_POOL_MAX_SIZE, idle_timeout=DB_POOL_IDLE_TIMEOUT,
+                 ping_interval=DB_POOL_PING_INTERVAL, checkout_timeout=DB_POOL_CHECKOUT_TIMEOUT, connect=_connect):
+        self.max_size = max(1, int(max_size))
+        self.idle_timeout = idle_timeout
+        self.ping_interval = ping_interval
+        self.checkout_timeout = checkout_timeout
+        self._connect = connect
+        self._idle = deque()  # (연결, 반납 시각) - 가장 최근에 반납된 연결부터 재사용
+        self._size = 0  # 열려 있는 전체 연결 수 (사용 중 + 대기)
+        self._condition = threading.Condition(threading.Lock())
+        self._closed = False
+
+    def _close_quietly(self, conn):
         try:
-            cursor.execute(CREATE_INVESTOR_PORTFOLIO_TABLE)
-            logger.info("'investor_portfolio' 테이블이 준비되었습니다.")
-            cursor.execute(CREATE_INVESTOR_PORTFOLIO_DETAIL_TABLE)
-            logger.info("'investor_portfolio_detail' 테이블이 준비되었습니다.")
-            
-            # 기존 테이블에 record_updated_at 컬럼이 없다면 추가
-            try:
-                cursor.execute("""
-                    ALTER TABLE investor_portfolio 
-                    ADD COLUMN record_updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '레코드 최종 수정 시각'
-                """)
-                logger.info("'investor_portfolio' 테이블에 record_updated_at 컬럼을 추가했습니다.")
-            except pymysql.MySQLError as e:
-                if "Duplicate column name" in str(e):
-                    logger.info("'investor_portfolio' 테이블의 record_updated_at 컬럼이 이미 존재합니다.")
-                else:
-                    raise e
-            
-            try:
-                cursor.execute("""
-                    ALTER TABLE investor_portfolio_detail 
-                    ADD COLUMN record_updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '레코드 최종 수정 시각'
-                """)
-                logger.info("'investor_portfolio_detail' 테이블에 record_updated_at 컬럼을 추가했습니다.")
-            except pymysql.MySQLError as e:
-                if "Duplicate column name" in str(e):
-                    logger.info("'investor_portfolio_detail' 테이블의 record_updated_at 컬럼이 이미 존재합니다.")
+            conn.close()
+        except Exception:
+            pass
+
+    def _discard(self, conn):
+        self._close_quietly(conn)
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    def acquire(self, timeout=None):
+        """사용 가능한 연결을 반환합니다. 연결 생성에 실패하면 DB_ERRORS 중 하나가 발생합니다."""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            conn = None
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed.")
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(f"No DB connection available within {timeout:.1f}s (max_size={self.max_size}).")
+                    self._condition.wait(remaining)
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
                 else:
-                    raise e
-            
-            conn.commit()
-        except pymysql.MySQLError as e:
-            logger.error(f"테이블 생성 오류: {e}")
+                    self._size += 1
+
+            if conn is None:
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+
+            idle_seconds = time.monotonic() - returned_at
+            if idle_seconds > self.idle_timeout:
+                self._discard(conn)
+                continue
+            if idle_seconds > self.ping_interval:
+                try:
+                    conn.ping(reconnect=True)
+                except DB_ERRORS as e:
+                    logger.warning(f"유휴 DB 연결 확인 실패, 연결을 폐기합니다: {e}")
+                    self._discard(conn)
+                    continue
+            return conn
+
+    def release(self, conn):
+        """연결을 풀에 반납합니다. 커밋되지 않은 작업은 롤백하고, 롤백할 수 없는 연결은 폐기합니다."""
+        try:
             conn.rollback()
-            raise
+        except Exception:
+            self._discard(conn)
+            return
+        with self._condition:
+            if self._closed:
+                self._size -= 1
+                self._close_quietly(conn)
+                return
+            self._idle.append((conn, time.monotonic()))
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """연결을 체크아웃하여 with 블록 동안 사용하고 반납합니다."""
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """대기 중인 연결을 모두 닫습니다. 사용 중인 연결은 반납될 때 닫힙니다."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._size -= len(idle)
+            self._condition.notify_all()
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    def stats(self):
+        with self._condition:
+            return {"size": self._size, "idle": len(self._idle), "in_use": self._size - len(self._idle), "max_size": self.max_size}
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """프로세스 공용 커넥션 풀을 반환합니다 (처음 호출 시 생성)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool._closed:
+            _pool = ConnectionPool()
+        return _pool
+
+def close_pool():
+    """프로세스 공용 커넥션 풀의 연결을 모두 닫습니다."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+def create_tables_if_not_exists(conn):
+    """스키마 마이그레이션을 적용하고 상세 테이블의 (p_idx, ticker) 유니크 키를 확인합니다.
+
+    상세 upsert(ON DUPLICATE KEY UPDATE)와 bulk_update_portfolio_prices의 JOIN UPDATE/갱신 건수는 이 키를 전제로 하므로,
+    키가 없으면 중복 행을 계속 쌓는 대신 RuntimeError로 시작을 중단합니다.
+    """
+    backend = get_backend()
+    backend.apply_migrations(conn)
+    if not backend.detail_unique_key_exists(conn):
+        raise RuntimeError("investor_portfolio_detail에 (p_idx, ticker) 유니크 키(uk_detail_p_idx_ticker)가 없습니다. "
+                           "스키마 마이그레이션 로그를 확인해 주세요.")
 
 def check_portfolio_exists(conn, investor_code, portfolio_date):
     """주어진 investor_code와 portfolio_date 데이터가 이미 investor_portfolio 테이블에 존재하는지 확인하고 p_idx를 반환합니다."""
@@ -121,6 +195,22 @@ def check_portfolio_exists(conn, investor_code, portfolio_date):
         result = cursor.fetchone()
         return result['idx'] if result else None
 
+def get_portfolio_index(conn):
+    """저장된 모든 포트폴리오의 (investor_code, portfolio_date) 인덱스를 한 번의 쿼리로 조회합니다.
+
+    반환값: {(대문자 investor_code, 'YYYY-MM-DD'): {'idx': p_idx, 'record_updated_at': datetime}}
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT idx, investor_code, portfolio_date, record_updated_at FROM investor_portfolio")
+        rows = cursor.fetchall()
+
+    portfolio_index = {}
+    for row in rows:
+        key = (row['investor_code'].upper(), row['portfolio_date'].strftime('%Y-%m-%d'))
+        portfolio_index[key] = {'idx': row['idx'], 'record_updated_at': row['record_updated_at']}
+    logger.info(f"포트폴리오 인덱스 {len(portfolio_index)}건을 조회했습니다.")
+    return portfolio_index
+
 def insert_investor_portfolio(conn, investor_code, investor_name, portfolio_date, portfolio_period, portfolio_value, number_of_stocks):
     """investor_portfolio 테이블에 데이터를 삽입하고, 생성된 p_idx를 반환합니다."""
     with conn.cursor() as cursor:
@@ -139,189 +229,315 @@ def insert_investor_portfolio(conn, investor_code, investor_name, portfolio_date
         except ValueError as ve:
             logger.error(f"Data type error for investor_portfolio insert: {ve} (inv_code: {investor_code})")
             raise
-        except pymysql.MySQLError as e:
+        except DB_ERRORS as e:
             logger.error(f"investor_portfolio 삽입 오류: {e} (inv_code: {investor_code})")
             raise
 
+def bulk_update_portfolio_prices(conn, price_rows):
+    """가격 갱신 행을 임시 테이블에 한 번에 적재한 뒤, 하나의 JOIN UPDATE로 상세 테이블에 반영합니다.
+
+    price_rows: (p_idx, ticker, current_price, reported_price_rate, low_52_week, high_52_week) 튜플 목록.
+    여러 포트폴리오의 행을 함께 넘길 수 있으며, 같은 (p_idx, ticker)가 여러 번 있으면 마지막 행을 사용합니다.
+    반환값: {'staged': 적재 행 수, 'updated': 갱신된 행 수, 'not_matched': 상세 테이블에 없는 행 수}
+    """
+    staged_rows = list({(row[0], row[1]): row for row in price_rows if row[1]}.values())
+    if not staged_rows:
+        return {'staged': 0, 'updated': 0, 'not_matched': 0}
+
+    backend = get_backend()
+    with conn.cursor() as cursor:
+        # 가격 갱신 행을 모아 두는 세션 임시 테이블
+        cursor.execute(backend.create_price_staging_sql())
+        cursor.execute("DELETE FROM tmp_portfolio_price")
+        # pymysql은 INSERT ... VALUES executemany를 multi-row INSERT로 묶어서 전송하고, SQLite는 준비된 문장을 재사용합니다.
+        cursor.executemany("""
+            INSERT INTO tmp_portfolio_price
+            (p_idx, ticker, current_price, reported_price_rate, low_52_week, high_52_week)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, staged_rows)
+
+        cursor.execute("""
+            SELECT COUNT(*) AS not_matched
+            FROM tmp_portfolio_price t
+            LEFT JOIN investor_portfolio_detail d ON d.p_idx = t.p_idx AND d.ticker = t.ticker
+            WHERE d.idx IS NULL
+        """)
+        not_matched = cursor.fetchone()['not_matched']
+
+        cursor.execute(backend.apply_price_staging_sql())
+        updated = cursor.rowcount
+
+        cursor.execute(backend.drop_price_staging_sql())
+
+    return {'staged': len(staged_rows), 'updated': updated, 'not_matched': not_matched}
+
+def record_price_snapshots(conn, details, snapshot_date=None):
+    """보유 종목의 현재가/52주 범위를 holding_price_snapshot에 (ticker, snapshot_date) 단위로 추가합니다.
+
+    details는 Holding 레코드 목록이며 여러 포트폴리오의 행을 함께 넘길 수 있습니다. 같은 종목은 하루에 한 행만
+    저장되고(여러 투자자가 보유해도 한 번), 같은 날 다시 수집하면 마지막 가격으로 갱신됩니다. 적재한 종목 수를 반환합니다.
+    """
+    snapshot_date = snapshot_date or date.today()
+    snapshot_rows = list({
+        detail.ticker: detail.snapshot_row(snapshot_date)
+        for detail in details if detail.ticker and detail.current_price is not None
+    }.values())
+    if not snapshot_rows:
+        return 0
+
+    with conn.cursor() as cursor:
+        try:
+            cursor.executemany(get_backend().upsert_price_snapshot_sql(), snapshot_rows)
+        except DB_ERRORS as e:
+            logger.error(f"holding_price_snapshot 적재 오류 ({len(snapshot_rows)}개 종목): {e}")
+            raise
+    return len(snapshot_rows)
+
+def get_price_history(conn, ticker, start_date=None, end_date=None):
+    """종목 하나의 일별 가격 스냅샷을 날짜순으로 반환합니다 (PK (ticker, snapshot_date) 범위 조회).
+
+    반환값: [{'snapshot_date', 'current_price', 'low_52_week', 'high_52_week'}, ...]
+    """
+    sql = """
+        SELECT snapshot_date, current_price, low_52_week, high_52_week
+        FROM holding_price_snapshot
+        WHERE ticker = %s
+    """
+    params = [ticker]
+    if start_date:
+        sql += " AND snapshot_date >= %s"
+        params.append(start_date)
+    if end_date:
+        sql += " AND snapshot_date <= %s"
+        params.append(end_date)
+    sql += " ORDER BY snapshot_date"
+
+    with conn.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+def get_portfolio_price_history(conn, p_idx, start_date=None, end_date=None):
+    """포트폴리오 보유 종목들의 일별 가격 스냅샷을 종목/날짜순으로 반환합니다.
+
+    보고가 대비 변화율(reported_price_rate)은 스냅샷 가격과 상세 행의 reported_price로 계산합니다.
+    반환값: [{'ticker', 'snapshot_date', 'current_price', 'reported_price_rate', 'low_52_week', 'high_52_week'}, ...]
+    """
+    sql = """
+        SELECT d.ticker, s.snapshot_date, s.current_price,
+               (s.current_price / NULLIF(d.reported_price, 0) - 1) * 100 AS reported_price_rate,
+               s.low_52_week, s.high_52_week
+        FROM investor_portfolio_detail d
+        JOIN holding_price_snapshot s ON s.ticker = d.ticker
+        WHERE d.p_idx = %s
+    """
+    params = [p_idx]
+    if start_date:
+        sql += " AND s.snapshot_date >= %s"
+        params.append(start_date)
+    if end_date:
+        sql += " AND s.snapshot_date <= %s"
+        params.append(end_date)
+    sql += " ORDER BY d.ticker, s.snapshot_date"
+
+    with conn.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+def refresh_quarter_diffs(conn, p_idx):
+    """p_idx 분기와 같은 투자자의 직전 분기 사이의 보유 종목 변화를 portfolio_quarter_diff에 다시 계산합니다.
+
+    과거 분기가 뒤늦게 저장된 경우를 위해, 바로 다음 분기가 이미 있으면 그 분기의 변화도 p_idx 기준으로 다시 계산합니다.
+    다른 분기는 건드리지 않으며, 적재한 변화 행 수를 반환합니다.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT investor_code, portfolio_date FROM investor_portfolio WHERE idx = %s", (p_idx,))
+        meta = cursor.fetchone()
+        if not meta:
+            return 0
+
+        cursor.execute("""
+            SELECT idx FROM investor_portfolio
+            WHERE investor_code = %s AND portfolio_date < %s
+            ORDER BY portfolio_date DESC LIMIT 1
+        """, (meta['investor_code'], meta['portfolio_date']))
+        prev_row = cursor.fetchone()
+        cursor.execute("""
+            SELECT idx FROM investor_portfolio
+            WHERE investor_code = %s AND portfolio_date > %s
+            ORDER BY portfolio_date ASC LIMIT 1
+        """, (meta['investor_code'], meta['portfolio_date']))
+        next_row = cursor.fetchone()
+
+        pairs = []
+        if prev_row:
+            pairs.append((p_idx, prev_row['idx']))
+        if next_row:
+            pairs.append((next_row['idx'], p_idx))
+
+        targets = [p_idx] + ([next_row['idx']] if next_row else [])
+        cursor.execute(f"DELETE FROM portfolio_quarter_diff WHERE p_idx IN ({', '.join(['%s'] * len(targets))})", targets)
+        try:
+            rows = sum(insert_quarter_diff(cursor, current, prev) for current, prev in pairs)
+        except DB_ERRORS as e:
+            logger.error(f"분기 간 변화 계산 오류 (p_idx: {p_idx}): {e}")
+            raise
+    logger.info(f"분기 간 변화 {rows}건을 계산했습니다 (p_idx: {p_idx}, 직전 분기: {prev_row['idx'] if prev_row else '없음'}).")
+    return rows
+
+def get_quarter_diff(conn, p_idx, change_types=None):
+    """p_idx 분기의 직전 분기 대비 변화 목록을 반환합니다. change_types로 유형(new, exit 등)을 거를 수 있습니다.
+
+    반환값: [{'ticker', 'stk_name', 'change_type', 'prev_shares', 'shares', 'share_delta', 'prev_weight', 'weight', 'weight_delta'}, ...]
+    """
+    sql = """
+        SELECT q.ticker, COALESCE(cur.stk_name, prev.stk_name) AS stk_name, q.change_type,
+               q.prev_shares, q.shares, q.share_delta, q.prev_weight, q.weight, q.weight_delta
+        FROM portfolio_quarter_diff q
+        LEFT JOIN investor_portfolio_detail cur ON cur.p_idx = q.p_idx AND cur.ticker = q.ticker
+        LEFT JOIN investor_portfolio_detail prev ON prev.p_idx = q.prev_p_idx AND prev.ticker = q.ticker
+        WHERE q.p_idx = %s
+    """
+    params = [p_idx]
+    if change_types:
+        sql += f" AND q.change_type IN ({', '.join(['%s'] * len(change_types))})"
+        params.extend(change_types)
+    sql += " ORDER BY ABS(q.weight_delta) DESC, q.ticker"
+
+    with conn.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+def refresh_consensus_index(conn, investor_codes):
+    """투자자들의 최신 분기 보유 종목으로 컨센서스 인덱스(consensus_holding / consensus_ticker)를 갱신합니다.
+
+    해당 투자자의 보유 행과, 이전 또는 현재 보유 종목의 집계만 다시 계산합니다. 다시 계산한 종목 수를 반환합니다.
+    """
+    investor_codes = sorted({code.upper() for code in investor_codes if code})
+    if not investor_codes:
+        return 0
+
+    with conn.cursor() as cursor:
+        try:
+            tickers = refresh_investors(cursor, investor_codes)
+        except DB_ERRORS as e:
+            logger.error(f"컨센서스 인덱스 갱신 오류 (투자자: {', '.join(investor_codes)}): {e}")
+            raise
+    logger.info(f"컨센서스 인덱스 갱신 완료 (투자자 {len(investor_codes)}명, 종목 {tickers}개).")
+    return tickers
+
+def get_ticker_consensus(conn, ticker):
+    """종목의 컨센서스 집계와 보유 투자자 목록(비중 큰 순)을 반환합니다. 보유 투자자가 없으면 None.
+
+    반환값: {'ticker', 'stk_name', 'holder_count', 'total_weight', 'avg_weight', 'total_reported_value',
+             'holders': [{'investor_code', 'investor_name', 'p_idx', 'portfolio_date', 'portfolio_rate', 'shares', 'reported_value_amount'}, ...]}
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT ticker, stk_name, holder_count, total_weight, avg_weight, total_reported_value
+            FROM consensus_ticker WHERE ticker = %s
+        """, (ticker,))
+        consensus = cursor.fetchone()
+        if not consensus:
+            return None
+        cursor.execute("""
+            SELECT h.investor_code, p.investor_name, h.p_idx, p.portfolio_date,
+                   h.portfolio_rate, h.shares, h.reported_value_amount
+            FROM consensus_holding h
+            JOIN investor_portfolio p ON p.idx = h.p_idx
+            WHERE h.ticker = %s
+            ORDER BY h.portfolio_rate DESC
+        """, (ticker,))
+        consensus['holders'] = cursor.fetchall()
+    return consensus
+
+def get_most_held_tickers(conn, limit=20):
+    """최신 분기 기준 보유 투자자가 많은 종목 순으로 컨센서스 집계를 반환합니다 (같으면 보고 가치 합계 순)."""
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT ticker, stk_name, holder_count, total_weight, avg_weight, total_reported_value
+            FROM consensus_ticker
+            ORDER BY holder_count DESC, total_reported_value DESC
+            LIMIT %s
+        """, (limit,))
+        return cursor.fetchall()
+
 def update_portfolio_details(conn, p_idx, details):
-    """기존 포트폴리오 상세 정보의 current_price, reported_price_rate, low_52_week, high_52_week 값을 업데이트합니다."""
+    """기존 포트폴리오 상세 정보의 current_price, reported_price_rate, low_52_week, high_52_week 값을 일괄 업데이트합니다.
+
+    상세 행에는 최신 가격만 유지하고, 수집한 가격은 holding_price_snapshot에 일별 이력으로 추가합니다.
+    details는 crawler가 반환한 Holding 레코드 목록이며, 갱신/미일치 행 수를 dict로 반환합니다.
+    """
     if not details:
         logger.info(f"No details to update for p_idx: {p_idx}")
-        return
+        return {'staged': 0, 'updated': 0, 'not_matched': 0}
 
-    with conn.cursor() as cursor:
-        updated_count = 0
-        
-        for detail in details:
-            try:
-                ticker = detail.get('ticker')
-                if not ticker:
-                    continue
-                    
-                # 해당 ticker의 현재 가격 정보 업데이트
-                update_sql = """
-                UPDATE investor_portfolio_detail 
-                SET current_price = %s, 
-                    reported_price_rate = %s, 
-                    low_52_week = %s, 
-                    high_52_week = %s,
-                    record_updated_at = CURRENT_TIMESTAMP
-                WHERE p_idx = %s AND ticker = %s
-                """
-                
-                cursor.execute(update_sql, (
-                    detail.get('current_price'),
-                    detail.get('reported_price_rate'),
-                    detail.get('low_52_week'),
-                    detail.get('high_52_week'),
-                    p_idx,
-                    ticker
-                ))
-                
-                if cursor.rowcount > 0:
-                    updated_count += 1
-                    
-            except Exception as e:
-                logger.error(f"포트폴리오 상세 정보 업데이트 오류 (p_idx: {p_idx}, ticker: {ticker}): {e}")
-                continue
-        
-        logger.info(f"{updated_count}개의 포트폴리오 상세 정보가 업데이트되었습니다 (p_idx: {p_idx}).")
+    result = bulk_update_portfolio_prices(conn, [detail.price_row(p_idx) for detail in details])
+    record_price_snapshots(conn, details)
+    logger.info(f"{result['updated']}개의 포트폴리오 상세 정보가 업데이트되었습니다 "
+                f"(p_idx: {p_idx}, 적재 {result['staged']}개, 미일치 {result['not_matched']}개).")
+    if result['not_matched']:
+        logger.warning(f"저장된 상세 정보에 없는 종목 {result['not_matched']}개는 갱신되지 않았습니다 (p_idx: {p_idx}).")
+    return result
 
-def calculate_and_update_portfolio_avg_return(conn, p_idx):
-    """포트폴리오의 평균 수익률을 재계산하고 업데이트합니다."""
+def update_portfolio_avg_returns(conn, p_idxs=None):
+    """포트폴리오 가중 평균 수익률 SUM(비중 × 수익률) ÷ SUM(비중)을 하나의 UPDATE 문으로 DB에서 계산하여 저장합니다.
+
+    p_idxs가 주어지면 해당 포트폴리오들만, None이면 저장된 모든 포트폴리오를 한 번에 갱신합니다.
+    비중이 있는 종목이 없는 포트폴리오의 평균 수익률은 0이 됩니다. 갱신된 포트폴리오 수를 반환합니다.
+    """
+    if p_idxs is not None:
+        p_idxs = sorted(set(p_idxs))
+        if not p_idxs:
+            return 0
+
+    sql, params = get_backend().avg_returns_sql(p_idxs)
     with conn.cursor() as cursor:
         try:
-            # 해당 포트폴리오의 모든 상세 정보 조회
-            select_sql = """
-            SELECT portfolio_rate, reported_price_rate 
-            FROM investor_portfolio_detail 
-            WHERE p_idx = %s AND portfolio_rate > 0
-            """
-            cursor.execute(select_sql, (p_idx,))
-            details = cursor.fetchall()
-            
-            if not details:
-                logger.warning(f"포트폴리오 상세 정보가 없습니다 (p_idx: {p_idx})")
-                return
-            
-            # 가중 평균 수익률 계산
-            total_weighted_return = 0
-            total_weight = 0
-            
-            for detail in details:
-                portfolio_rate = float(detail['portfolio_rate'])
-                reported_price_rate = float(detail['reported_price_rate'])
-                
-                total_weighted_return += portfolio_rate * reported_price_rate
-                total_weight += portfolio_rate
-            
-            avg_return = 0
-            if total_weight > 0:
-                avg_return = total_weighted_return / total_weight
-                logger.info(f"가중 평균 수익률 재계산: 총 가중 수익률({total_weighted_return:.4f}) ÷ 총 비중({total_weight:.2f}) = {avg_return:.4f}%")
-            
-            # 포트폴리오 메타 테이블 업데이트
-            update_sql = """
-            UPDATE investor_portfolio 
-            SET portfolio_avg_return = %s,
-                record_updated_at = CURRENT_TIMESTAMP
-            WHERE idx = %s
-            """
-            cursor.execute(update_sql, (avg_return, p_idx))
-            
-            logger.info(f"포트폴리오 평균 수익률이 {avg_return:.4f}%로 업데이트되었습니다 (p_idx: {p_idx}, 종목 수: {len(details)}).")
-            
-        except Exception as e:
-            logger.error(f"포트폴리오 평균 수익률 계산 오류 (p_idx: {p_idx}): {e}")
+            cursor.execute(sql, params or None)
+            updated = cursor.rowcount
+            target = f"{len(p_idxs)}개" if p_idxs is not None else "전체"
+            logger.info(f"포트폴리오 평균 수익률 갱신 완료 (대상: {target}, 갱신: {updated}개).")
+            return updated
+        except DB_ERRORS as e:
+            logger.error(f"포트폴리오 평균 수익률 계산 오류 (p_idx: {p_idxs if p_idxs is not None else '전체'}): {e}")
             raise
 
+def calculate_and_update_portfolio_avg_return(conn, p_idx):
+    """포트폴리오 하나의 평균 수익률을 재계산하고 업데이트합니다."""
+    update_portfolio_avg_returns(conn, [p_idx])
+
 def insert_portfolio_details(conn, p_idx, details):
-    """investor_portfolio_detail 테이블에 여러 상세 데이터를 삽입합니다."""
+    """investor_portfolio_detail 테이블에 여러 상세 데이터(Holding 레코드 목록)를 삽입합니다.
+
+    가격 스냅샷 추가, 직전 분기 대비 변화(portfolio_quarter_diff) 계산, 평균 수익률 갱신까지 같은 트랜잭션에서 수행합니다.
+    """
     if not details: # 상세 정보가 없으면 아무것도 안함
         logger.info(f"No details to insert for p_idx: {p_idx}")
         return
 
     with conn.cursor() as cursor:
-        sql = """
-        INSERT INTO investor_portfolio_detail
-        (p_idx, ticker, stk_name, portfolio_rate, recent_activity_type, recent_activity_value, 
-        shares, reported_price, reported_value_amount, current_price, reported_price_rate, low_52_week, high_52_week)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        values_to_insert = []
-        
-        # 포트폴리오 평균 수익률 계산을 위한 변수
-        total_weighted_return = 0
-        total_weight = 0
-        valid_items_count = 0
-        
-        for detail in details:
-            try:
-                # 종목 비중과 수익률 추출
-                portfolio_rate = float(detail.get('portfolio_rate', 0))
-                reported_price_rate = float(detail.get('reported_price_rate', 0))
-                
-                # 가중 수익률 계산 (비중 * 수익률)
-                if portfolio_rate > 0:
-                    total_weighted_return += portfolio_rate * reported_price_rate
-                    total_weight += portfolio_rate
-                    valid_items_count += 1
-                
-                values_to_insert.append((
-                    p_idx,
-                    detail.get('ticker'),
-                    detail.get('name'), # crawler에서 'name' 키로 회사명 반환 가정
-                    portfolio_rate,
-                    detail.get('recent_activity_type'),
-                    detail.get('recent_activity_value'),
-                    detail.get('shares'),
-                    detail.get('reported_price'),
-                    detail.get('reported_value_amount'),
-                    detail.get('current_price'),
-                    reported_price_rate,
-                    detail.get('low_52_week'),
-                    detail.get('high_52_week')
-                ))
-            except KeyError as ke:
-                logger.error(f"Missing key in detail item for p_idx {p_idx}: {ke}. Item: {detail}")
-                # 선택: 이 아이템을 건너뛰거나, None으로 채우거나, 오류를 발생시킬 수 있음
-                continue # 일단 건너뛰기
+        sql = get_backend().upsert_detail_sql()
+        # Holding 필드 순서가 INSERT 컬럼 순서와 같으므로 레코드를 그대로 튜플로 사용합니다.
+        values_to_insert = [detail.insert_row(p_idx) for detail in details]
         
-        if not values_to_insert: # 유효한 데이터가 하나도 없으면
-            logger.warning(f"No valid detail items to insert for p_idx: {p_idx} after filtering.")
-            return
-
         try:
             cursor.executemany(sql, values_to_insert)
-            
-            # 포트폴리오 평균 수익률 계산 및 업데이트
-            avg_return = 0
-            if total_weight > 0:
-                # 가중 평균 수익률 계산: (비중1 × 수익률1 + 비중2 × 수익률2 + ...) ÷ 총 비중
-                avg_return = total_weighted_return / total_weight
-                logger.info(f"가중 평균 수익률 계산: 총 가중 수익률({total_weighted_return:.4f}) ÷ 총 비중({total_weight:.2f}) = {avg_return:.4f}%")
-            
-            # 포트폴리오 메타 테이블 업데이트
-            update_sql = """
-            UPDATE investor_portfolio 
-            SET portfolio_avg_return = %s,
-                record_updated_at = CURRENT_TIMESTAMP
-            WHERE idx = %s
-            """
-            cursor.execute(update_sql, (avg_return, p_idx))
-            
             logger.info(f"{len(values_to_insert)}개의 포트폴리오 상세 정보가 성공적으로 준비되었습니다 (p_idx: {p_idx}).")
-            logger.info(f"포트폴리오 평균 수익률 {avg_return:.4f}%로 업데이트 되었습니다 (p_idx: {p_idx}, 유효 종목 수: {valid_items_count}).")
-        except pymysql.MySQLError as e:
+        except DB_ERRORS as e:
             logger.error(f"portfolio_details 삽입 오류 (p_idx: {p_idx}): {e}")
             raise
 
+    record_price_snapshots(conn, details)
+    refresh_quarter_diffs(conn, p_idx)
+    update_portfolio_avg_returns(conn, [p_idx])
+
 # 이 파일이 직접 실행될 때 테이블 생성 로직을 실행 (테스트용)
 if __name__ == '__main__':
     db_conn = get_db_connection()
     if db_conn:
         try:
             # 모듈 테스트
+            print(f"저장소 백엔드: {get_backend().describe()}")
             print("DB 환경변수:")
             print(f"- DB_HOST: {DB_HOST}")
             print(f"- DB_PORT: {DB_PORT}")
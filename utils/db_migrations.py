@@ -0,0 +1,488 @@
+import sqlite3
+import pymysql
+from utils.logger_util import LoggerUtil
+from utils.portfolio_diff import insert_all_quarter_diffs
+from utils.consensus_index import rebuild_consensus_index
+
+# 로거 설정
+logger = LoggerUtil().get_logger()
+
+SCHEMA_LOCK_NAME = "super_investor_report_schema"  # 동시에 시작한 프로세스가 같은 마이그레이션을 중복 적용하지 않도록 잡는 락
+SCHEMA_LOCK_TIMEOUT = 60  # 초
+
+CREATE_SCHEMA_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INT PRIMARY KEY COMMENT '적용된 마이그레이션 버전',
+    description VARCHAR(255) NOT NULL COMMENT '마이그레이션 설명',
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '적용 시각'
+) COMMENT = '스키마 마이그레이션 이력 테이블';
+"""
+
+CREATE_INVESTOR_PORTFOLIO_TABLE = """
+CREATE TABLE IF NOT EXISTS investor_portfolio (
+    idx INT AUTO_INCREMENT PRIMARY KEY COMMENT '포트폴리오 메타 고유 ID (PK)',
+    investor_code VARCHAR(50) NOT NULL COMMENT '투자자 코드 (예: AKO)',
+    investor_name VARCHAR(255) NOT NULL COMMENT '투자자 이름 (예: AKO Capital)',
+    portfolio_date DATE NOT NULL COMMENT '포트폴리오 기준 날짜 (예: 2025-03-31)',
+    portfolio_period VARCHAR(20) COMMENT '포트폴리오 기준 분기 (예: Q1 2025)',
+    portfolio_value BIGINT COMMENT '총 포트폴리오 가치 (달러 단위)',
+    number_of_stocks INT COMMENT '보유 종목 수',
+    portfolio_avg_return DECIMAL(8,4) COMMENT '포트폴리오 평균 수익률 (%)',
+    record_created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '레코드 생성 시각',
+    record_updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '레코드 최종 수정 시각',
+    UNIQUE KEY uk_investor_date (investor_code, portfolio_date)
+) COMMENT = '투자자별 포트폴리오 메타 정보 테이블';
+"""
+
+CREATE_INVESTOR_PORTFOLIO_DETAIL_TABLE = """
+CREATE TABLE IF NOT EXISTS investor_portfolio_detail (
+    idx INT AUTO_INCREMENT PRIMARY KEY COMMENT '포트폴리오 상세 항목 고유 ID (PK)',
+    p_idx INT NOT NULL COMMENT '참조되는 포트폴리오 메타 ID (FK)',
+    ticker VARCHAR(50) NOT NULL COMMENT '종목 코드 (예: AAPL, MSFT)',
+    stk_name VARCHAR(255) NOT NULL COMMENT '회사명 (예: Apple Inc.)',
+    portfolio_rate DECIMAL(5,2) COMMENT '해당 종목이 차지하는 포트폴리오 내 비중 (%)',
+    recent_activity_type VARCHAR(20) COMMENT '최근 활동 유형 (예: buy, reduce, add, New, Sold Out)',
+    recent_activity_value DECIMAL(10,2) COMMENT '최근 활동 값(%) (예: 15, 2.86)',
+    shares BIGINT COMMENT '보유 주식 수량',
+    reported_price DECIMAL(16,4) COMMENT '보고된 평균 매입 단가',
+    reported_value_amount BIGINT COMMENT '보고된 종목 가치 (shares × price)',
+    current_price DECIMAL(16,4) COMMENT '현재 주가',
+    reported_price_rate DECIMAL(8,4) COMMENT '보고가 대비 현재 변화율 (%)',
+    low_52_week DECIMAL(16,4) COMMENT '52주 최저가',
+    high_52_week DECIMAL(16,4) COMMENT '52주 최고가',
+    record_created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '레코드 생성 시각',
+    record_updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '레코드 최종 수정 시각',
+    UNIQUE KEY uk_detail_p_idx_ticker (p_idx, ticker),
+    CONSTRAINT fk_detail_to_meta FOREIGN KEY (p_idx)
+        REFERENCES investor_portfolio (idx)
+        ON DELETE CASCADE ON UPDATE CASCADE
+) COMMENT = '포트폴리오 상세 종목 정보 테이블';
+"""
+
+# --- SQLite 스키마 ---
+# SQLite 백엔드는 새로 만든 DB에서만 사용하므로 v1에서 MySQL v1~v4와 같은 최종 스키마를 한 번에 생성합니다.
+# 시각 컬럼은 MySQL TIMESTAMP와 같이 로컬 시각으로 저장합니다 (SQLite CURRENT_TIMESTAMP는 UTC).
+
+SQLITE_CREATE_SCHEMA_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    applied_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+)
+"""
+
+SQLITE_CREATE_INVESTOR_PORTFOLIO_TABLE = """
+CREATE TABLE IF NOT EXISTS investor_portfolio (
+    idx INTEGER PRIMARY KEY AUTOINCREMENT,
+    investor_code TEXT NOT NULL COLLATE NOCASE,  -- MySQL 기본 collation처럼 대소문자를 구분하지 않습니다
+    investor_name TEXT NOT NULL,
+    portfolio_date DATE NOT NULL,
+    portfolio_period TEXT,
+    portfolio_value INTEGER,
+    number_of_stocks INTEGER,
+    portfolio_avg_return REAL,
+    record_created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    record_updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    UNIQUE (investor_code, portfolio_date)
+)
+"""
+
+SQLITE_CREATE_INVESTOR_PORTFOLIO_DETAIL_TABLE = """
+CREATE TABLE IF NOT EXISTS investor_portfolio_detail (
+    idx INTEGER PRIMARY KEY AUTOINCREMENT,
+    p_idx INTEGER NOT NULL REFERENCES investor_portfolio (idx) ON DELETE CASCADE ON UPDATE CASCADE,
+    ticker TEXT NOT NULL,
+    stk_name TEXT NOT NULL,
+    portfolio_rate REAL,
+    recent_activity_type TEXT,
+    recent_activity_value REAL,
+    shares INTEGER,
+    reported_price REAL,
+    reported_value_amount INTEGER,
+    current_price REAL,
+    reported_price_rate REAL,
+    low_52_week REAL,
+    high_52_week REAL,
+    record_created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    record_updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    UNIQUE (p_idx, ticker)
+)
+"""
+
+# 종목별 일별 가격 스냅샷 (여러 투자자가 보유한 같은 종목은 하루에 한 행)
+# PK (ticker, snapshot_date)가 클러스터드 인덱스이므로 종목별 기간 조회는 PK 범위 스캔으로 끝납니다.
+CREATE_HOLDING_PRICE_SNAPSHOT_TABLE = """
+CREATE TABLE IF NOT EXISTS holding_price_snapshot (
+    ticker VARCHAR(50) NOT NULL COMMENT '종목 코드 (예: AAPL, MSFT)',
+    snapshot_date DATE NOT NULL COMMENT '가격 수집 날짜',
+    current_price DECIMAL(16,4) COMMENT '수집 시점 주가',
+    low_52_week DECIMAL(16,4) COMMENT '52주 최저가',
+    high_52_week DECIMAL(16,4) COMMENT '52주 최고가',
+    PRIMARY KEY (ticker, snapshot_date)
+) COMMENT = '종목별 일별 가격 스냅샷 (추가 전용)';
+"""
+
+SQLITE_CREATE_HOLDING_PRICE_SNAPSHOT_TABLE = """
+CREATE TABLE IF NOT EXISTS holding_price_snapshot (
+    ticker TEXT NOT NULL,
+    snapshot_date DATE NOT NULL,
+    current_price REAL,
+    low_52_week REAL,
+    high_52_week REAL,
+    PRIMARY KEY (ticker, snapshot_date)
+) WITHOUT ROWID
+"""
+
+# 연속 분기 간 보유 종목 변화 (직전 분기가 있는 포트폴리오만, 새 분기 저장 시 증분 갱신)
+CREATE_PORTFOLIO_QUARTER_DIFF_TABLE = """
+CREATE TABLE IF NOT EXISTS portfolio_quarter_diff (
+    p_idx INT NOT NULL COMMENT '현재 분기 포트폴리오 ID (FK)',
+    ticker VARCHAR(50) NOT NULL COMMENT '종목 코드',
+    prev_p_idx INT NOT NULL COMMENT '같은 투자자의 직전 분기 포트폴리오 ID',
+    change_type VARCHAR(10) NOT NULL COMMENT '변화 유형 (new, exit, increase, decrease, unchanged)',
+    prev_shares BIGINT COMMENT '직전 분기 보유 주식 수',
+    shares BIGINT COMMENT '현재 분기 보유 주식 수 (청산 시 0)',
+    share_delta BIGINT COMMENT '보유 주식 수 변화',
+    prev_weight DECIMAL(5,2) COMMENT '직전 분기 비중 (%)',
+    weight DECIMAL(5,2) COMMENT '현재 분기 비중 (%)',
+    weight_delta DECIMAL(6,2) COMMENT '비중 변화 (%p)',
+    PRIMARY KEY (p_idx, ticker),
+    KEY idx_diff_ticker_change (ticker, change_type),
+    CONSTRAINT fk_diff_to_meta FOREIGN KEY (p_idx)
+        REFERENCES investor_portfolio (idx)
+        ON DELETE CASCADE ON UPDATE CASCADE
+) COMMENT = '분기 간 보유 종목 변화 테이블';
+"""
+
+SQLITE_CREATE_PORTFOLIO_QUARTER_DIFF_TABLE = """
+CREATE TABLE IF NOT EXISTS portfolio_quarter_diff (
+    p_idx INTEGER NOT NULL REFERENCES investor_portfolio (idx) ON DELETE CASCADE ON UPDATE CASCADE,
+    ticker TEXT NOT NULL,
+    prev_p_idx INTEGER NOT NULL,
+    change_type TEXT NOT NULL,
+    prev_shares INTEGER,
+    shares INTEGER,
+    share_delta INTEGER,
+    prev_weight REAL,
+    weight REAL,
+    weight_delta REAL,
+    PRIMARY KEY (p_idx, ticker)
+) WITHOUT ROWID
+"""
+
+# 종목 → 투자자 컨센서스 인덱스 (투자자별 최신 분기만, 포트폴리오 저장 후 증분 갱신)
+CREATE_CONSENSUS_HOLDING_TABLE = """
+CREATE TABLE IF NOT EXISTS consensus_holding (
+    ticker VARCHAR(50) NOT NULL COMMENT '종목 코드',
+    investor_code VARCHAR(50) NOT NULL COMMENT '투자자 코드',
+    p_idx INT NOT NULL COMMENT '투자자의 최신 분기 포트폴리오 ID',
+    stk_name VARCHAR(255) COMMENT '회사명',
+    portfolio_rate DECIMAL(5,2) COMMENT '투자자 포트폴리오 내 비중 (%)',
+    shares BIGINT COMMENT '보유 주식 수량',
+    reported_value_amount BIGINT COMMENT '보고된 종목 가치',
+    PRIMARY KEY (ticker, investor_code),
+    KEY idx_consensus_holding_investor (investor_code)
+) COMMENT = '투자자별 최신 분기 보유 종목 (컨센서스 인덱스)';
+"""
+
+CREATE_CONSENSUS_TICKER_TABLE = """
+CREATE TABLE IF NOT EXISTS consensus_ticker (
+    ticker VARCHAR(50) NOT NULL PRIMARY KEY COMMENT '종목 코드',
+    stk_name VARCHAR(255) COMMENT '회사명',
+    holder_count INT NOT NULL COMMENT '최신 분기에 보유한 투자자 수',
+    total_weight DECIMAL(10,2) COMMENT '보유 투자자 비중 합계 (%)',
+    avg_weight DECIMAL(8,4) COMMENT '보유 투자자 평균 비중 (%)',
+    total_reported_value BIGINT COMMENT '보유 투자자 보고 가치 합계',
+    KEY idx_consensus_ticker_holders (holder_count, total_reported_value)
+) COMMENT = '종목별 투자자 컨센서스 집계';
+"""
+
+SQLITE_CREATE_CONSENSUS_HOLDING_TABLE = """
+CREATE TABLE IF NOT EXISTS consensus_holding (
+    ticker TEXT NOT NULL,
+    investor_code TEXT NOT NULL COLLATE NOCASE,
+    p_idx INTEGER NOT NULL,
+    stk_name TEXT,
+    portfolio_rate REAL,
+    shares INTEGER,
+    reported_value_amount INTEGER,
+    PRIMARY KEY (ticker, investor_code)
+) WITHOUT ROWID
+"""
+
+SQLITE_CREATE_CONSENSUS_TICKER_TABLE = """
+CREATE TABLE IF NOT EXISTS consensus_ticker (
+    ticker TEXT NOT NULL PRIMARY KEY,
+    stk_name TEXT,
+    holder_count INTEGER NOT NULL,
+    total_weight REAL,
+    avg_weight REAL,
+    total_reported_value INTEGER
+) WITHOUT ROWID
+"""
+
+# 포트폴리오별로 미리 직렬화해 둔 읽기 모델 (웹 백엔드는 p_idx 조회 한 번으로 응답)
+CREATE_PORTFOLIO_READ_MODEL_TABLE = """
+CREATE TABLE IF NOT EXISTS portfolio_read_model (
+    p_idx INT NOT NULL PRIMARY KEY COMMENT '포트폴리오 메타 ID (FK)',
+    source_updated_at TIMESTAMP NULL DEFAULT NULL COMMENT '빌드 기준 investor_portfolio.record_updated_at',
+    content_hash CHAR(64) NOT NULL COMMENT 'payload_json의 SHA-256 (ETag로 사용 가능)',
+    payload_json MEDIUMTEXT NOT NULL COMMENT '리포트 형식(meta, stocks) JSON',
+    payload_gzip MEDIUMBLOB COMMENT 'gzip 압축한 payload_json (READ_MODEL_GZIP=false면 NULL)',
+    built_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '빌드 시각',
+    CONSTRAINT fk_read_model_to_meta FOREIGN KEY (p_idx)
+        REFERENCES investor_portfolio (idx)
+        ON DELETE CASCADE ON UPDATE CASCADE
+) COMMENT = '포트폴리오별 직렬화된 읽기 모델';
+"""
+
+SQLITE_CREATE_PORTFOLIO_READ_MODEL_TABLE = """
+CREATE TABLE IF NOT EXISTS portfolio_read_model (
+    p_idx INTEGER NOT NULL PRIMARY KEY REFERENCES investor_portfolio (idx) ON DELETE CASCADE ON UPDATE CASCADE,
+    source_updated_at TIMESTAMP,
+    content_hash TEXT NOT NULL,
+    payload_json TEXT NOT NULL,
+    payload_gzip BLOB,
+    built_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+)
+"""
+
+def _column_exists(cursor, table, column):
+    cursor.execute("""
+        SELECT 1 FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+    """, (table, column))
+    return cursor.fetchone() is not None
+
+def _index_exists(cursor, table, index):
+    cursor.execute("""
+        SELECT 1 FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+        LIMIT 1
+    """, (table, index))
+    return cursor.fetchone() is not None
+
+# --- 마이그레이션 ---
+# 각 마이그레이션은 스키마 이력이 없던 기존 DB에도 안전하도록 존재 여부를 확인한 뒤 적용합니다.
+
+def _create_base_tables(cursor):
+    cursor.execute(CREATE_INVESTOR_PORTFOLIO_TABLE)
+    cursor.execute(CREATE_INVESTOR_PORTFOLIO_DETAIL_TABLE)
+
+def _add_record_updated_at(cursor):
+    for table in ("investor_portfolio", "investor_portfolio_detail"):
+        if not _column_exists(cursor, table, "record_updated_at"):
+            cursor.execute(f"""
+                ALTER TABLE {table}
+                ADD COLUMN record_updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '레코드 최종 수정 시각'
+            """)
+            logger.info(f"'{table}' 테이블에 record_updated_at 컬럼을 추가했습니다.")
+
+def _remove_duplicate_details(cursor):
+    """(p_idx, ticker)가 같은 상세 행 중 가장 최근에 넣은 행(idx 최대)만 남기고 지운 뒤, 영향받은 p_idx 목록을 반환합니다."""
+    cursor.execute("""
+        SELECT DISTINCT p_idx FROM investor_portfolio_detail
+        GROUP BY p_idx, ticker HAVING COUNT(*) > 1
+    """)
+    p_idxs = [row['p_idx'] for row in cursor.fetchall()]
+    if not p_idxs:
+        return []
+    cursor.execute("""
+        DELETE older FROM investor_portfolio_detail older
+        JOIN investor_portfolio_detail newer
+          ON newer.p_idx = older.p_idx AND newer.ticker = older.ticker AND newer.idx > older.idx
+    """)
+    logger.warning(f"'investor_portfolio_detail'에서 중복된 (p_idx, ticker) 행 {cursor.rowcount}건을 지웠습니다 "
+                   f"(포트폴리오 {len(p_idxs)}개, 가장 최근 행 유지).")
+    return p_idxs
+
+def _add_detail_unique_key(cursor):
+    """중복 행을 정리한 뒤 (p_idx, ticker) 유니크 키를 추가하고, 중복이 있었던 p_idx 목록을 반환합니다.
+
+    upsert와 JOIN UPDATE, 분기 변화/컨센서스 집계가 모두 이 키를 전제로 하므로 추가에 실패하면 예외를 그대로 올려
+    버전이 기록되지 않게 합니다.
+    """
+    if _index_exists(cursor, "investor_portfolio_detail", "uk_detail_p_idx_ticker"):
+        return []
+    p_idxs = _remove_duplicate_details(cursor)
+    cursor.execute("""
+        ALTER TABLE investor_portfolio_detail
+        ADD UNIQUE KEY uk_detail_p_idx_ticker (p_idx, ticker)
+    """)
+    return p_idxs
+
+def _repair_detail_unique_key(cursor):
+    # 이전 v3는 중복 행이 있으면 경고만 남기고 키 없이 버전을 기록했으므로, 키가 없는 DB를 여기서 복구합니다.
+    p_idxs = _add_detail_unique_key(cursor)
+    if not p_idxs:
+        return
+    # 중복 행으로 계산된 파생 데이터를 다시 만들고, 읽기 모델이 다음 갱신에서 해당 포트폴리오를 다시 만들도록 표시합니다.
+    cursor.execute("DELETE FROM portfolio_quarter_diff")
+    insert_all_quarter_diffs(cursor)
+    rebuild_consensus_index(cursor)
+    placeholders = ", ".join(["%s"] * len(p_idxs))
+    cursor.execute(f"UPDATE investor_portfolio SET record_updated_at = CURRENT_TIMESTAMP WHERE idx IN ({placeholders})", p_idxs)
+
+def _add_read_path_indexes(cursor):
+    # get_latest_portfolio_data: ORDER BY portfolio_date DESC, record_created_at DESC LIMIT 1
+    if not _index_exists(cursor, "investor_portfolio", "idx_portfolio_date_created"):
+        cursor.execute("ALTER TABLE investor_portfolio ADD INDEX idx_portfolio_date_created (portfolio_date, record_created_at)")
+    # 상세 조회: WHERE p_idx = %s ORDER BY portfolio_rate DESC / 평균 수익률: WHERE portfolio_rate > 0 GROUP BY p_idx
+    if not _index_exists(cursor, "investor_portfolio_detail", "idx_detail_p_idx_rate"):
+        cursor.execute("ALTER TABLE investor_portfolio_detail ADD INDEX idx_detail_p_idx_rate (p_idx, portfolio_rate)")
+
+def _create_price_snapshot_table(cursor):
+    cursor.execute(CREATE_HOLDING_PRICE_SNAPSHOT_TABLE)
+    # 지금까지 상세 행에 덮어써 온 마지막 가격을 갱신 날짜의 스냅샷으로 남깁니다 (같은 날 같은 종목은 한 행).
+    cursor.execute("""
+        INSERT IGNORE INTO holding_price_snapshot (ticker, snapshot_date, current_price, low_52_week, high_52_week)
+        SELECT ticker, DATE(record_updated_at), current_price, low_52_week, high_52_week
+        FROM investor_portfolio_detail
+        WHERE current_price IS NOT NULL AND record_updated_at IS NOT NULL
+    """)
+
+def _create_quarter_diff_table(cursor):
+    cursor.execute(CREATE_PORTFOLIO_QUARTER_DIFF_TABLE)
+    cursor.execute("DELETE FROM portfolio_quarter_diff")
+    rows = insert_all_quarter_diffs(cursor)
+    logger.info(f"저장된 포트폴리오의 분기 간 변화 {rows}건을 계산했습니다.")
+
+def _create_consensus_index(cursor):
+    cursor.execute(CREATE_CONSENSUS_HOLDING_TABLE)
+    cursor.execute(CREATE_CONSENSUS_TICKER_TABLE)
+    holdings, tickers = rebuild_consensus_index(cursor)
+    logger.info(f"컨센서스 인덱스를 만들었습니다 (보유 {holdings}건, 종목 {tickers}개).")
+
+def _create_read_model_table(cursor):
+    # 읽기 모델은 첫 실행 시 utils.read_model.refresh_read_models()가 record_updated_at 기준으로 채웁니다.
+    cursor.execute(CREATE_PORTFOLIO_READ_MODEL_TABLE)
+
+# (버전, 설명, 적용 함수) - 새 마이그레이션은 항상 마지막에 다음 버전 번호로 추가합니다.
+MIGRATIONS = [
+    (1, "investor_portfolio / investor_portfolio_detail 테이블 생성", _create_base_tables),
+    (2, "record_updated_at 컬럼 추가", _add_record_updated_at),
+    (3, "investor_portfolio_detail (p_idx, ticker) 유니크 키 추가", _add_detail_unique_key),
+    (4, "조회 경로 인덱스 추가 (portfolio_date, record_created_at) / (p_idx, portfolio_rate)", _add_read_path_indexes),
+    (5, "holding_price_snapshot 종목별 일별 가격 스냅샷 테이블 생성", _create_price_snapshot_table),
+    (6, "portfolio_quarter_diff 분기 간 보유 종목 변화 테이블 생성", _create_quarter_diff_table),
+    (7, "consensus_holding / consensus_ticker 종목별 투자자 컨센서스 인덱스 생성", _create_consensus_index),
+    (8, "portfolio_read_model 포트폴리오별 읽기 모델 테이블 생성", _create_read_model_table),
+    (9, "investor_portfolio_detail 중복 행 정리 후 누락된 (p_idx, ticker) 유니크 키 복구", _repair_detail_unique_key),
+]
+
+def _sqlite_create_base_tables(cursor):
+    cursor.execute(SQLITE_CREATE_INVESTOR_PORTFOLIO_TABLE)
+    cursor.execute(SQLITE_CREATE_INVESTOR_PORTFOLIO_DETAIL_TABLE)
+
+def _sqlite_already_in_base_tables(cursor):
+    """SQLite v1 DDL에 이미 포함된 변경입니다."""
+
+def _sqlite_add_read_path_indexes(cursor):
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_portfolio_date_created ON investor_portfolio (portfolio_date, record_created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_detail_p_idx_rate ON investor_portfolio_detail (p_idx, portfolio_rate)")
+
+def _sqlite_create_price_snapshot_table(cursor):
+    cursor.execute(SQLITE_CREATE_HOLDING_PRICE_SNAPSHOT_TABLE)
+    cursor.execute("""
+        INSERT OR IGNORE INTO holding_price_snapshot (ticker, snapshot_date, current_price, low_52_week, high_52_week)
+        SELECT ticker, date(record_updated_at), current_price, low_52_week, high_52_week
+        FROM investor_portfolio_detail
+        WHERE current_price IS NOT NULL AND record_updated_at IS NOT NULL
+    """)
+
+def _sqlite_create_quarter_diff_table(cursor):
+    cursor.execute(SQLITE_CREATE_PORTFOLIO_QUARTER_DIFF_TABLE)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_diff_ticker_change ON portfolio_quarter_diff (ticker, change_type)")
+    cursor.execute("DELETE FROM portfolio_quarter_diff")
+    rows = insert_all_quarter_diffs(cursor)
+    logger.info(f"저장된 포트폴리오의 분기 간 변화 {rows}건을 계산했습니다.")
+
+def _sqlite_create_consensus_index(cursor):
+    cursor.execute(SQLITE_CREATE_CONSENSUS_HOLDING_TABLE)
+    cursor.execute(SQLITE_CREATE_CONSENSUS_TICKER_TABLE)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_consensus_holding_investor ON consensus_holding (investor_code)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_consensus_ticker_holders ON consensus_ticker (holder_count, total_reported_value)")
+    holdings, tickers = rebuild_consensus_index(cursor)
+    logger.info(f"컨센서스 인덱스를 만들었습니다 (보유 {holdings}건, 종목 {tickers}개).")
+
+def _sqlite_create_read_model_table(cursor):
+    cursor.execute(SQLITE_CREATE_PORTFOLIO_READ_MODEL_TABLE)
+
+# MySQL과 같은 버전 번호를 사용하므로 두 백엔드의 schema_version이 같은 스키마를 가리킵니다.
+SQLITE_MIGRATIONS = [
+    (1, "investor_portfolio / investor_portfolio_detail 테이블 생성", _sqlite_create_base_tables),
+    (2, "record_updated_at 컬럼 추가", _sqlite_already_in_base_tables),
+    (3, "investor_portfolio_detail (p_idx, ticker) 유니크 키 추가", _sqlite_already_in_base_tables),
+    (4, "조회 경로 인덱스 추가 (portfolio_date, record_created_at) / (p_idx, portfolio_rate)", _sqlite_add_read_path_indexes),
+    (5, "holding_price_snapshot 종목별 일별 가격 스냅샷 테이블 생성", _sqlite_create_price_snapshot_table),
+    (6, "portfolio_quarter_diff 분기 간 보유 종목 변화 테이블 생성", _sqlite_create_quarter_diff_table),
+    (7, "consensus_holding / consensus_ticker 종목별 투자자 컨센서스 인덱스 생성", _sqlite_create_consensus_index),
+    (8, "portfolio_read_model 포트폴리오별 읽기 모델 테이블 생성", _sqlite_create_read_model_table),
+    (9, "investor_portfolio_detail 중복 행 정리 후 누락된 (p_idx, ticker) 유니크 키 복구", _sqlite_already_in_base_tables),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def get_schema_version(conn):
+    """적용된 최신 스키마 버전을 반환합니다. schema_version 테이블이 없으면 0."""
+    with conn.cursor() as cursor:
+        try:
+            cursor.execute("SELECT MAX(version) AS version FROM schema_version")
+        except pymysql.err.ProgrammingError as e:
+            if e.args[0] == 1146:  # ER_NO_SUCH_TABLE
+                return 0
+            raise
+        except sqlite3.OperationalError as e:
+            if "no such table" in str(e):
+                return 0
+            raise
+        row = cursor.fetchone()
+        return row['version'] or 0
+
+def apply_migrations(conn, dialect="mysql"):
+    """적용되지 않은 마이그레이션을 순서대로 적용하고 현재 스키마 버전을 반환합니다.
+
+    이미 최신이면 버전 조회 쿼리 한 번만 실행합니다. 적용이 필요하면 다른 프로세스와의 동시 적용을 막고
+    마이그레이션마다 schema_version에 기록합니다.
+    - mysql: GET_LOCK으로 직렬화하고 마이그레이션마다 커밋합니다 (MySQL DDL은 즉시 커밋됩니다).
+    - sqlite: BEGIN IMMEDIATE로 쓰기 락을 잡고 모든 마이그레이션을 한 트랜잭션으로 커밋합니다 (SQLite DDL은 트랜잭션에 포함됩니다).
+    """
+    sqlite = dialect == "sqlite"
+    migrations = SQLITE_MIGRATIONS if sqlite else MIGRATIONS
+    current_version = get_schema_version(conn)
+    if current_version >= LATEST_VERSION:
+        logger.info(f"DB 스키마가 최신 상태입니다 (version {current_version}).")
+        return current_version
+
+    with conn.cursor() as cursor:
+        if sqlite:
+            conn.commit()  # 버전 조회로 시작된 읽기 트랜잭션을 끝내고 쓰기 락을 잡습니다.
+            cursor.execute("BEGIN IMMEDIATE")
+        else:
+            cursor.execute("SELECT GET_LOCK(%s, %s) AS acquired", (SCHEMA_LOCK_NAME, SCHEMA_LOCK_TIMEOUT))
+            if not cursor.fetchone()['acquired']:
+                raise RuntimeError(f"스키마 마이그레이션 락을 {SCHEMA_LOCK_TIMEOUT}초 안에 얻지 못했습니다.")
+        try:
+            cursor.execute(SQLITE_CREATE_SCHEMA_VERSION_TABLE if sqlite else CREATE_SCHEMA_VERSION_TABLE)
+            # 락을 기다리는 동안 다른 프로세스가 적용했을 수 있으므로 다시 확인합니다.
+            current_version = get_schema_version(conn)
+            for version, description, migrate in migrations:
+                if version <= current_version:
+                    continue
+                logger.info(f"스키마 마이그레이션 적용 중: v{version} - {description}")
+                migrate(cursor)
+                cursor.execute("INSERT INTO schema_version (version, description) VALUES (%s, %s)", (version, description))
+                if not sqlite:
+                    conn.commit()
+                current_version = version
+            conn.commit()
+        except (pymysql.MySQLError, sqlite3.Error) as e:
+            logger.error(f"스키마 마이그레이션 오류 (v{current_version} 이후): {e}")
+            conn.rollback()
+            raise
+        finally:
+            if not sqlite:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (SCHEMA_LOCK_NAME,))
+
+    logger.info(f"DB 스키마를 version {current_version}으로 업데이트했습니다.")
+    return current_version
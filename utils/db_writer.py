@@ -0,0 +1,179 @@
+import os
+import queue
+import threading
+import time
+from dotenv import load_dotenv
+from utils.logger_util import LoggerUtil
+from utils.db_manager import get_pool
+
+load_dotenv()
+
+DB_WRITER_FLUSH_SIZE = int(os.getenv("DB_WRITER_FLUSH_SIZE", 20))  # 한 트랜잭션에 묶을 최대 작업 수
+DB_WRITER_FLUSH_INTERVAL = float(os.getenv("DB_WRITER_FLUSH_INTERVAL", 2.0))  # 첫 작업 이후 커밋까지 기다리는 최대 시간(초)
+DB_WRITER_QUEUE_SIZE = int(os.getenv("DB_WRITER_QUEUE_SIZE", 100))  # 대기열 최대 크기 (가득 차면 submit이 대기)
+
+_STOP = object()
+
+class GroupCommitWriter:
+    """전용 스레드에서 DB 쓰기 작업을 모아 하나의 트랜잭션으로 커밋하는 writer
+
+    - submit(item)으로 넣은 작업은 크기 제한 큐를 거쳐 writer 스레드에서 처리됩니다.
+    - 첫 작업 이후 flush_size개가 모이거나 flush_interval초가 지나면 한 트랜잭션으로 묶어 커밋합니다.
+    - 작업마다 SAVEPOINT를 두므로 한 작업이 실패하면 그 작업의 변경만 롤백되고 나머지는 함께 커밋됩니다.
+    - 커밋이 실패하면 배치의 작업을 하나씩 다시 실행하여 개별 트랜잭션으로 커밋합니다.
+
+    콜백:
+    - write_fn(conn, item) -> result: 작업 하나의 쓰기 (커밋하지 않음). 예외를 던지면 실패로 처리됩니다. writer 스레드에서 호출.
+    - before_commit(conn, results): 커밋 직전에 배치 전체에 대해 한 번 실행할 쓰기 (선택). writer 스레드에서 호출.
+    - on_success(item, result): 커밋된 뒤 호출 (선택)
+    - on_failure(item, error): 작업이 롤백된 뒤 호출 (선택)
+    on_success/on_failure는 알림 전송처럼 느릴 수 있으므로 별도의 콜백 스레드에서 순서대로 호출되며,
+    writer 스레드는 콜백을 기다리지 않고 다음 배치를 커밋합니다. close()는 남은 콜백까지 모두 끝난 뒤 반환합니다.
+    """
+
+    def __init__(self, write_fn, before_commit=None, on_success=None, on_failure=None, pool=None,
+                 flush_size=DB_WRITER_FLUSH_SIZE, flush_interval=DB_WRITER_FLUSH_INTERVAL, queue_size=DB_WRITER_QUEUE_SIZE):
+        self.logger = LoggerUtil().get_logger()
+        self.write_fn = write_fn
+        self.before_commit = before_commit
+        self.on_success = on_success
+        self.on_failure = on_failure
+        self.pool = pool or get_pool()
+        self.flush_size = max(1, int(flush_size))
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._callbacks = queue.Queue()
+        self._thread = None
+        self._callback_thread = None
+        self._stats_lock = threading.Lock()
+        self.stats = {"submitted": 0, "committed": 0, "failed": 0, "transactions": 0}
+
+    def start(self):
+        self._callback_thread = threading.Thread(target=self._run_callbacks, name="db-writer-callbacks", daemon=True)
+        self._callback_thread.start()
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+        return self
+
+    def submit(self, item):
+        """작업을 대기열에 넣습니다. 대기열이 가득 차 있으면 자리가 날 때까지 기다립니다."""
+        self._count("submitted")
+        self._queue.put(item)
+
+    def close(self):
+        """남은 작업을 모두 커밋하고 writer/콜백 스레드를 종료한 뒤 통계를 반환합니다."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        if self._callback_thread is not None:
+            self._callbacks.put(_STOP)
+            self._callback_thread.join()
+            self._callback_thread = None
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def _count(self, key, amount=1):
+        # submit은 여러 생산자 스레드에서, 나머지는 writer 스레드에서 호출됩니다.
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _next_batch(self):
+        """첫 작업을 기다린 뒤 flush_size 또는 flush_interval까지 작업을 모읍니다. 종료 신호를 받으면 (batch, True)."""
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.flush_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run_callbacks(self):
+        while True:
+            callback = self._callbacks.get()
+            if callback is _STOP:
+                return
+            name, fn, args = callback
+            try:
+                fn(*args)
+            except Exception as e:
+                self.logger.error(f"DB writer {name} 콜백 오류: {e}", exc_info=True)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            if batch:
+                self._flush(batch)
+
+    def _flush(self, batch):
+        try:
+            with self.pool.connection() as conn:
+                try:
+                    self._commit_batch(conn, batch)
+                except Exception as e:
+                    conn.rollback()
+                    if len(batch) == 1:
+                        self._notify_failure(batch[0], e)
+                        return
+                    # 배치 커밋이 실패하면 작업을 하나씩 개별 트랜잭션으로 다시 시도합니다.
+                    self.logger.warning(f"배치 커밋 실패, {len(batch)}개 작업을 개별 트랜잭션으로 재시도합니다: {e}")
+                    for item in batch:
+                        try:
+                            self._commit_batch(conn, [item])
+                        except Exception as e_item:
+                            conn.rollback()
+                            self._notify_failure(item, e_item)
+        except Exception as e_conn:
+            self.logger.error(f"DB writer 연결 오류로 {len(batch)}개 작업을 처리하지 못했습니다: {e_conn}")
+            for item in batch:
+                self._notify_failure(item, e_conn)
+
+    def _commit_batch(self, conn, batch):
+        """배치의 작업을 SAVEPOINT 단위로 실행하고 한 번에 커밋합니다. 커밋 후 콜백을 호출합니다."""
+        succeeded = []
+        failed = []
+        with conn.cursor() as cursor:
+            for item in batch:
+                cursor.execute("SAVEPOINT writer_item")
+                try:
+                    result = self.write_fn(conn, item)
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT writer_item")
+                    failed.append((item, e))
+                    continue
+                cursor.execute("RELEASE SAVEPOINT writer_item")
+                succeeded.append((item, result))
+
+        if succeeded and self.before_commit is not None:
+            self.before_commit(conn, [result for _, result in succeeded])
+        conn.commit()
+        self._count("transactions")
+
+        for item, error in failed:
+            self._notify_failure(item, error)
+        self._count("committed", len(succeeded))
+        if self.on_success is not None:
+            for item, result in succeeded:
+                self._callbacks.put(("on_success", self.on_success, (item, result)))
+
+    def _notify_failure(self, item, error):
+        self._count("failed")
+        if self.on_failure is not None:
+            self._callbacks.put(("on_failure", self.on_failure, (item, error)))
@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+from utils.logger_util import LoggerUtil
+
+load_dotenv()
+
+ROOT_DIR = Path(os.path.dirname(os.path.abspath(__file__))).parent
+
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", str(ROOT_DIR / "cache" / "http"))
+HTTP_CACHE_TTL_DAYS = float(os.getenv("HTTP_CACHE_TTL_DAYS", 30))
+HTTP_CACHE_MAX_MB = float(os.getenv("HTTP_CACHE_MAX_MB", 200))
+
+PRUNE_EVERY_N_STORES = 50
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """URL 단위의 디스크 응답 캐시
+
+    항목마다 두 개의 파일을 저장합니다.
+    - {key}.html: 마지막으로 받은 응답 본문 (mtime = 마지막으로 받았거나 304로 확인한 시각, TTL 기준)
+    - {key}.json: ETag/Last-Modified, 본문 해시, 확인 시각(validated_at), 파서별 파싱 결과 (mtime = 마지막 접근 시각, LRU 기준)
+
+    본문 해시가 같으면 이전 파싱 결과를 그대로 재사용하여 BeautifulSoup 파싱을 건너뜁니다.
+    TTL은 마지막 확인 시각부터 계산하므로 서버가 매번 304로 변경 없음을 확인해 주는 항목은 만료되지 않습니다.
+    TTL이 지난 항목은 삭제되며, 전체 크기가 max_bytes를 넘으면 오래 접근하지 않은 항목부터 삭제합니다.
+    """
+
+    def __init__(self, cache_dir=HTTP_CACHE_DIR, ttl_seconds=HTTP_CACHE_TTL_DAYS * 86400,
+                 max_bytes=int(HTTP_CACHE_MAX_MB * 1024 * 1024), enabled=HTTP_CACHE_ENABLED):
+        self.logger = LoggerUtil().get_logger()
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stores_since_prune = 0
+        if self.enabled:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.prune()
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.html"
+
+    def _read_meta(self, meta_path):
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_atomic(self, path, text):
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def _remove(self, *paths):
+        for path in paths:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def lookup(self, url):
+        """TTL 이내의 캐시 항목 메타데이터를 반환합니다. 없거나 만료되었으면 None."""
+        if not self.enabled:
+            return None
+        meta_path, body_path = self._paths(url)
+        meta = self._read_meta(meta_path)
+        if meta is None:
+            return None
+        if time.time() - meta.get("validated_at", meta.get("stored_at", 0)) > self.ttl_seconds:
+            self._remove(meta_path, body_path)
+            return None
+        return meta
+
+    def conditional_headers(self, meta):
+        """캐시 항목으로 조건부 요청 헤더(If-None-Match / If-Modified-Since)를 만듭니다."""
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def read_body(self, url):
+        """304 응답 시 사용할 캐시된 본문을 반환하고, 서버가 변경 없음을 확인한 시각(validated_at, 본문 mtime)을 갱신합니다."""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(body_path, "r", encoding="utf-8") as f:
+                body = f.read()
+        except OSError:
+            return None
+        with self._lock:
+            meta = self._read_meta(meta_path)
+            if meta is not None:
+                meta["validated_at"] = time.time()
+                self._write_atomic(meta_path, json.dumps(meta, ensure_ascii=False))
+            try:
+                os.utime(body_path)
+            except OSError:
+                pass
+        return body
+
+    def store(self, url, body, response_headers):
+        """200 응답을 저장하고 본문 해시를 반환합니다. 해시가 바뀌면 이전 파싱 결과는 버립니다."""
+        body_hash = content_hash(body)
+        if not self.enabled:
+            return body_hash
+
+        meta_path, body_path = self._paths(url)
+        with self._lock:
+            now = time.time()
+            previous = self._read_meta(meta_path) or {}
+            meta = {
+                "url": url,
+                "etag": response_headers.get("ETag"),
+                "last_modified": response_headers.get("Last-Modified"),
+                "content_hash": body_hash,
+                "stored_at": now,
+                "validated_at": now,
+                "parsed": previous.get("parsed", {}) if previous.get("content_hash") == body_hash else {}
+            }
+            self._write_atomic(body_path, body)
+            self._write_atomic(meta_path, json.dumps(meta, ensure_ascii=False))
+
+            self._stores_since_prune += 1
+            should_prune = self._stores_since_prune >= PRUNE_EVERY_N_STORES
+        if should_prune:
+            self.prune()
+        return body_hash
+
+    def get_parsed(self, url, body_hash, parser_key):
+        """같은 본문 해시로 저장된 파싱 결과가 있으면 반환합니다."""
+        if not self.enabled:
+            return None
+        meta = self._read_meta(self._paths(url)[0])
+        if not meta or meta.get("content_hash") != body_hash:
+            return None
+        return meta.get("parsed", {}).get(parser_key)
+
+    def store_parsed(self, url, body_hash, parser_key, result):
+        if not self.enabled:
+            return
+        meta_path = self._paths(url)[0]
+        with self._lock:
+            meta = self._read_meta(meta_path)
+            if not meta or meta.get("content_hash") != body_hash:
+                return
+            meta.setdefault("parsed", {})[parser_key] = result
+            self._write_atomic(meta_path, json.dumps(meta, ensure_ascii=False))
+
+    def prune(self):
+        """TTL이 지난 항목을 삭제하고, 최대 크기를 넘으면 LRU 순서로 삭제합니다."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._stores_since_prune = 0
+            now = time.time()
+            entries = []
+            for meta_path in self.cache_dir.glob("*.json"):
+                body_path = meta_path.with_suffix(".html")
+                try:
+                    meta_stat = meta_path.stat()
+                    body_stat = body_path.stat()
+                except FileNotFoundError:
+                    self._remove(meta_path, body_path)
+                    continue
+                if now - body_stat.st_mtime > self.ttl_seconds:
+                    self._remove(meta_path, body_path)
+                    continue
+                entries.append((meta_stat.st_mtime, meta_stat.st_size + body_stat.st_size, meta_path, body_path))
+
+            total_bytes = sum(entry[1] for entry in entries)
+            evicted = 0
+            for _, size, meta_path, body_path in sorted(entries):
+                if total_bytes <= self.max_bytes:
+                    break
+                self._remove(meta_path, body_path)
+                total_bytes -= size
+                evicted += 1
+            if evicted:
+                self.logger.info(f"HTTP 캐시 용량 초과로 {evicted}개 항목을 삭제했습니다 (현재 {total_bytes / 1024 / 1024:.1f}MB).")
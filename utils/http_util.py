@@ -0,0 +1,103 @@
+import random
+import threading
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from utils.logger_util import LoggerUtil
+
+# fake_useragent를 사용할 수 없을 때 사용할 정적 User-Agent 목록
+STATIC_USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4 Safari/605.1.15",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:125.0) Gecko/20100101 Firefox/125.0",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+]
+
+DEFAULT_TIMEOUT = (5, 15)  # (connect, read) 초
+POOL_MAXSIZE = 16  # 호스트별 유지할 최대 keep-alive 연결 수
+
+class HttpUtil:
+    """모든 외부 HTTP 호출이 공유하는 호스트별 커넥션 풀 클라이언트 (싱글톤)
+
+    - 호스트(scheme + netloc)마다 keep-alive 세션을 하나씩 재사용합니다.
+    - User-Agent는 프로세스당 한 번만 로드하여 세션 헤더에 설정합니다.
+    - timeout을 지정하지 않은 요청에는 DEFAULT_TIMEOUT을 적용합니다.
+    """
+    _instance = None
+    _initialized = False
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super(HttpUtil, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if HttpUtil._initialized:
+            return
+        with HttpUtil._instance_lock:
+            if HttpUtil._initialized:
+                return
+            self.logger = LoggerUtil().get_logger()
+            self._sessions = {}
+            self._sessions_lock = threading.Lock()
+            self._user_agents = self._load_user_agents()
+            HttpUtil._initialized = True
+
+    def _load_user_agents(self):
+        """fake_useragent 브라우저 DB를 한 번만 로드하여 User-Agent 목록을 만듭니다."""
+        try:
+            from fake_useragent import UserAgent
+            ua = UserAgent()
+            user_agents = list({ua.random for _ in range(len(STATIC_USER_AGENTS) * 2)})
+            if user_agents:
+                return user_agents
+        except Exception as e:
+            self.logger.warning(f"fake_useragent 로드 실패, 정적 User-Agent 목록을 사용합니다: {e}")
+        return list(STATIC_USER_AGENTS)
+
+    def random_user_agent(self):
+        return random.choice(self._user_agents)
+
+    def get_session(self, url):
+        """URL의 호스트에 해당하는 keep-alive 세션을 반환합니다 (없으면 생성)."""
+        parsed = urlparse(url)
+        host_key = f"{parsed.scheme}://{parsed.netloc}"
+        session = self._sessions.get(host_key)
+        if session is not None:
+            return session
+
+        with self._sessions_lock:
+            session = self._sessions.get(host_key)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE)
+                session.mount(f"{parsed.scheme}://", adapter)
+                session.headers["User-Agent"] = self.random_user_agent()
+                self._sessions[host_key] = session
+                self.logger.debug(f"HTTP 세션 생성: {host_key}")
+        return session
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+        return self.get_session(url).request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        """모든 세션의 연결을 닫습니다."""
+        with self._sessions_lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+# 모듈 테스트용
+if __name__ == "__main__":
+    http = HttpUtil()
+    print("User-Agent:", http.random_user_agent())
@@ -0,0 +1,48 @@
+from typing import NamedTuple, Optional
+
+class PortfolioSummary(NamedTuple):
+    """holdings 페이지 p#p2의 포트폴리오 요약"""
+    portfolio_period: str
+    portfolio_date: str  # YYYY-MM-DD
+    number_of_stocks: int
+    portfolio_value: int
+
+class Holding(NamedTuple):
+    """holdings 페이지 #grid 한 행 (보유 종목 하나)
+
+    필드 순서는 investor_portfolio_detail INSERT 컬럼 순서(p_idx 제외)와 같으므로
+    (p_idx, *holding)을 그대로 executemany 인자로 사용할 수 있습니다.
+    NamedTuple은 인스턴스 __dict__가 없어 행마다 dict를 만드는 것보다 메모리를 적게 사용합니다.
+    """
+    ticker: str
+    name: str
+    portfolio_rate: float
+    recent_activity_type: Optional[str]
+    recent_activity_value: Optional[float]
+    shares: int
+    reported_price: float
+    reported_value_amount: int
+    current_price: float
+    reported_price_rate: float
+    low_52_week: float
+    high_52_week: float
+
+    def insert_row(self, p_idx):
+        """investor_portfolio_detail INSERT용 튜플"""
+        return (p_idx, *self)
+
+    def price_row(self, p_idx):
+        """가격 일괄 갱신용 (p_idx, ticker, current_price, reported_price_rate, low_52_week, high_52_week) 튜플"""
+        return (p_idx, self.ticker, self.current_price, self.reported_price_rate, self.low_52_week, self.high_52_week)
+
+    def snapshot_row(self, snapshot_date):
+        """holding_price_snapshot 적재용 (ticker, snapshot_date, current_price, low_52_week, high_52_week) 튜플"""
+        return (self.ticker, snapshot_date, self.current_price, self.low_52_week, self.high_52_week)
+
+def summary_from_cache(value):
+    """JSON 캐시에 리스트로 저장된 요약을 PortfolioSummary로 복원합니다."""
+    return PortfolioSummary(*value) if value is not None else None
+
+def holdings_from_cache(rows):
+    """JSON 캐시에 리스트로 저장된 상세 목록을 Holding 목록으로 복원합니다."""
+    return [Holding(*row) for row in rows]
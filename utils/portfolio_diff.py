@@ -0,0 +1,58 @@
+# 분기 간 보유 종목 변화(신규/청산/주식 수 변화/비중 변화)를 portfolio_quarter_diff 테이블에 계산해 두는 SQL
+# (p_idx, prev_p_idx) 쌍마다 두 분기의 상세 행을 (p_idx, ticker) 유니크 키로 조인하여 한 번의 INSERT ... SELECT로 계산합니다.
+# 새 분기 저장 시 증분 갱신(db_manager.refresh_quarter_diffs)과 마이그레이션의 전체 초기화가 같은 SQL을 사용합니다.
+
+CHANGE_NEW = "new"
+CHANGE_EXIT = "exit"
+CHANGE_INCREASE = "increase"
+CHANGE_DECREASE = "decrease"
+CHANGE_UNCHANGED = "unchanged"
+
+# 모든 포트폴리오와 같은 투자자의 직전 분기 쌍 (직전 분기가 없는 첫 분기는 제외)
+ALL_QUARTER_PAIRS_SQL = """
+SELECT p_idx, prev_p_idx FROM (
+    SELECT c.idx AS p_idx,
+           (SELECT p.idx FROM investor_portfolio p
+            WHERE p.investor_code = c.investor_code AND p.portfolio_date < c.portfolio_date
+            ORDER BY p.portfolio_date DESC LIMIT 1) AS prev_p_idx
+    FROM investor_portfolio c
+) pairs
+WHERE prev_p_idx IS NOT NULL
+"""
+
+# 인자로 받은 쌍 하나
+SINGLE_QUARTER_PAIR_SQL = "SELECT %s AS p_idx, %s AS prev_p_idx"
+
+# {pairs}: (p_idx, prev_p_idx) 행을 반환하는 SELECT. 현재 분기 종목(신규/증감/유지)과 직전 분기에만 있는 종목(청산)을 합칩니다.
+INSERT_QUARTER_DIFF_SQL = f"""
+INSERT INTO portfolio_quarter_diff
+(p_idx, ticker, prev_p_idx, change_type, prev_shares, shares, share_delta, prev_weight, weight, weight_delta)
+SELECT pr.p_idx, cur.ticker, pr.prev_p_idx,
+       CASE WHEN prev.ticker IS NULL THEN '{CHANGE_NEW}'
+            WHEN cur.shares > prev.shares THEN '{CHANGE_INCREASE}'
+            WHEN cur.shares < prev.shares THEN '{CHANGE_DECREASE}'
+            ELSE '{CHANGE_UNCHANGED}' END,
+       prev.shares, cur.shares, cur.shares - COALESCE(prev.shares, 0),
+       prev.portfolio_rate, cur.portfolio_rate, cur.portfolio_rate - COALESCE(prev.portfolio_rate, 0)
+FROM ({{pairs}}) pr
+JOIN investor_portfolio_detail cur ON cur.p_idx = pr.p_idx
+LEFT JOIN investor_portfolio_detail prev ON prev.p_idx = pr.prev_p_idx AND prev.ticker = cur.ticker
+UNION ALL
+SELECT pr.p_idx, prev.ticker, pr.prev_p_idx, '{CHANGE_EXIT}',
+       prev.shares, 0, -prev.shares,
+       prev.portfolio_rate, 0, -prev.portfolio_rate
+FROM ({{pairs}}) pr
+JOIN investor_portfolio_detail prev ON prev.p_idx = pr.prev_p_idx
+LEFT JOIN investor_portfolio_detail cur ON cur.p_idx = pr.p_idx AND cur.ticker = prev.ticker
+WHERE cur.idx IS NULL
+"""
+
+def insert_quarter_diff(cursor, p_idx, prev_p_idx):
+    """p_idx 분기와 prev_p_idx 분기의 변화를 적재하고 적재한 행 수를 반환합니다 (기존 행은 호출한 쪽에서 삭제)."""
+    cursor.execute(INSERT_QUARTER_DIFF_SQL.format(pairs=SINGLE_QUARTER_PAIR_SQL), (p_idx, prev_p_idx, p_idx, prev_p_idx))
+    return cursor.rowcount
+
+def insert_all_quarter_diffs(cursor):
+    """저장된 모든 연속 분기 쌍의 변화를 한 번에 적재하고 적재한 행 수를 반환합니다."""
+    cursor.execute(INSERT_QUARTER_DIFF_SQL.format(pairs=ALL_QUARTER_PAIRS_SQL))
+    return cursor.rowcount
@@ -0,0 +1,189 @@
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+import requests
+from dotenv import load_dotenv
+from utils.logger_util import LoggerUtil
+
+load_dotenv()
+
+RATE_LIMIT_RPS = float(os.getenv("RATE_LIMIT_RPS", 2))  # 호스트별 초기 초당 요청 수
+RATE_LIMIT_MIN_RPS = float(os.getenv("RATE_LIMIT_MIN_RPS", 0.2))
+RATE_LIMIT_MAX_RPS = float(os.getenv("RATE_LIMIT_MAX_RPS", 8))
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", 4))  # 토큰 버킷 최대 크기
+RATE_LIMIT_LATENCY_TARGET = float(os.getenv("RATE_LIMIT_LATENCY_TARGET", 2.0))  # 이보다 느린 응답은 과부하 신호로 간주 (초)
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5))  # 연속 실패 횟수
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", 60))
+
+RATE_INCREASE_STEP = 0.1  # 정상 응답마다 늘리는 초당 요청 수 (additive increase)
+THROTTLE_DECREASE_FACTOR = 0.5  # 429/503 응답 시 요청 속도 감소 비율 (multiplicative decrease)
+SLOW_DECREASE_FACTOR = 0.9  # 느린 응답 시 요청 속도 감소 비율
+THROTTLE_STATUS_CODES = (429, 503)
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """호스트의 서킷 브레이커가 열려 있어 요청을 보내지 않았을 때 발생합니다."""
+
+def parse_retry_after(value):
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 변환합니다. 해석할 수 없으면 None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def backoff_delay(attempt, base=0.5, cap=30.0):
+    """지수 백오프 + full jitter: 0 ~ min(cap, base * 2^attempt) 사이의 임의 대기 시간"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+class _HostState:
+    """호스트 하나의 토큰 버킷과 서킷 브레이커 상태"""
+
+    def __init__(self, rate, burst):
+        self.lock = threading.Lock()
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.refilled_at = time.monotonic()
+        self.paused_until = 0.0
+        self.consecutive_failures = 0
+        self.opened_at = None  # None이면 닫힘 (정상)
+        self.probe_in_flight = False
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.refilled_at) * self.rate)
+        self.refilled_at = now
+
+class HostRateLimiter:
+    """크롤링 워커가 공유하는 호스트별 적응형 레이트 리미터 (싱글톤)
+
+    - 토큰 버킷: 호스트마다 초당 rate개의 토큰을 채우고, 요청마다 하나씩 소비합니다.
+    - 적응 (AIMD): 정상 응답마다 rate를 조금씩 올리고, 429/503 또는 느린 응답에는 비율로 낮춥니다.
+      Retry-After가 있으면 해당 시간 동안 호스트 전체의 요청을 멈춥니다.
+    - 서킷 브레이커: 연속 실패가 임계값에 도달하면 reset_seconds 동안 요청을 차단(CircuitOpenError)하고,
+      이후 한 번의 시험 요청이 성공하면 다시 닫습니다.
+    같은 프로세스의 모든 스레드가 한 인스턴스를 공유합니다. 프로세스가 여러 개면 configure()로 rate를 나눠 설정합니다.
+    """
+    _instance = None
+    _initialized = False
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super(HostRateLimiter, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if HostRateLimiter._initialized:
+            return
+        with HostRateLimiter._instance_lock:
+            if HostRateLimiter._initialized:
+                return
+            self.logger = LoggerUtil().get_logger()
+            self._hosts = {}
+            self._hosts_lock = threading.Lock()
+            self.configure()
+            HostRateLimiter._initialized = True
+
+    def configure(self, rate=RATE_LIMIT_RPS, min_rate=RATE_LIMIT_MIN_RPS, max_rate=RATE_LIMIT_MAX_RPS,
+                  burst=RATE_LIMIT_BURST, latency_target=RATE_LIMIT_LATENCY_TARGET,
+                  failure_threshold=CIRCUIT_FAILURE_THRESHOLD, reset_seconds=CIRCUIT_RESET_SECONDS):
+        """설정을 바꾸고 호스트별 상태를 초기화합니다."""
+        self.min_rate = max(0.01, min_rate)
+        self.max_rate = max(self.min_rate, max_rate)
+        self.rate = min(self.max_rate, max(self.min_rate, rate))
+        self.burst = max(1.0, burst)
+        self.latency_target = latency_target
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        with self._hosts_lock:
+            self._hosts = {}
+
+    def _state(self, url):
+        host = urlparse(url).netloc
+        state = self._hosts.get(host)
+        if state is None:
+            with self._hosts_lock:
+                state = self._hosts.setdefault(host, _HostState(self.rate, self.burst))
+        return state
+
+    def acquire(self, url):
+        """요청을 보내도 될 때까지 대기합니다. 서킷이 열려 있으면 CircuitOpenError를 발생시킵니다."""
+        state = self._state(url)
+        with state.lock:
+            now = time.monotonic()
+            if state.opened_at is not None:
+                if now - state.opened_at < self.reset_seconds or state.probe_in_flight:
+                    raise CircuitOpenError(f"Circuit open for {urlparse(url).netloc}, skipping request: {url}")
+                # 반개방(half-open): 시험 요청 하나만 통과시킵니다.
+                state.probe_in_flight = True
+
+            # 토큰을 미리 예약하고(음수 허용) 부족한 만큼 락 밖에서 대기합니다.
+            state.refill(now)
+            state.tokens -= 1
+            wait = max(state.paused_until - now, -state.tokens / state.rate if state.tokens < 0 else 0.0)
+        if wait > 0:
+            time.sleep(wait)
+
+    def record_response(self, url, status_code, latency, retry_after=None):
+        """응답 결과로 요청 속도와 서킷 상태를 갱신합니다."""
+        state = self._state(url)
+        host = urlparse(url).netloc
+        with state.lock:
+            if status_code in THROTTLE_STATUS_CODES:
+                state.rate = max(self.min_rate, state.rate * THROTTLE_DECREASE_FACTOR)
+                state.tokens = min(state.tokens, 0.0)
+                if retry_after:
+                    state.paused_until = max(state.paused_until, time.monotonic() + retry_after)
+                self.logger.warning(f"{host} 응답 {status_code}: 요청 속도를 {state.rate:.2f} req/s로 낮춥니다"
+                                    + (f" ({retry_after:.1f}초 대기)" if retry_after else "") + ".")
+            elif status_code < 500:
+                if latency > self.latency_target:
+                    state.rate = max(self.min_rate, state.rate * SLOW_DECREASE_FACTOR)
+                else:
+                    state.rate = min(self.max_rate, state.rate + RATE_INCREASE_STEP)
+
+            if status_code in RETRYABLE_STATUS_CODES:
+                self._record_failure(state, host)
+            else:
+                if state.opened_at is not None:
+                    self.logger.info(f"{host} 서킷 브레이커를 닫습니다 (시험 요청 성공).")
+                state.consecutive_failures = 0
+                state.opened_at = None
+                state.probe_in_flight = False
+
+    def record_error(self, url):
+        """연결 오류/타임아웃 등 응답을 받지 못한 요청을 실패로 기록합니다."""
+        state = self._state(url)
+        with state.lock:
+            self._record_failure(state, urlparse(url).netloc)
+
+    def _record_failure(self, state, host):
+        state.consecutive_failures += 1
+        if state.probe_in_flight or (state.opened_at is None and state.consecutive_failures >= self.failure_threshold):
+            state.opened_at = time.monotonic()
+            state.probe_in_flight = False
+            self.logger.error(f"{host} 연속 실패 {state.consecutive_failures}회: 서킷 브레이커를 "
+                              f"{self.reset_seconds:.0f}초 동안 엽니다.")
+
+    def stats(self):
+        """호스트별 현재 요청 속도와 서킷 상태"""
+        with self._hosts_lock:
+            hosts = dict(self._hosts)
+        return {
+            host: {"rate": round(state.rate, 3), "circuit_open": state.opened_at is not None,
+                   "consecutive_failures": state.consecutive_failures}
+            for host, state in hosts.items()
+        }
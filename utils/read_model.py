@@ -0,0 +1,152 @@
+import gzip
+import hashlib
+import json
+import os
+from dotenv import load_dotenv
+from utils.logger_util import LoggerUtil
+from utils.db_backends import DB_ERRORS, get_backend
+
+# 로거 설정
+logger = LoggerUtil().get_logger()
+
+load_dotenv()
+
+READ_MODEL_GZIP = os.getenv("READ_MODEL_GZIP", "true").lower() in ("1", "true", "yes")  # gzip 압축본도 함께 저장할지
+READ_MODEL_GZIP_LEVEL = 6
+
+def format_portfolio_data(portfolio_data):
+    """DB 데이터를 템플릿에 맞는 형식으로 변환합니다."""
+    if not portfolio_data:
+        return None
+
+    meta = portfolio_data['meta']
+    details = portfolio_data['details']
+
+    # 메타 데이터 포맷팅
+    formatted_meta = {
+        'total_value': f"${meta['portfolio_value'] / 1_000_000_000:.1f}B",
+        'number_of_stocks': meta['number_of_stocks'],
+        'portfolio_date': meta['portfolio_date'].strftime('%Y-%m-%d'),
+        'investor_name': meta['investor_name'],
+        'investor_code': meta['investor_code']
+    }
+
+    # 상세 데이터 포맷팅
+    formatted_stocks = []
+    for detail in details:
+        # 수익률 계산 (reported_price_rate 사용)
+        change = detail['reported_price_rate']
+        change_str = f"+{change:.2f}%" if change >= 0 else f"{change:.2f}%"
+
+        # 활동 타입과 값 포맷팅
+        activity = ""
+        activity_type = detail['recent_activity_type']
+        if activity_type and detail['recent_activity_value']:
+            activity = f"{activity_type.capitalize()} {detail['recent_activity_value']:.2f}%"
+
+        stock = {
+            'symbol': detail['ticker'],
+            'name': detail['stk_name'].replace('"', ''),
+            'percentage': float(detail['portfolio_rate']),
+            'value': detail['reported_value_amount'],
+            'change': change_str,
+            'activity': activity,
+            'activityType': activity_type.lower() if activity_type else ''
+        }
+        formatted_stocks.append(stock)
+
+    return {
+        'meta': formatted_meta,
+        'stocks': formatted_stocks
+    }
+
+def _placeholders(values):
+    return ", ".join(["%s"] * len(values))
+
+def fetch_portfolio_data(conn, p_idxs):
+    """여러 포트폴리오의 메타/상세 행을 두 번의 쿼리로 조회합니다.
+
+    반환값: {p_idx: {'meta': 메타 행, 'details': 비중 큰 순 상세 행 목록}} (get_latest_portfolio_data와 같은 형식)
+    """
+    p_idxs = list(p_idxs)
+    if not p_idxs:
+        return {}
+    with conn.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT idx, investor_code, investor_name, portfolio_date,
+                   portfolio_period, portfolio_value, number_of_stocks, record_updated_at
+            FROM investor_portfolio
+            WHERE idx IN ({_placeholders(p_idxs)})
+        """, p_idxs)
+        portfolios = {meta['idx']: {'meta': meta, 'details': []} for meta in cursor.fetchall()}
+
+        cursor.execute(f"""
+            SELECT p_idx, ticker, stk_name, portfolio_rate, recent_activity_type,
+                   recent_activity_value, shares, reported_price,
+                   reported_value_amount, current_price, reported_price_rate,
+                   low_52_week, high_52_week
+            FROM investor_portfolio_detail
+            WHERE p_idx IN ({_placeholders(p_idxs)})
+            ORDER BY p_idx, portfolio_rate DESC, ticker
+        """, p_idxs)
+        for detail in cursor.fetchall():
+            portfolios[detail['p_idx']]['details'].append(detail)
+    return portfolios
+
+def serialize_read_model(p_idx, portfolio_data):
+    """포맷팅한 포트폴리오를 JSON 문자열과 (설정 시) gzip 바이트, 내용 해시로 직렬화합니다."""
+    payload = format_portfolio_data(portfolio_data)
+    payload['p_idx'] = p_idx
+    payload_json = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str)
+    payload_bytes = payload_json.encode("utf-8")
+    # mtime=0: 같은 내용이면 압축 바이트도 같습니다.
+    payload_gzip = gzip.compress(payload_bytes, compresslevel=READ_MODEL_GZIP_LEVEL, mtime=0) if READ_MODEL_GZIP else None
+    return payload_json, payload_gzip, hashlib.sha256(payload_bytes).hexdigest()
+
+def _stale_p_idxs(conn):
+    """읽기 모델이 없거나, 빌드 이후 investor_portfolio.record_updated_at이 바뀐 포트폴리오"""
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT p.idx
+            FROM investor_portfolio p
+            LEFT JOIN portfolio_read_model r ON r.p_idx = p.idx
+            WHERE r.p_idx IS NULL OR r.source_updated_at IS NULL OR r.source_updated_at <> p.record_updated_at
+        """)
+        return [row['idx'] for row in cursor.fetchall()]
+
+def refresh_read_models(conn, p_idxs=None):
+    """포트폴리오별 읽기 모델(portfolio_read_model)을 다시 만들고 만든 개수를 반환합니다.
+
+    p_idxs가 주어지면 해당 포트폴리오를 다시 만들고(쓰기 직후 호출하는 쪽이 변경을 알고 있는 경우),
+    None이면 record_updated_at이 바뀐 포트폴리오만 찾아서 다시 만듭니다. 커밋은 호출한 쪽에서 합니다.
+    """
+    p_idxs = sorted(set(p_idxs)) if p_idxs is not None else _stale_p_idxs(conn)
+    if not p_idxs:
+        return 0
+
+    rows = []
+    for p_idx, portfolio_data in fetch_portfolio_data(conn, p_idxs).items():
+        payload_json, payload_gzip, content_hash = serialize_read_model(p_idx, portfolio_data)
+        rows.append((p_idx, portfolio_data['meta']['record_updated_at'], content_hash, payload_json, payload_gzip))
+
+    with conn.cursor() as cursor:
+        try:
+            cursor.executemany(get_backend().upsert_read_model_sql(), rows)
+        except DB_ERRORS as e:
+            logger.error(f"포트폴리오 읽기 모델 저장 오류 (p_idx: {p_idxs}): {e}")
+            raise
+    logger.info(f"포트폴리오 읽기 모델 {len(rows)}개를 만들었습니다.")
+    return len(rows)
+
+def get_read_model(conn, p_idx, compressed=False):
+    """p_idx의 읽기 모델을 PK 조회 한 번으로 반환합니다. 없으면 None.
+
+    반환값: {'content_hash', 'source_updated_at', 'payload'} - payload는 JSON 문자열 (compressed=True면 gzip 바이트)
+    """
+    column = "payload_gzip" if compressed else "payload_json"
+    with conn.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT content_hash, source_updated_at, {column} AS payload
+            FROM portfolio_read_model WHERE p_idx = %s
+        """, (p_idx,))
+        return cursor.fetchone()
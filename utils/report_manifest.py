@@ -0,0 +1,57 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+from utils.logger_util import LoggerUtil
+
+MANIFEST_FILENAME = ".build_manifest.json"
+
+def data_hash(formatted_data):
+    """포맷팅한 리포트 데이터(meta, stocks)의 해시. 키 순서와 무관하게 같은 데이터면 같은 값입니다."""
+    payload = json.dumps(formatted_data, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ReportManifest:
+    """출력 폴더의 리포트 파일별 입력 해시를 기록하는 빌드 매니페스트 ({output_dir}/.build_manifest.json)
+
+    파일 이름마다 {"data_hash", "template_version", "built_at"}을 저장합니다. 데이터 해시와 템플릿 버전이 모두 같고
+    출력 파일이 남아 있으면 다시 렌더링할 필요가 없습니다. 저장은 임시 파일에 쓴 뒤 os.replace로 교체하므로
+    빌드 도중 중단되어도 이전 매니페스트가 깨지지 않습니다.
+    """
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_FILENAME)
+        self.logger = LoggerUtil().get_logger()
+        self.entries = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"빌드 매니페스트 {self.path}를 읽을 수 없어 전체를 다시 빌드합니다: {e}")
+            return {}
+
+    def is_fresh(self, filename, input_hash, template_version):
+        """같은 입력으로 이미 만든 출력 파일이 있으면 True"""
+        entry = self.entries.get(filename)
+        return (entry is not None and entry.get("data_hash") == input_hash
+                and entry.get("template_version") == template_version
+                and os.path.exists(os.path.join(self.output_dir, filename)))
+
+    def record(self, filename, input_hash, template_version):
+        self.entries[filename] = {
+            "data_hash": input_hash,
+            "template_version": template_version,
+            "built_at": datetime.now().isoformat(timespec="seconds")
+        }
+
+    def save(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,120 @@
+import gzip
+import hashlib
+import os
+import re
+from collections import defaultdict
+from pathlib import Path
+from utils.logger_util import LoggerUtil
+from utils.http_util import HttpUtil
+try:
+    import brotli
+except ImportError: # brotli가 없으면 .gz만 만듭니다
+    brotli = None
+
+logger = LoggerUtil().get_logger()
+
+ROOT_DIR = Path(os.path.dirname(os.path.abspath(__file__))).parent
+
+ECHARTS_VERSION = "5.4.3"
+ECHARTS_CDN_URL = f"https://cdnjs.cloudflare.com/ajax/libs/echarts/{ECHARTS_VERSION}/echarts.min.js"
+VENDOR_DIR = ROOT_DIR / "vendor"
+ECHARTS_VENDOR_PATH = VENDOR_DIR / f"echarts-{ECHARTS_VERSION}.min.js"
+
+ASSET_HASH_LENGTH = 10
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+PRECOMPRESSED_SUFFIXES = (".gz", ".br")
+ASSET_REFERENCE_PATTERN = re.compile(r"assets/([\w.-]+)")
+
+def vendored_echarts():
+    """vendor/의 고정 버전 ECharts 내용을 반환합니다.
+
+    파일이 없으면 CDN에서 한 번 받아 저장합니다 (vendor/는 git에서 제외). 받을 수 없으면 CDN을 참조하는 사이트를
+    조용히 만드는 대신 RuntimeError로 빌드를 중단합니다.
+    """
+    if not ECHARTS_VENDOR_PATH.exists():
+        try:
+            response = HttpUtil().get(ECHARTS_CDN_URL)
+            response.raise_for_status()
+        except Exception as e:
+            raise RuntimeError(f"ECharts {ECHARTS_VERSION} 파일 {ECHARTS_VENDOR_PATH}이 없고 {ECHARTS_CDN_URL}에서 받을 수도 "
+                               f"없습니다. 오프라인 빌드라면 이 파일을 직접 넣어 주세요: {e}") from e
+        VENDOR_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = ECHARTS_VENDOR_PATH.with_name(f"{ECHARTS_VENDOR_PATH.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(response.content)
+        os.replace(tmp_path, ECHARTS_VENDOR_PATH)
+        logger.info(f"ECharts {ECHARTS_VERSION}를 {ECHARTS_VENDOR_PATH}에 저장했습니다.")
+    return ECHARTS_VENDOR_PATH.read_bytes()
+
+def precompress(path):
+    """path 옆에 .gz (그리고 brotli가 있으면 .br) 사전 압축본을 씁니다. 같은 입력이면 같은 바이트가 나옵니다."""
+    data = Path(path).read_bytes()
+    Path(f"{path}.gz").write_bytes(gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0))
+    if brotli is not None:
+        Path(f"{path}.br").write_bytes(brotli.compress(data, quality=BROTLI_QUALITY))
+
+def missing_precompressed(path):
+    """path의 사전 압축본 중 아직 없는 것이 있으면 True (brotli가 없으면 .br은 확인하지 않습니다)"""
+    suffixes = PRECOMPRESSED_SUFFIXES if brotli is not None else (".gz",)
+    return any(not Path(f"{path}{suffix}").exists() for suffix in suffixes)
+
+def write_hashed_asset(site_dir, stem, ext, content):
+    """내용 해시를 파일 이름에 넣은 공유 자산을 assets/에 쓰고 사이트 루트 기준 경로를 반환합니다.
+
+    이름이 같으면 내용도 같으므로 이미 있으면 다시 쓰지 않습니다 (브라우저/CDN에서 영구 캐시 가능). 다만 이전 빌드가 중단되었거나
+    brotli 없이 빌드되어 사전 압축본이 빠져 있으면 압축본만 다시 씁니다.
+    """
+    name = f"assets/{stem}.{hashlib.sha256(content).hexdigest()[:ASSET_HASH_LENGTH]}.{ext}"
+    path = Path(site_dir) / name
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, path)
+    if missing_precompressed(path):
+        precompress(path)
+    return name
+
+def prune_site_assets(site_dir):
+    """사이트의 어떤 HTML도 참조하지 않는 assets/ 파일(사전 압축본 포함)을 지우고 지운 자산 수를 반환합니다."""
+    assets_dir = Path(site_dir) / "assets"
+    if not assets_dir.is_dir():
+        return 0
+    referenced = set()
+    for page in Path(site_dir).rglob("*.html"):
+        referenced.update(ASSET_REFERENCE_PATTERN.findall(page.read_text(encoding="utf-8")))
+    removed = 0
+    for path in assets_dir.iterdir():
+        compressed = path.suffix in PRECOMPRESSED_SUFFIXES
+        if path.is_file() and (path.stem if compressed else path.name) not in referenced:
+            path.unlink()
+            if not compressed:
+                removed += 1
+    return removed
+
+def group_portfolios(formatted_portfolios):
+    """포맷팅한 포트폴리오 meta를 투자자별/분기별로 묶습니다 (각 목록은 최신 분기/이름 순)."""
+    by_investor = defaultdict(list)
+    by_quarter = defaultdict(list)
+    for data in formatted_portfolios:
+        meta = data["meta"]
+        by_investor[meta["investor_code"]].append(meta)
+        by_quarter[meta["portfolio_date"]].append(meta)
+    for metas in by_investor.values():
+        metas.sort(key=lambda meta: meta["portfolio_date"], reverse=True)
+    for metas in by_quarter.values():
+        metas.sort(key=lambda meta: meta["investor_name"])
+    return dict(sorted(by_investor.items(), key=lambda item: item[1][0]["investor_name"])), \
+        dict(sorted(by_quarter.items(), reverse=True))
+
+def site_size(site_dir):
+    """사이트 출력의 (원본 바이트, 사전 압축본 중 가장 작은 바이트) 합계"""
+    raw_bytes = compressed_bytes = 0
+    for path in Path(site_dir).rglob("*"):
+        if not path.is_file() or path.suffix in PRECOMPRESSED_SUFFIXES or path.name.startswith("."):
+            continue
+        size = path.stat().st_size
+        candidates = [Path(f"{path}{suffix}") for suffix in PRECOMPRESSED_SUFFIXES]
+        raw_bytes += size
+        compressed_bytes += min([candidate.stat().st_size for candidate in candidates if candidate.exists()] or [size])
+    return raw_bytes, compressed_bytes
@@ -1,9 +1,7 @@
 import os
-from urllib.request import urlopen
-import urllib.parse
-import requests
 from dotenv import load_dotenv
 import json
+from utils.http_util import HttpUtil
 
 load_dotenv()
 
@@ -12,11 +10,23 @@ class TelegramUtil:
         self.bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
         self.chat_id = os.getenv('TELEGRAM_CHAT_ID')
         self.chat_test_id = os.getenv('TELEGRAM_CHAT_TEST_ID')
+        self.http = HttpUtil()
+
+    def _send_text(self, chat_id, message):
+        """sendMessage API 호출 (공유 keep-alive 세션 사용)"""
+        url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
+        params = {
+            "chat_id": chat_id,
+            "parse_mode": "html",
+            "text": message
+        }
+        response = self.http.get(url, params=params)
+        response.raise_for_status()
+        return response.json()
 
     def send_message(self, message):
         """일반 메시지 전송"""
-        message = urllib.parse.quote_plus(message)
-        urlopen(f"https://api.telegram.org/bot{self.bot_token}/sendMessage?chat_id={self.chat_id}&parse_mode=html&text={message}")
+        return self._send_text(self.chat_id, message)
 
     def send_photo(self, photo_path, caption=""):
         """이미지 전송"""
@@ -31,14 +41,13 @@ class TelegramUtil:
             files = {
                 "photo": photo
             }
-            response = requests.post(url, data=payload, files=files)
+            response = self.http.post(url, data=payload, files=files)
         
         return response.json()
 
     def send_test_message(self, message):
         """테스트용 채팅방으로 메시지 전송"""
-        message = urllib.parse.quote_plus(message)
-        urlopen(f"https://api.telegram.org/bot{self.bot_token}/sendMessage?chat_id={self.chat_test_id}&parse_mode=html&text={message}") 
+        return self._send_text(self.chat_test_id, message)
     
     def send_multiple_photo(self, photo_paths, caption=""):
         """여러 장의 이미지 한 번에 전송"""
@@ -67,7 +76,7 @@ class TelegramUtil:
                 'media': json.dumps(media)
             }
             
-            response = requests.post(url, data=payload, files=files)
+            response = self.http.post(url, data=payload, files=files)
             for file in files.values():
                 file.close()
             